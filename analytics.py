@@ -5,17 +5,153 @@ HR Chatbot Analytics
 2. Logging feedback (rating & komentar)
 3. Tracking sessions
 4. Menyediakan fungsi analytics untuk dashboard
+
+Event query/feedback dimasukkan ke bounded queue dan diproses oleh writer
+thread, sehingga request chat tidak pernah menunggu disk I/O.
+Untuk deployment multi-proses, lihat mode 'sharded' di analytics_store.py.
 """
 
+import atexit
+import functools
 import json
 import os
+import queue
+import random
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
 from typing import List, Dict, Optional, Any
 import threading
 import time
+import uuid
+import weakref
 
 from config import config
+from analytics_store import ShardedAnalyticsStore, merge_sessions, _write_json_atomic
+from heavy_hitters import SpaceSaving
+from histogram import LogLinearHistogram
+from metrics_exporter import ANALYTICS_SAVE_BYTES, ANALYTICS_SAVE_DURATION, REGISTRY
+from profiler import profiled
+from text_utils import normalize_text
+
+
+class _ResultCache:
+    """
+    Cache hasil method dashboard, di-key dengan (method, args, data version).
+    Entry kadaluarsa setelah TTL atau saat data version berubah.
+    Thread yang meminta key yang sama menunggu satu perhitungan (single-flight),
+    sehingga beberapa admin yang membuka dashboard berbagi hasil yang sama.
+    Tidak ada lock yang dipegang selama compute(): method cache boleh memanggil
+    method cache lain (get_summary_stats), thread lain menunggu Event per key.
+    """
+    
+    def __init__(self):
+        self._entries = {}      # key -> (version, expires_at, value)
+        self._inflight = {}     # key -> Event, selesai saat perhitungan key itu selesai
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, key, version: int, compute):
+        """
+        Ambil hasil dari cache, atau hitung jika belum ada/kadaluarsa.
+        
+        Args:
+            key: Key cache (method, args)
+            version: Data version saat ini
+            compute: Callable tanpa argumen untuk menghitung hasil
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] == version and entry[1] > time.monotonic():
+                    self.hits += 1
+                    return entry[2]
+                
+                done = self._inflight.get(key)
+                if done is None:
+                    done = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            
+            # Thread lain sedang menghitung key ini: tunggu lalu cek ulang
+            # (jika perhitungan itu gagal, thread ini yang menghitung)
+            done.wait()
+        
+        try:
+            value = compute()
+            with self._lock:
+                now = time.monotonic()
+                # Buang entry lama agar cache tidak tumbuh tanpa batas
+                for stale_key in [k for k, e in self._entries.items() if e[1] <= now]:
+                    del self._entries[stale_key]
+                self._entries[key] = (version, now + config.DASHBOARD_CACHE_TTL_SECONDS, value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            done.set()
+    
+    def clear(self):
+        """Hapus semua entry cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+class _TimedLock:
+    """
+    Lock data analytics yang mencatat contention.
+    Acquire tanpa contention hanya menambah satu counter; waktu tunggu
+    hanya diukur jika lock sedang dipegang thread lain.
+    Counter di-update saat lock dipegang, sehingga tidak butuh lock tambahan.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_total_ns = 0
+        self.wait_max_ns = 0
+    
+    def acquire(self):
+        if self._lock.acquire(blocking=False):
+            self.acquisitions += 1
+            return True
+        
+        start = time.perf_counter_ns()
+        self._lock.acquire()
+        waited = time.perf_counter_ns() - start
+        self.acquisitions += 1
+        self.contended += 1
+        self.wait_total_ns += waited
+        if waited > self.wait_max_ns:
+            self.wait_max_ns = waited
+        return True
+    
+    def release(self):
+        self._lock.release()
+    
+    def __enter__(self):
+        return self.acquire()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _versioned_cache(method):
+    """
+    Decorator untuk method get_* dashboard: hasil di-memoize berdasarkan
+    (nama method, argumen, data_version) dengan TTL.
+    Hasil cache dipakai bersama, jangan dimodifikasi oleh pemanggil.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if config.DASHBOARD_CACHE_TTL_SECONDS <= 0:
+            return method(self, *args, **kwargs)
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self._result_cache.get_or_compute(
+            key, self.data_version, lambda: method(self, *args, **kwargs)
+        )
+    return wrapper
 
 
 class HRAnalytics:
@@ -24,16 +160,34 @@ class HRAnalytics:
     Menyimpan dan menganalisis data percakapan untuk improvement.
     """
     
-    def __init__(self, data_file: str = None):
+    def __init__(self, data_file: str = None, async_writer: bool = None):
         """
         Inisialisasi analytics engine.
         
         Args:
             data_file: Path file JSON untuk menyimpan data. 
                       Jika None, akan pakai default dari config.
+            async_writer: True = event diproses writer thread, False = inline.
+                          None = ambil dari config.
         """
         self.data_file = data_file or config.ANALYTICS_FILE
-        self.lock = threading.Lock()
+        self.lock = _TimedLock()            # Melindungi data in-memory (+ metrics contention)
+        self._save_lock = threading.Lock()  # Serialisasi penulisan file
+        
+        # Mode sharded: proses ini hanya menulis shard miliknya sendiri
+        self.store = None
+        if config.ANALYTICS_STORAGE_MODE == 'sharded':
+            self.store = ShardedAnalyticsStore(self.data_file)
+            try:
+                self.store.compact()
+            except (IOError, OSError) as e:
+                print(f"⚠️ Error compacting analytics shards: {e}")
+        
+        # Versi data: naik setiap ada event baru (dipakai untuk cache dashboard)
+        self._data_version = 0
+        self._others_signature = None
+        self._others_aggregates = (None, {}, {})
+        self._result_cache = _ResultCache()
         
         # Load data yang sudah ada
         self._load_data()
@@ -41,41 +195,311 @@ class HRAnalytics:
         # Counter untuk batch saving
         self.unsaved_changes = 0
         self.last_save_time = time.time()
+        
+        # Queue + writer thread
+        if async_writer is None:
+            async_writer = config.ANALYTICS_ASYNC_WRITER
+        self.async_writer = async_writer
+        self._queue = queue.Queue(maxsize=config.ANALYTICS_QUEUE_MAXSIZE)
+        self._writer_thread = None
+        self._closed = False
+        
+        # Metrics untuk queue dan flush
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'enqueued': 0,
+            'dropped': 0,
+            'sampled_out': 0,
+            'max_queue_depth': 0,
+            'flush_count': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+            'last_flush_bytes': 0,
+        }
+        
+        if self.async_writer:
+            self._start_writer()
+        _live_instances.add(self)
     
     def _load_data(self):
         """
         Load data dari file JSON.
         Jika file tidak ada atau corrupt, mulai dengan data kosong.
         """
-        if os.path.exists(self.data_file):
+        self._init_empty_data()
+        
+        if self.store is not None:
+            # Data worker lain dibaca saat query (merge-on-read)
+            data = self.store.load_own()
+            if data is None:
+                return
+        else:
+            if not os.path.exists(self.data_file):
+                return
+            
             try:
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    
-                    # Load data dengan default empty jika tidak ada
-                    self.queries = data.get('queries', [])
-                    self.feedback = data.get('feedback', [])
-                    self.sessions = data.get('sessions', {})
-                    
-                    # Validasi tipe data
-                    if not isinstance(self.queries, list):
-                        self.queries = []
-                    if not isinstance(self.feedback, list):
-                        self.feedback = []
-                    if not isinstance(self.sessions, dict):
-                        self.sessions = {}
-                        
             except (json.JSONDecodeError, IOError) as e:
                 print(f"⚠️ Error loading data: {e}. Starting with fresh data.")
-                self._init_empty_data()
-        else:
-            self._init_empty_data()
+                return
+        
+        # Load data dengan default empty jika tidak ada
+        queries = data.get('queries', [])
+        feedback = data.get('feedback', [])
+        sessions = data.get('sessions', {})
+        
+        # Validasi tipe data
+        if isinstance(queries, list):
+            self.queries.extend(queries)
+            for q in self.queries:
+                self._track_query(q, self._daily_top_queries, self._daily_histograms)
+        if isinstance(feedback, list):
+            self.feedback.extend(feedback)
+        if isinstance(sessions, dict):
+            # Urutkan berdasarkan aktivitas terakhir (paling lama di depan)
+            ordered = sorted(
+                sessions.items(),
+                key=lambda item: item[1].get('last_activity', item[1].get('start_time', ''))
+            )
+            for session_id, session in ordered:
+                self.sessions[session_id] = session
+        
+        self._evict()
     
     def _init_empty_data(self):
-        """Initialize struktur data kosong."""
-        self.queries = []
-        self.feedback = []
-        self.sessions = {}
+        """
+        Initialize struktur data kosong.
+        Queries & feedback memakai deque dengan maxlen, sessions memakai
+        OrderedDict (urutan aktivitas terakhir) sehingga eviction terjadi saat insert.
+        """
+        self.queries = deque(maxlen=config.MAX_QUERIES_RETAINED)
+        self.feedback = deque(maxlen=config.MAX_FEEDBACK_RETAINED)
+        self.sessions = OrderedDict()
+        
+        # Summary top queries per hari: 'YYYY-MM-DD' -> SpaceSaving
+        self._daily_top_queries = {}
+        
+        # Histogram per hari: 'YYYY-MM-DD' -> {(metric, category, path): LogLinearHistogram}
+        self._daily_histograms = {}
+    
+    def _evict(self, now: datetime = None):
+        """
+        Buang data yang melewati batas umur atau jumlah.
+        Harus dipanggil dengan self.lock dipegang (atau saat init).
+        
+        Args:
+            now: Waktu acuan (None = sekarang)
+        """
+        now = now or datetime.now()
+        
+        # Timestamp ISO bisa dibandingkan langsung sebagai string
+        query_cutoff = (now - timedelta(days=config.QUERY_RETENTION_DAYS)).isoformat()
+        while self.queries and self.queries[0].get('timestamp', '') < query_cutoff:
+            self.queries.popleft()
+        
+        feedback_cutoff = (now - timedelta(days=config.FEEDBACK_RETENTION_DAYS)).isoformat()
+        while self.feedback and self.feedback[0].get('timestamp', '') < feedback_cutoff:
+            self.feedback.popleft()
+        
+        session_cutoff = (now - timedelta(days=config.SESSION_RETENTION_DAYS)).isoformat()
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            expired = oldest.get('last_activity', '') < session_cutoff
+            if not expired and len(self.sessions) <= config.MAX_SESSIONS_RETAINED:
+                break
+            self.sessions.popitem(last=False)
+        
+        day_cutoff = (now - timedelta(days=config.HEAVY_HITTER_DAYS)).strftime('%Y-%m-%d')
+        for day in [d for d in self._daily_top_queries if d < day_cutoff]:
+            del self._daily_top_queries[day]
+        
+        histogram_cutoff = (now - timedelta(days=config.HISTOGRAM_DAYS)).strftime('%Y-%m-%d')
+        for day in [d for d in self._daily_histograms if d < histogram_cutoff]:
+            del self._daily_histograms[day]
+    
+    @staticmethod
+    def _track_query(record: dict, summaries: Dict[str, SpaceSaving],
+                     histograms: Dict[str, Dict[tuple, LogLinearHistogram]]):
+        """
+        Update agregat harian dengan satu query:
+        - Summary heavy hitters. Key memakai normalisasi yang sama dengan matcher,
+          sehingga "kapan libur" dan "kapan libur?" dihitung sebagai satu pertanyaan.
+        - Histogram latency & confidence per (kategori, path)
+        
+        Args:
+            record: Record query
+            summaries: Dict 'YYYY-MM-DD' -> SpaceSaving yang di-update
+            histograms: Dict 'YYYY-MM-DD' -> histogram per key yang di-update
+        """
+        day = record.get('timestamp', '')[:10]
+        
+        key = normalize_text(record.get('user_input', ''))
+        if key:
+            summary = summaries.get(day)
+            if summary is None:
+                summary = summaries[day] = SpaceSaving(config.HEAVY_HITTER_CAPACITY)
+            summary.add(key)
+        
+        category = record.get('category') or 'unknown'
+        # Record lama (sebelum ada field path) dikelompokkan dari is_fallback
+        path = record.get('path') or ('fallback' if record.get('is_fallback') else 'fuzzy')
+        day_histograms = histograms.setdefault(day, {})
+        
+        for metric, value, unit in (
+            ('latency', record.get('latency_ms'), 0.001),
+            ('confidence', record.get('confidence'), 0.01),
+        ):
+            if value is None:
+                continue
+            hist_key = (metric, category, path)
+            hist = day_histograms.get(hist_key)
+            if hist is None:
+                hist = day_histograms[hist_key] = LogLinearHistogram(unit)
+            hist.record(value)
+    
+    def _other_aggregates(self):
+        """
+        Agregat harian (top queries & histogram) dari worker lain (mode sharded).
+        Dibangun ulang hanya jika shard worker lain berubah.
+        
+        Returns:
+            Tuple of (summaries, histograms)
+        """
+        if self.store is None:
+            return {}, {}
+        
+        others = self.store.read_others()[0]
+        signature = self.store.signature
+        if self._others_aggregates[0] == signature:
+            return self._others_aggregates[1], self._others_aggregates[2]
+        
+        with self.lock:
+            own_ids = {q.get('event_id') for q in self.queries}
+        own_ids.discard(None)
+        
+        summaries = {}
+        histograms = {}
+        for q in others:
+            if q.get('event_id') not in own_ids:
+                self._track_query(q, summaries, histograms)
+        
+        self._others_aggregates = (signature, summaries, histograms)
+        return summaries, histograms
+    
+    def _window_histograms(self, days: int) -> Dict[tuple, LogLinearHistogram]:
+        """
+        Gabungkan histogram harian untuk N hari terakhir (termasuk worker lain).
+        
+        Args:
+            days: Periode dalam hari
+        
+        Returns:
+            Dict (metric, category, path) -> histogram hasil merge
+        """
+        if days > config.HISTOGRAM_DAYS:
+            # Di luar jangkauan histogram harian: bangun dari records
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+            daily = {}
+            for q in self._all_queries():
+                if q.get('timestamp', '') > cutoff:
+                    self._track_query(q, {}, daily)
+            sources = [daily]
+            start_day = ''
+        else:
+            start_day = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+            sources = [self._daily_histograms, self._other_aggregates()[1]]
+        
+        merged = {}
+        with self.lock:
+            for source in sources:
+                for day, day_histograms in source.items():
+                    if day < start_day:
+                        continue
+                    for hist_key, hist in day_histograms.items():
+                        if hist_key not in merged:
+                            merged[hist_key] = LogLinearHistogram(hist.unit)
+                        merged[hist_key].merge(hist)
+        return merged
+    
+    @staticmethod
+    def _combine(histograms: Dict[tuple, LogLinearHistogram], metric: str,
+                 category: str = None, paths=None) -> LogLinearHistogram:
+        """
+        Gabungkan histogram untuk satu metric, opsional difilter kategori/path.
+        """
+        unit = 0.001 if metric == 'latency' else 0.01
+        result = LogLinearHistogram(unit)
+        for (hist_metric, hist_category, hist_path), hist in histograms.items():
+            if hist_metric != metric:
+                continue
+            if category is not None and hist_category != category:
+                continue
+            if paths is not None and hist_path not in paths:
+                continue
+            result.merge(hist)
+        return result
+    
+    @staticmethod
+    def _percentiles(hist: LogLinearHistogram) -> Dict[str, float]:
+        """Ringkasan percentile dari satu histogram."""
+        return {
+            'count': hist.count,
+            'p50': round(hist.percentile(50), 2),
+            'p95': round(hist.percentile(95), 2),
+            'p99': round(hist.percentile(99), 2),
+            'mean': round(hist.mean(), 2),
+        }
+    
+    def _snapshot(self, records) -> list:
+        """
+        Copy records di bawah lock agar aman diiterasi
+        saat writer thread sedang menambah data.
+        """
+        with self.lock:
+            return list(records)
+    
+    @staticmethod
+    def _merge_own(others: list, own: list) -> list:
+        """
+        Gabungkan records worker lain dengan records proses ini.
+        Record milik proses ini yang sudah di-compact ke file utama tidak dihitung dua kali.
+        """
+        own_ids = {r.get('event_id') for r in own}
+        own_ids.discard(None)
+        if own_ids:
+            others = [r for r in others if r.get('event_id') not in own_ids]
+        return others + own
+    
+    def _all_queries(self) -> list:
+        """Queries proses ini + (mode sharded) queries dari worker lain."""
+        queries = self._snapshot(self.queries)
+        if self.store is not None:
+            queries = self._merge_own(self.store.read_others()[0], queries)
+        return queries
+    
+    def _all_feedback(self) -> list:
+        """Feedback proses ini + (mode sharded) feedback worker lain, urut waktu."""
+        feedback = self._snapshot(self.feedback)
+        if self.store is not None:
+            feedback = sorted(
+                self._merge_own(self.store.read_others()[1], feedback),
+                key=lambda f: f.get('timestamp', '')
+            )
+        return feedback
+    
+    def _all_sessions(self) -> list:
+        """Sessions proses ini + (mode sharded) sessions worker lain."""
+        with self.lock:
+            own = dict(self.sessions)
+        if self.store is None:
+            return list(own.values())
+        
+        merged = dict(self.store.read_others()[2])
+        for session_id, session in own.items():
+            merge_sessions(merged, session_id, session, self.store.worker_id)
+        return list(merged.values())
     
     def _save_data(self, force: bool = False):
         """
@@ -85,6 +509,9 @@ class HRAnalytics:
         - Setiap N detik
         - Atau jika dipaksa (force=True)
         
+        Dengan async writer, method ini hanya dipanggil dari writer thread
+        (atau dari flush/close), bukan dari request chat.
+        
         Args:
             force: Paksa save sekarang, abaikan threshold
         """
@@ -101,34 +528,326 @@ class HRAnalytics:
         if not should_save:
             return
         
-        with self.lock:
+        with self._save_lock:
+            # Snapshot data di bawah lock, serialisasi & tulis di luar lock
+            # agar event baru tetap bisa diproses selama file ditulis
+            with self.lock:
+                # Batas jumlah & umur sudah dijaga saat insert, tidak perlu trimming
+                payload = {
+                    'queries': list(self.queries),
+                    'feedback': list(self.feedback),
+                    'sessions': dict(self.sessions)
+                }
+                pending = self.unsaved_changes
+            
+            start = time.perf_counter()
+            
             try:
-                # Save ke temporary file dulu (atomic write)
-                temp_file = f"{self.data_file}.tmp"
+                # Atomic write (temp file + os.replace)
+                if self.store is not None:
+                    bytes_written = self.store.write(payload)
+                else:
+                    bytes_written = _write_json_atomic(self.data_file, payload)
                 
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'queries': self.queries[-config.MAX_QUERIES_RETAINED:],
-                        'feedback': self.feedback[-config.MAX_FEEDBACK_RETAINED:],
-                        'sessions': dict(list(self.sessions.items())[-config.MAX_SESSIONS_RETAINED:])
-                    }, f, ensure_ascii=False, indent=2)
+                # Reset counter (event yang masuk selama save tetap dihitung)
+                with self.lock:
+                    self.unsaved_changes = max(0, self.unsaved_changes - pending)
+                self.last_save_time = current_time
                 
-                # Replace file asli dengan temp file (atomic)
-                os.replace(temp_file, self.data_file)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                with self._metrics_lock:
+                    self._metrics['flush_count'] += 1
+                    self._metrics['last_flush_ms'] = elapsed_ms
+                    self._metrics['max_flush_ms'] = max(self._metrics['max_flush_ms'], elapsed_ms)
+                    self._metrics['total_flush_ms'] += elapsed_ms
+                    self._metrics['last_flush_bytes'] = bytes_written
                 
-                # Reset counter
-                self.unsaved_changes = 0
-                self.last_save_time = current_time
+                ANALYTICS_SAVE_DURATION.observe(elapsed_ms / 1000)
+                ANALYTICS_SAVE_BYTES.inc(bytes_written)
                 
-            except IOError as e:
+            except (IOError, OSError) as e:
                 print(f"❌ Error saving analytics data: {e}")
-                # Hapus temp file jika ada
-                if os.path.exists(temp_file):
+    
+    # ==================================================
+    # WRITER THREAD & QUEUE
+    # ==================================================
+    
+    def _start_writer(self):
+        """Start background writer thread yang men-drain queue event."""
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="hr-analytics-writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+    
+    def _writer_loop(self):
+        """
+        Loop writer thread: ambil event dari queue, apply ke data in-memory,
+        lalu save sesuai aturan batch. Jika tidak ada event selama
+        SAVE_INTERVAL_SECONDS, tetap cek apakah ada perubahan yang perlu disimpan.
+        """
+        while True:
+            try:
+                event = self._queue.get(timeout=config.SAVE_INTERVAL_SECONDS)
+            except queue.Empty:
+                if self.unsaved_changes:
+                    self._save_data()
+                continue
+            
+            # Drain semua event yang sudah antri sebelum menyentuh disk
+            events = []
+            stop = False
+            while True:
+                if event is _STOP:
+                    # Event sebelum sinyal stop tetap diproses dulu
+                    self._queue.task_done()
+                    stop = True
+                    break
+                events.append(event)
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            force = False
+            try:
+                for kind, record in events:
+                    force = self._apply_event(kind, record) or force
+                if events:
+                    self._save_data(force=force)
+            except Exception as e:
+                print(f"❌ Error in analytics writer: {e}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+            
+            if stop:
+                break
+    
+    def _enqueue(self, kind: str, record: dict, policy: str = None) -> bool:
+        """
+        Masukkan event ke queue sesuai overflow policy.
+        
+        Args:
+            kind: Jenis event ('query' atau 'feedback')
+            record: Record yang akan disimpan
+            policy: 'block', 'drop_oldest', atau 'sample' (None = dari config)
+        
+        Returns:
+            True jika event diterima queue
+        """
+        policy = policy or config.ANALYTICS_QUEUE_OVERFLOW_POLICY
+        event = (kind, record)
+        maxsize = self._queue.maxsize
+        
+        if policy == 'sample' and maxsize > 0:
+            high_watermark = maxsize * config.ANALYTICS_QUEUE_HIGH_WATERMARK
+            if self._queue.qsize() >= high_watermark and random.random() >= config.ANALYTICS_QUEUE_SAMPLE_RATE:
+                self._record_metric('sampled_out')
+                return False
+        
+        if policy == 'block':
+            try:
+                self._queue.put(event, timeout=config.ANALYTICS_QUEUE_BLOCK_TIMEOUT_SECONDS)
+            except queue.Full:
+                self._record_metric('dropped')
+                return False
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(event)
+                    break
+                except queue.Full:
+                    if policy != 'drop_oldest':
+                        self._record_metric('dropped')
+                        return False
+                    # Buang event paling lama untuk memberi ruang event baru
                     try:
-                        os.remove(temp_file)
-                    except:
-                        pass
+                        oldest = self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self._queue.task_done()
+                    if oldest is _STOP:
+                        # Analytics sedang ditutup: sinyal stop tidak boleh hilang
+                        try:
+                            self._queue.put_nowait(_STOP)
+                        except queue.Full:
+                            pass
+                        self._record_metric('dropped')
+                        return False
+                    self._record_metric('dropped')
+        
+        with self._metrics_lock:
+            self._metrics['enqueued'] += 1
+            self._metrics['max_queue_depth'] = max(
+                self._metrics['max_queue_depth'], self._queue.qsize()
+            )
+        return True
+    
+    def _record_metric(self, key: str, amount: int = 1):
+        """Increment counter metric secara thread-safe."""
+        with self._metrics_lock:
+            self._metrics[key] += amount
+    
+    def _apply_event(self, kind: str, record: dict) -> bool:
+        """
+        Apply satu event ke data in-memory.
+        
+        Args:
+            kind: Jenis event ('query' atau 'feedback')
+            record: Record event
+        
+        Returns:
+            True jika event perlu langsung disimpan (force save)
+        """
+        session_id = record['session_id']
+        
+        with self.lock:
+            self._data_version += 1
+            
+            if kind == 'query':
+                self.queries.append(record)
+                self._track_query(record, self._daily_top_queries, self._daily_histograms)
+                
+                # Update atau create session
+                if session_id not in self.sessions:
+                    self.sessions[session_id] = {
+                        'start_time': record['timestamp'],
+                        'query_count': 0,
+                        'last_activity': record['timestamp'],
+                        'rated': False,
+                    }
+                else:
+                    # Session aktif pindah ke belakang (paling akhir di-evict)
+                    self.sessions.move_to_end(session_id)
+                
+                self.sessions[session_id]['query_count'] += 1
+                self.sessions[session_id]['last_activity'] = record['timestamp']
+                self.unsaved_changes += 1
+                self._evict()
+                return False
+            
+            self.feedback.append(record)
+            
+            # Update session
+            if session_id in self.sessions:
+                self.sessions[session_id]['rated'] = True
+                self.sessions[session_id]['rating'] = record['rating']
+            
+            # Force save untuk feedback (data penting)
+            self.unsaved_changes += 1
+            self._evict()
+            return True
+    
+    def _submit(self, kind: str, record: dict, policy: str = None):
+        """Kirim event ke writer thread, atau proses inline jika async nonaktif."""
+        if self.async_writer and not self._closed:
+            self._enqueue(kind, record, policy)
+            return
+        
+        force = self._apply_event(kind, record)
+        self._save_data(force=force)
+    
+    @property
+    def data_version(self) -> int:
+        """
+        Versi data yang naik secara monoton setiap ada event baru
+        (termasuk perubahan shard worker lain pada mode sharded).
+        """
+        if self.store is not None:
+            self.store.read_others()
+            signature = self.store.signature
+            if signature != self._others_signature:
+                with self.lock:
+                    if signature != self._others_signature:
+                        self._others_signature = signature
+                        self._data_version += 1
+        return self._data_version
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Dapatkan statistik cache dashboard.
+        
+        Returns:
+            Dict dengan keys: hits, misses, data_version
+        """
+        return {
+            'hits': self._result_cache.hits,
+            'misses': self._result_cache.misses,
+            'data_version': self.data_version,
+        }
+    
+    def get_writer_metrics(self) -> Dict[str, Any]:
+        """
+        Dapatkan metrics writer thread.
+        
+        Returns:
+            Dict dengan keys: queue_depth, queue_capacity, enqueued, dropped,
+            sampled_out, max_queue_depth, flush_count, last_flush_ms,
+            max_flush_ms, avg_flush_ms, last_flush_bytes, unsaved_changes
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        
+        flush_count = metrics['flush_count']
+        metrics['avg_flush_ms'] = round(metrics['total_flush_ms'] / flush_count, 3) if flush_count else 0.0
+        metrics['queue_depth'] = self._queue.qsize()
+        metrics['queue_capacity'] = self._queue.maxsize
+        metrics['unsaved_changes'] = self.unsaved_changes
+        return metrics
+    
+    def get_lock_metrics(self) -> Dict[str, float]:
+        """
+        Dapatkan metrics contention lock data in-memory.
+        
+        Returns:
+            Dict dengan keys: acquisitions, contended, contention_rate,
+            wait_total_ms, wait_avg_ms (per acquire yang contended), wait_max_ms
+        """
+        lock = self.lock
+        acquisitions, contended = lock.acquisitions, lock.contended
+        wait_total_ms = lock.wait_total_ns / 1e6
+        return {
+            'acquisitions': acquisitions,
+            'contended': contended,
+            'contention_rate': round(contended / acquisitions, 4) if acquisitions else 0.0,
+            'wait_total_ms': round(wait_total_ms, 3),
+            'wait_avg_ms': round(wait_total_ms / contended, 4) if contended else 0.0,
+            'wait_max_ms': round(lock.wait_max_ns / 1e6, 3),
+        }
+    
+    def flush(self, timeout: float = None):
+        """
+        Tunggu semua event di queue diproses lalu paksa save ke file.
+        
+        Args:
+            timeout: Maksimal detik menunggu queue kosong (None = tanpa batas)
+        """
+        if self.async_writer and self._writer_thread and self._writer_thread.is_alive():
+            if timeout is None:
+                self._queue.join()
+            else:
+                deadline = time.time() + timeout
+                while self._queue.unfinished_tasks and time.time() < deadline:
+                    time.sleep(0.01)
+        self._save_data(force=True)
+    
+    def close(self):
+        """Stop writer thread setelah semua event diproses, lalu save final."""
+        if self._closed:
+            return
+        self._closed = True
+        
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._queue.put(_STOP)
+            self._writer_thread.join(timeout=config.ANALYTICS_QUEUE_BLOCK_TIMEOUT_SECONDS)
+        
+        # Tidak perlu menulis ulang file jika tidak ada perubahan
+        if self.unsaved_changes:
+            self._save_data(force=True)
     
+    @profiled('log_query')
     def log_query(self, session_id: str, user_input: str, response: dict):
         """
         Log pertanyaan user untuk analytics.
@@ -147,6 +866,7 @@ class HRAnalytics:
         
         # Buat record query
         query_record = {
+            'event_id': uuid.uuid4().hex,
             'timestamp': datetime.now().isoformat(),
             'session_id': session_id,
             'user_input': user_input,
@@ -155,23 +875,17 @@ class HRAnalytics:
             'is_fallback': response.get('is_fallback', False),
         }
         
-        self.queries.append(query_record)
-        
-        # Update atau create session
-        if session_id not in self.sessions:
-            self.sessions[session_id] = {
-                'start_time': datetime.now().isoformat(),
-                'query_count': 0,
-                'last_activity': datetime.now().isoformat(),
-                'rated': False,
+        # Latency per request (jika response berasal dari HRChatbotEngine)
+        if response.get('latency_ms') is not None:
+            query_record['path'] = response.get('path')
+            query_record['latency_ms'] = round(response['latency_ms'], 3)
+            query_record['timings_ms'] = {
+                stage: round(ms, 3)
+                for stage, ms in response.get('timings_ms', {}).items()
             }
         
-        self.sessions[session_id]['query_count'] += 1
-        self.sessions[session_id]['last_activity'] = datetime.now().isoformat()
-        
-        # Increment unsaved counter dan coba save
-        self.unsaved_changes += 1
-        self._save_data()
+        # Diproses writer thread (tidak menunggu disk I/O)
+        self._submit('query', query_record)
     
     def log_feedback(self, session_id: str, rating: int, comment: Optional[str] = None):
         """
@@ -195,23 +909,17 @@ class HRAnalytics:
         
         # Buat record feedback
         feedback_record = {
+            'event_id': uuid.uuid4().hex,
             'timestamp': datetime.now().isoformat(),
             'session_id': session_id,
             'rating': rating,
             'comment': comment,
         }
         
-        self.feedback.append(feedback_record)
-        
-        # Update session
-        if session_id in self.sessions:
-            self.sessions[session_id]['rated'] = True
-            self.sessions[session_id]['rating'] = rating
-        
-        # Force save untuk feedback (data penting)
-        self.unsaved_changes += 1
-        self._save_data(force=True)
+        # Feedback selalu pakai policy 'block' (data penting, tidak boleh dibuang)
+        self._submit('feedback', feedback_record, policy='block')
     
+    @_versioned_cache
     def get_top_queries(self, n: int = 10, days: int = None) -> List[Dict]:
         """
         Dapatkan top N pertanyaan paling sering.
@@ -222,29 +930,46 @@ class HRAnalytics:
         
         Returns:
             List of dict dengan format: [{'query': str, 'count': int}, ...]
+            Query ditampilkan dalam bentuk ternormalisasi.
         """
         days = days or config.DEFAULT_ANALYTICS_DAYS
         
         try:
-            cutoff = datetime.now() - timedelta(days=days)
-            
-            # Filter queries dalam periode
-            recent_queries = [
-                q['user_input'].lower() 
-                for q in self.queries 
-                if datetime.fromisoformat(q['timestamp']) > cutoff
-            ]
+            if days > config.HEAVY_HITTER_DAYS:
+                # Di luar jangkauan summary harian: hitung langsung dari records
+                cutoff = datetime.now() - timedelta(days=days)
+                counter = Counter(
+                    normalize_text(q['user_input'])
+                    for q in self._all_queries()
+                    if datetime.fromisoformat(q['timestamp']) > cutoff
+                )
+                counter.pop('', None)
+                top = counter.most_common(n)
+            else:
+                # Merge summary Space-Saving untuk hari-hari dalam periode
+                start_day = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+                others = self._other_aggregates()[0]
+                
+                with self.lock:
+                    merged = SpaceSaving.merged(
+                        (s for d, s in self._daily_top_queries.items() if d >= start_day),
+                        config.HEAVY_HITTER_CAPACITY
+                    )
+                for day, summary in others.items():
+                    if day >= start_day:
+                        merged.merge(summary)
+                
+                top = merged.most_common(n)
             
-            # Count dan ambil top N
-            counter = Counter(recent_queries)
             return [
                 {'query': query, 'count': count}
-                for query, count in counter.most_common(n)
+                for query, count in top
             ]
         except Exception as e:
             print(f"❌ Error in get_top_queries: {e}")
             return []
     
+    @_versioned_cache
     def get_category_distribution(self, days: int = None) -> Dict[str, int]:
         """
         Dapatkan distribusi pertanyaan per kategori.
@@ -262,7 +987,7 @@ class HRAnalytics:
             
             categories = [
                 q['category'] or 'unknown'
-                for q in self.queries
+                for q in self._all_queries()
                 if datetime.fromisoformat(q['timestamp']) > cutoff
             ]
             
@@ -271,6 +996,7 @@ class HRAnalytics:
             print(f"❌ Error in get_category_distribution: {e}")
             return {}
     
+    @_versioned_cache
     def get_daily_trends(self, days: int = None) -> List[Dict]:
         """
         Dapatkan tren harian jumlah queries.
@@ -288,7 +1014,7 @@ class HRAnalytics:
             trends = defaultdict(lambda: {'total': 0, 'categories': defaultdict(int)})
             cutoff = datetime.now() - timedelta(days=days)
             
-            for q in self.queries:
+            for q in self._all_queries():
                 ts = datetime.fromisoformat(q['timestamp'])
                 if ts > cutoff:
                     date_key = ts.strftime('%Y-%m-%d')
@@ -318,6 +1044,7 @@ class HRAnalytics:
             print(f"❌ Error in get_daily_trends: {e}")
             return []
     
+    @_versioned_cache
     def get_hourly_distribution(self, days: int = None) -> Dict[int, int]:
         """
         Dapatkan distribusi queries per jam.
@@ -335,7 +1062,7 @@ class HRAnalytics:
             
             hours = [
                 datetime.fromisoformat(q['timestamp']).hour
-                for q in self.queries
+                for q in self._all_queries()
                 if datetime.fromisoformat(q['timestamp']) > cutoff
             ]
             
@@ -344,6 +1071,7 @@ class HRAnalytics:
             print(f"❌ Error in get_hourly_distribution: {e}")
             return {}
     
+    @_versioned_cache
     def get_feedback_stats(self, days: int = None) -> Dict[str, Any]:
         """
         Dapatkan statistik feedback.
@@ -361,7 +1089,7 @@ class HRAnalytics:
             cutoff = datetime.now() - timedelta(days=days)
             
             recent_feedback = [
-                f for f in self.feedback
+                f for f in self._all_feedback()
                 if datetime.fromisoformat(f['timestamp']) > cutoff
             ]
             
@@ -393,6 +1121,7 @@ class HRAnalytics:
                 'recent_comments': []
             }
     
+    @_versioned_cache
     def get_fallback_rate(self, days: int = None) -> float:
         """
         Dapatkan persentase pertanyaan yang tidak terjawab (fallback).
@@ -409,7 +1138,7 @@ class HRAnalytics:
             cutoff = datetime.now() - timedelta(days=days)
             
             recent = [
-                q for q in self.queries
+                q for q in self._all_queries()
                 if datetime.fromisoformat(q['timestamp']) > cutoff
             ]
             
@@ -422,39 +1151,94 @@ class HRAnalytics:
             print(f"❌ Error in get_fallback_rate: {e}")
             return 0.0
     
+    @_versioned_cache
     def get_confidence_stats(self, days: int = None) -> Dict[str, float]:
         """
-        Dapatkan statistik confidence score.
+        Dapatkan statistik confidence score (dihitung dari histogram).
         
         Args:
             days: Periode dalam hari
         
         Returns:
-            Dict dengan keys: average, min, max
+            Dict dengan keys: average, min, max, p50, p95, p99
         """
         days = days or config.DEFAULT_ANALYTICS_DAYS
+        empty = {'average': 0, 'min': 0, 'max': 0, 'p50': 0, 'p95': 0, 'p99': 0}
         
         try:
-            cutoff = datetime.now() - timedelta(days=days)
-            
-            confidences = [
-                q['confidence'] for q in self.queries
-                if datetime.fromisoformat(q['timestamp']) > cutoff
-                and q.get('confidence') is not None
-            ]
+            hist = self._combine(self._window_histograms(days), 'confidence')
             
-            if not confidences:
-                return {'average': 0, 'min': 0, 'max': 0}
+            if not hist.count:
+                return empty
             
             return {
-                'average': round(sum(confidences) / len(confidences), 2),
-                'min': round(min(confidences), 2),
-                'max': round(max(confidences), 2),
+                'average': round(hist.mean(), 2),
+                'min': round(hist.min, 2),
+                'max': round(hist.max, 2),
+                'p50': round(hist.percentile(50), 2),
+                'p95': round(hist.percentile(95), 2),
+                'p99': round(hist.percentile(99), 2),
             }
         except Exception as e:
             print(f"❌ Error in get_confidence_stats: {e}")
-            return {'average': 0, 'min': 0, 'max': 0}
+            return empty
     
+    @_versioned_cache
+    def get_latency_stats(self, days: int = None) -> Dict[str, Any]:
+        """
+        Dapatkan statistik latency response (dihitung dari histogram, bukan raw rows).
+        
+        Args:
+            days: Periode dalam hari
+        
+        Returns:
+            Dict dengan keys:
+            - overall, hit, fallback: {'count', 'p50', 'p95', 'p99', 'mean'} dalam ms
+            - by_category: {kategori: {'count', 'p50', 'p95', 'p99', 'mean'}}
+            - path_counts: {path: jumlah query}
+            - cache_hit_rate, fast_path_rate: persentase (0-100)
+        """
+        days = days or config.DEFAULT_ANALYTICS_DAYS
+        
+        try:
+            histograms = self._window_histograms(days)
+            
+            path_counts = defaultdict(int)
+            categories = set()
+            for (metric, category, path), hist in histograms.items():
+                if metric == 'latency':
+                    path_counts[path] += hist.count
+                    categories.add(category)
+            
+            total = sum(path_counts.values())
+            hit_paths = {'cache', 'exact', 'fuzzy'}
+            
+            return {
+                'overall': self._percentiles(self._combine(histograms, 'latency')),
+                'hit': self._percentiles(self._combine(histograms, 'latency', paths=hit_paths)),
+                'fallback': self._percentiles(self._combine(histograms, 'latency', paths={'fallback'})),
+                'by_category': {
+                    category: self._percentiles(self._combine(histograms, 'latency', category=category))
+                    for category in sorted(categories)
+                },
+                'path_counts': dict(path_counts),
+                'cache_hit_rate': round(path_counts['cache'] / total * 100, 2) if total else 0.0,
+                'fast_path_rate': round(path_counts['exact'] / total * 100, 2) if total else 0.0,
+            }
+        except Exception as e:
+            print(f"❌ Error in get_latency_stats: {e}")
+            empty = {'count': 0, 'p50': 0, 'p95': 0, 'p99': 0, 'mean': 0}
+            return {
+                'overall': empty,
+                'hit': empty,
+                'fallback': empty,
+                'by_category': {},
+                'path_counts': {},
+                'cache_hit_rate': 0.0,
+                'fast_path_rate': 0.0,
+            }
+    
+    @_versioned_cache
     def get_summary_stats(self, days: int = None) -> Dict[str, Any]:
         """
         Dapatkan summary statistik untuk dashboard.
@@ -472,14 +1256,14 @@ class HRAnalytics:
             cutoff = datetime.now() - timedelta(days=days)
             
             recent_queries = [
-                q for q in self.queries
+                q for q in self._all_queries()
                 if datetime.fromisoformat(q['timestamp']) > cutoff
             ]
             
-            recent_sessions = {
-                k: v for k, v in self.sessions.items()
+            recent_sessions = [
+                v for v in self._all_sessions()
                 if datetime.fromisoformat(v['start_time']) > cutoff
-            }
+            ]
             
             return {
                 'total_queries': len(recent_queries),
@@ -502,7 +1286,67 @@ class HRAnalytics:
     
     def __del__(self):
         """Destructor: save data saat object dihapus."""
-        self._save_data(force=True)
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# Sinyal stop untuk writer thread
+_STOP = object()
+
+# Semua instance yang masih hidup, di-flush saat interpreter exit
+_live_instances = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_instances():
+    """Pastikan event yang masih di queue tersimpan sebelum proses berhenti."""
+    for instance in list(_live_instances):
+        try:
+            instance.close()
+        except Exception as e:
+            print(f"❌ Error closing analytics: {e}")
+
+
+def _collect_metrics():
+    """Collector metrics exporter: state queue, contention lock dan jumlah record in-memory."""
+    for instance in list(_live_instances):
+        if instance._closed:
+            continue
+        
+        labels = {'file': instance.data_file}
+        writer = instance.get_writer_metrics()
+        yield ('hr_analytics_queue_depth', 'gauge',
+               'Jumlah event analytics yang menunggu di queue writer.', labels, writer['queue_depth'])
+        yield ('hr_analytics_events_dropped_total', 'counter',
+               'Event analytics yang dibuang karena queue penuh (termasuk sampling).',
+               labels, writer['dropped'] + writer['sampled_out'])
+        
+        lock = instance.get_lock_metrics()
+        yield ('hr_analytics_lock_wait_seconds_total', 'counter',
+               'Total waktu menunggu lock data analytics.', labels, lock['wait_total_ms'] / 1000)
+        yield ('hr_analytics_lock_contended_total', 'counter',
+               'Jumlah acquire lock data analytics yang harus menunggu.', labels, lock['contended'])
+        
+        cache = instance.get_cache_stats()
+        yield ('hr_analytics_dashboard_cache_hits_total', 'counter',
+               'Hasil dashboard yang diambil dari cache.', labels, cache['hits'])
+        yield ('hr_analytics_dashboard_cache_misses_total', 'counter',
+               'Hasil dashboard yang harus dihitung ulang.', labels, cache['misses'])
+        
+        with instance.lock:
+            counts = {
+                'queries': len(instance.queries),
+                'feedback': len(instance.feedback),
+                'sessions': len(instance.sessions),
+            }
+        for kind, count in counts.items():
+            yield ('hr_analytics_records', 'gauge',
+                   'Jumlah record analytics in-memory.', dict(labels, kind=kind), count)
+
+
+REGISTRY.register_collector(_collect_metrics)
 
 
 # Singleton instance
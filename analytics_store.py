@@ -0,0 +1,427 @@
+"""
+HR Chatbot Analytics Storage (Multi-Process)
+=============================================
+Storage analytics untuk deployment dengan beberapa proses Streamlit.
+
+Cara kerja:
+1. Setiap proses (worker) hanya menulis ke shard file miliknya sendiri,
+   contoh: hr_analytics_data.shard-<worker_id>.json
+2. Saat dashboard membaca data, semua shard + file utama digabung (merge-on-read)
+3. Shard milik worker yang sudah mati di-compact ke file utama
+   di bawah advisory lock (fcntl). Worker yang hanya idle lalu menulis lagi
+   aman: event di-dedupe lewat event_id, query_count session per worker
+
+Karena tidak ada dua proses yang menulis file yang sama,
+tidak ada event yang hilang saat worker menyimpan data bersamaan.
+"""
+
+import glob
+import json
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: compaction berjalan tanpa lock
+    fcntl = None
+
+from config import config
+
+
+def default_worker_id() -> str:
+    """
+    ID worker default: env HR_ANALYTICS_WORKER_ID, config, atau hostname-pid.
+    """
+    worker_id = os.environ.get('HR_ANALYTICS_WORKER_ID') or config.ANALYTICS_WORKER_ID
+    if worker_id:
+        return str(worker_id)
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _query_counts(session: dict, worker_id: str) -> Dict[str, int]:
+    """Jumlah query session per worker (session lama tanpa rincian = satu worker)."""
+    counts = session.get('query_counts')
+    if isinstance(counts, dict):
+        return counts
+    return {worker_id or '': session.get('query_count', 0)}
+
+
+def merge_sessions(target: Dict[str, dict], session_id: str, session: dict, worker_id: str = None):
+    """
+    Gabungkan satu session ke dict target.
+    Session yang sama bisa muncul di beberapa shard jika load balancer tidak sticky,
+    dan satu worker bisa muncul dua kali (file utama hasil compaction + shard barunya),
+    sehingga query_count disimpan per worker dan digabung dengan max, bukan dijumlah.
+    
+    Args:
+        target: Dict session_id -> session hasil merge
+        session_id: ID session
+        session: Data session
+        worker_id: Worker yang menulis session (untuk session tanpa query_counts)
+    """
+    counts = _query_counts(session, worker_id)
+    existing = target.get(session_id)
+    if existing is None:
+        merged = dict(session)
+        merged['query_counts'] = dict(counts)
+        merged['query_count'] = sum(counts.values())
+        target[session_id] = merged
+        return
+    
+    merged = dict(existing)
+    start_times = [t for t in (existing.get('start_time'), session.get('start_time')) if t]
+    if start_times:
+        merged['start_time'] = min(start_times)
+    
+    query_counts = dict(_query_counts(existing, None))
+    for worker, count in counts.items():
+        query_counts[worker] = max(query_counts.get(worker, 0), count)
+    merged['query_counts'] = query_counts
+    merged['query_count'] = sum(query_counts.values())
+    
+    if session.get('last_activity', '') > existing.get('last_activity', ''):
+        merged['last_activity'] = session['last_activity']
+    
+    if session.get('rated'):
+        merged['rated'] = True
+        if 'rating' in session:
+            merged['rating'] = session['rating']
+    
+    target[session_id] = merged
+
+
+def merge_payloads(payloads: List[dict]) -> Tuple[List[dict], List[dict], Dict[str, dict]]:
+    """
+    Gabungkan beberapa payload (isi file analytics) menjadi satu.
+    Record dengan event_id yang sama hanya dihitung sekali.
+    
+    Args:
+        payloads: List of dict {'queries': [...], 'feedback': [...], 'sessions': {...},
+                  'worker_id': ...}
+    
+    Returns:
+        Tuple of (queries, feedback, sessions), queries & feedback urut timestamp
+    """
+    seen = set()
+    queries = []
+    feedback = []
+    sessions = {}
+    
+    for payload in payloads:
+        for key, target in (('queries', queries), ('feedback', feedback)):
+            for record in payload.get(key, []):
+                event_id = record.get('event_id')
+                if event_id:
+                    if event_id in seen:
+                        continue
+                    seen.add(event_id)
+                target.append(record)
+        
+        for session_id, session in payload.get('sessions', {}).items():
+            merge_sessions(sessions, session_id, session, payload.get('worker_id'))
+    
+    queries.sort(key=lambda r: r.get('timestamp', ''))
+    feedback.sort(key=lambda r: r.get('timestamp', ''))
+    return queries, feedback, sessions
+
+
+def _read_json(path: str) -> Optional[dict]:
+    """
+    Baca file JSON analytics, None jika tidak ada atau corrupt.
+    File tanpa worker_id (ditulis versi lama) memakai path sebagai worker_id.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"⚠️ Error reading analytics shard {path}: {e}")
+        return None
+    
+    if not isinstance(data, dict):
+        return None
+    return {
+        'queries': data.get('queries') if isinstance(data.get('queries'), list) else [],
+        'feedback': data.get('feedback') if isinstance(data.get('feedback'), list) else [],
+        'sessions': data.get('sessions') if isinstance(data.get('sessions'), dict) else {},
+        'worker_id': data.get('worker_id') or path,
+    }
+
+
+def _write_json_atomic(path: str, payload: dict) -> int:
+    """
+    Tulis payload ke file secara atomic (temp file + os.replace).
+    
+    Returns:
+        Jumlah bytes yang ditulis
+    """
+    temp_file = f"{path}.tmp"
+    content = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(content)
+        os.replace(temp_file, path)
+    except IOError:
+        if os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+        raise
+    
+    return len(content)
+
+
+class ShardedAnalyticsStore:
+    """
+    Storage per-proses dengan merge-on-read.
+    
+    File utama (data_file) hanya ditulis saat compaction, sehingga data lama
+    dari mode single-file tetap terbaca sebagai bagian dari merge.
+    """
+    
+    def __init__(self, data_file: str, worker_id: str = None):
+        """
+        Args:
+            data_file: Path file analytics utama (contoh: hr_analytics_data.json)
+            worker_id: ID unik worker (None = default_worker_id())
+        """
+        self.data_file = data_file
+        self.worker_id = worker_id or default_worker_id()
+        
+        root, ext = os.path.splitext(data_file)
+        self._shard_prefix = f"{root}.shard-"
+        self._shard_ext = ext or '.json'
+        self.shard_file = f"{self._shard_prefix}{self._safe_id(self.worker_id)}{self._shard_ext}"
+        
+        # Cache file lain: path -> (mtime_ns, size, payload)
+        self._file_cache: Dict[str, Tuple[int, int, dict]] = {}
+        self._merged_signature = None
+        self._merged_others = ([], [], {})
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _safe_id(worker_id: str) -> str:
+        """Bersihkan worker_id agar aman dipakai sebagai nama file."""
+        return "".join(c if c.isalnum() or c in '-_' else '_' for c in worker_id)
+    
+    def shard_paths(self) -> List[str]:
+        """List semua shard file yang ada (termasuk milik worker ini)."""
+        pattern = f"{glob.escape(self._shard_prefix)}*{self._shard_ext}"
+        return sorted(glob.glob(pattern))
+    
+    def load_own(self) -> Optional[dict]:
+        """Load shard milik worker ini (ada jika worker_id stabil antar restart)."""
+        return _read_json(self.shard_file)
+    
+    def write(self, payload: dict) -> int:
+        """
+        Tulis data in-memory worker ini ke shard miliknya.
+        Payload diberi worker_id agar query_count session bisa digabung per worker.
+        
+        Returns:
+            Jumlah bytes yang ditulis
+        """
+        return _write_json_atomic(self.shard_file, dict(payload, worker_id=self.worker_id))
+    
+    def _other_files(self) -> List[str]:
+        """File utama + semua shard kecuali milik worker ini."""
+        paths = [self.data_file] if os.path.exists(self.data_file) else []
+        paths.extend(p for p in self.shard_paths() if p != self.shard_file)
+        return paths
+    
+    def read_others(self, max_age_seconds: float = None) -> Tuple[List[dict], List[dict], Dict[str, dict]]:
+        """
+        Baca dan gabungkan data dari file utama + shard worker lain.
+        File hanya di-parse ulang jika mtime/size berubah, dan direktori
+        hanya di-scan ulang setelah max_age_seconds.
+        
+        Args:
+            max_age_seconds: Umur maksimal hasil cache (None = dari config)
+        
+        Returns:
+            Tuple of (queries, feedback, sessions)
+        """
+        if max_age_seconds is None:
+            max_age_seconds = config.ANALYTICS_SHARD_REFRESH_SECONDS
+        
+        with self._lock:
+            now = time.time()
+            if self._merged_signature is not None and now - self._last_refresh < max_age_seconds:
+                return self._merged_others
+            self._last_refresh = now
+            
+            signature = []
+            payloads = []
+            live_paths = set()
+            
+            for path in self._other_files():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Shard baru saja di-compact
+                
+                live_paths.add(path)
+                cached = self._file_cache.get(path)
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    payload = cached[2]
+                else:
+                    payload = _read_json(path)
+                    if payload is None:
+                        continue
+                    self._file_cache[path] = (stat.st_mtime_ns, stat.st_size, payload)
+                
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+                payloads.append(payload)
+            
+            # Buang cache file yang sudah tidak ada
+            for path in list(self._file_cache):
+                if path not in live_paths:
+                    del self._file_cache[path]
+            
+            signature = tuple(signature)
+            if signature != self._merged_signature:
+                self._merged_others = merge_payloads(payloads)
+                self._merged_signature = signature
+            
+            return self._merged_others
+    
+    @property
+    def signature(self):
+        """Signature (path, mtime, size) file lain pada refresh terakhir."""
+        return self._merged_signature
+    
+    def compact(self, stale_after_seconds: float = None) -> int:
+        """
+        Gabungkan shard worker yang sudah tidak aktif ke file utama.
+        Dijalankan di bawah advisory lock agar hanya satu proses yang compact.
+        
+        Args:
+            stale_after_seconds: Shard dianggap mati jika tidak diubah selama
+                                 N detik (None = dari config)
+        
+        Returns:
+            Jumlah shard yang di-compact
+        """
+        if stale_after_seconds is None:
+            stale_after_seconds = config.ANALYTICS_SHARD_STALE_SECONDS
+        
+        lock_path = f"{self.data_file}.lock"
+        with open(lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                stale = []
+                for path in self.shard_paths():
+                    if path == self.shard_file:
+                        continue
+                    try:
+                        if now - os.path.getmtime(path) >= stale_after_seconds:
+                            stale.append(path)
+                    except FileNotFoundError:
+                        continue
+                
+                if not stale:
+                    return 0
+                
+                payloads = [p for p in (_read_json(path) for path in [self.data_file] + stale) if p]
+                queries, feedback, sessions = merge_payloads(payloads)
+                
+                # Session diurutkan berdasarkan aktivitas terakhir sebelum dipotong
+                ordered_sessions = sorted(sessions.items(), key=lambda item: item[1].get('last_activity', ''))
+                _write_json_atomic(self.data_file, {
+                    'queries': queries[-config.MAX_QUERIES_RETAINED:],
+                    'feedback': feedback[-config.MAX_FEEDBACK_RETAINED:],
+                    'sessions': dict(ordered_sessions[-config.MAX_SESSIONS_RETAINED:]),
+                })
+                
+                for path in stale:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                
+                return len(stale)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+# ============================================================================
+# STRESS TEST LOKAL: beberapa proses menulis bersamaan
+# ============================================================================
+
+def _stress_worker(data_file: str, worker_index: int, events: int):
+    """Worker proses: log N query + 1 feedback lewat HRAnalytics mode sharded."""
+    config.ANALYTICS_STORAGE_MODE = 'sharded'
+    config.SAVE_BATCH_SIZE = 5
+    
+    from analytics import HRAnalytics
+    
+    analytics = HRAnalytics(data_file)
+    for i in range(events):
+        analytics.log_query(
+            f"stress-{worker_index}-{i % 7}",
+            f"pertanyaan {worker_index} {i}",
+            {'category': 'cuti', 'confidence': 80.0, 'is_fallback': False}
+        )
+    analytics.log_feedback(f"stress-{worker_index}-0", 5, None)
+    analytics.close()
+
+
+def run_stress_test(data_file: str, workers: int = 4, events: int = 500) -> bool:
+    """
+    Jalankan beberapa proses yang menulis analytics bersamaan,
+    lalu verifikasi tidak ada event yang hilang atau terduplikasi.
+    
+    Returns:
+        True jika jumlah event hasil merge sesuai
+    """
+    import multiprocessing
+    
+    start = time.perf_counter()
+    processes = [
+        multiprocessing.Process(target=_stress_worker, args=(data_file, i, events))
+        for i in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - start
+    
+    store = ShardedAnalyticsStore(data_file, worker_id='stress-reader')
+    queries, feedback, sessions = store.read_others(max_age_seconds=0)
+    event_ids = [q.get('event_id') for q in queries]
+    
+    expected = workers * events
+    duplicates = len(event_ids) - len(set(event_ids))
+    
+    print(f"Workers: {workers} | Events/worker: {events} | Time: {elapsed:.2f}s")
+    print(f"Queries: {len(queries)}/{expected} | Feedback: {len(feedback)}/{workers} | "
+          f"Sessions: {len(sessions)} | Duplicates: {duplicates}")
+    
+    return len(queries) == expected and len(feedback) == workers and duplicates == 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    
+    parser = argparse.ArgumentParser(description="Stress test storage analytics multi-proses")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--events', type=int, default=500)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ok = run_stress_test(os.path.join(tmp_dir, 'analytics.json'), args.workers, args.events)
+    
+    print("✅ Tidak ada event yang hilang" if ok else "❌ Ada event yang hilang/duplikat")
+    raise SystemExit(0 if ok else 1)
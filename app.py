@@ -20,9 +20,13 @@ from datetime import datetime, timedelta
 # Add parent directory untuk imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hr_knowledge_base import get_flat_qa_pairs, get_categories, HR_KNOWLEDGE_BASE
-from fuzzy_matcher import HRChatbotEngine
+from knowledge_base import get_knowledge_base
+from fuzzy_matcher import get_chatbot_engine
+from kb_watcher import start_kb_watcher
 from analytics import get_analytics
+from autocomplete import get_autocompleter
+from faq_search import get_faq_index
+from metrics_exporter import start_metrics_server
 from config import config
 
 # ============================================================================
@@ -108,10 +112,10 @@ def init_session_state():
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     
-    # Chatbot engine
+    # Chatbot engine (satu engine per proses dipakai bersama semua session,
+    # knowledge base dari config.KB_SOURCE dan bisa di-hot reload oleh kb_watcher)
     if 'chatbot_engine' not in st.session_state:
-        qa_pairs = get_flat_qa_pairs()
-        st.session_state.chatbot_engine = HRChatbotEngine(qa_pairs, threshold=config.FUZZY_THRESHOLD)
+        st.session_state.chatbot_engine = get_chatbot_engine()
     
     # Analytics engine
     if 'analytics' not in st.session_state:
@@ -141,6 +145,14 @@ def init_session_state():
 # Initialize session state
 init_session_state()
 
+# Metrics exporter opsional (hanya start sekali per proses)
+if config.METRICS_ENABLED:
+    start_metrics_server()
+
+# Hot reload knowledge base opsional (hanya start sekali per proses)
+if config.KB_WATCH_ENABLED:
+    start_kb_watcher()
+
 # ============================================================================
 # SIDEBAR NAVIGATION
 # ============================================================================
@@ -357,6 +369,17 @@ def render_chat_page():
         st.session_state.input_counter += 1  # Increment untuk reset input
         st.rerun()
     
+    # Saran pertanyaan untuk input yang belum dikirim (prefix trie, lihat autocomplete.py)
+    if config.AUTOCOMPLETE_ENABLED and user_input and not st.session_state.session_ended:
+        completions = get_autocompleter().suggest(user_input)
+        if completions:
+            st.caption("✨ Maksud Anda:")
+            for i, completion in enumerate(completions):
+                if st.button(completion, key=f"complete_{st.session_state.input_counter}_{i}"):
+                    process_user_input(completion)
+                    st.session_state.input_counter += 1
+                    st.rerun()
+    
     # End chat button
     st.markdown("---")
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -560,6 +583,59 @@ def render_dashboard_page():
     
     with col3:
         st.metric("Confidence Maximum", f"{conf_stats['max']:.1f}%")
+    
+    st.markdown("---")
+    
+    # Performance stats (dihitung dari histogram latency)
+    st.subheader("⚡ Performa Response")
+    latency = analytics.get_latency_stats(days)
+    
+    if latency['overall']['count']:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Latency p50", f"{latency['overall']['p50']:.2f} ms")
+        
+        with col2:
+            st.metric("Latency p95", f"{latency['overall']['p95']:.2f} ms")
+        
+        with col3:
+            st.metric("Latency p99", f"{latency['overall']['p99']:.2f} ms")
+        
+        with col4:
+            st.metric(
+                "Cache / Fast Path",
+                f"{latency['cache_hit_rate']:.0f}% / {latency['fast_path_rate']:.0f}%",
+                help="Persentase query yang dijawab dari cache / exact match tanpa fuzzy scoring"
+            )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Terjawab vs Fallback:**")
+            import pandas as pd
+            df_paths = pd.DataFrame([
+                {'Jenis': 'Terjawab', **latency['hit']},
+                {'Jenis': 'Fallback', **latency['fallback']},
+            ])
+            st.dataframe(
+                df_paths[['Jenis', 'count', 'p50', 'p95', 'p99']],
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        with col2:
+            st.markdown("**Latency p95 per Kategori (ms):**")
+            by_category = latency['by_category']
+            if by_category:
+                import pandas as pd
+                df_lat = pd.DataFrame(
+                    [(cat, stats['p95']) for cat, stats in by_category.items()],
+                    columns=['Kategori', 'p95']
+                )
+                st.bar_chart(df_lat.set_index('Kategori'))
+    else:
+        st.info("Belum ada data latency untuk ditampilkan")
 
 
 # ============================================================================
@@ -571,11 +647,12 @@ def render_faq_page():
     st.title("📚 FAQ Lengkap HR")
     st.markdown("---")
     
+    kb = get_knowledge_base()
+    
     # Category filter
-    all_categories = get_categories()
     selected_category = st.selectbox(
         "Filter Kategori:",
-        ["Semua"] + sorted(all_categories)
+        ["Semua"] + list(kb.categories)
     )
     
     # Search
@@ -583,18 +660,34 @@ def render_faq_page():
     
     st.markdown("---")
     
-    # Display FAQs
-    for item in HR_KNOWLEDGE_BASE:
-        # Filter by category
-        if selected_category != "Semua" and item['kategori'] != selected_category:
-            continue
-        
-        # Filter by search term
-        if search_term:
-            if (search_term.lower() not in item['pertanyaan_utama'].lower() and 
-                search_term.lower() not in item['jawaban'].lower()):
-                continue
-        
+    # Cari lewat inverted index (ranked, toleran typo, termasuk variasi);
+    # tanpa pencarian: filter kategori lewat index KB, tanpa scan semua entry
+    category = None if selected_category == "Semua" else selected_category
+    if search_term.strip():
+        entries = [entry for entry, _ in get_faq_index().search(search_term, category)]
+        st.caption(f"{len(entries)} FAQ cocok dengan \"{search_term.strip()}\"")
+    else:
+        entries = kb.entries if category is None else kb.entries_in(category)
+    
+    if not entries:
+        st.info("Tidak ada FAQ yang cocok. Coba kata kunci lain atau tanyakan langsung di halaman Chat.")
+        return
+    
+    # Pagination: hanya entry di halaman aktif yang di-render
+    page_size = config.FAQ_PAGE_SIZE
+    total_pages = (len(entries) + page_size - 1) // page_size
+    page_number = 1
+    if total_pages > 1:
+        page_number = st.number_input(
+            f"Halaman (dari {total_pages}):",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            key=f"faq_page_{selected_category}_{search_term}"
+        )
+    
+    start = (page_number - 1) * page_size
+    for item in entries[start:start + page_size]:
         with st.expander(f"{item['pertanyaan_utama']}"):
             st.markdown(f"**Jawaban:**\n\n{item['jawaban']}")
             st.markdown(f"**Kategori:** `{item['kategori'].upper()}`")
@@ -649,7 +742,7 @@ def render_about_page():
     #### 📂 Kategori yang Tersedia:
     """)
     
-    categories = get_categories()
+    categories = get_knowledge_base().categories
     cols = st.columns(3)
     
     # Icon mapping untuk kategori
@@ -0,0 +1,318 @@
+"""
+HR Chatbot Autocomplete
+========================
+Saran pertanyaan saat user mengetik (typeahead) dari prefix trie.
+
+Cara kerja:
+1. Key trie = frasa yang sudah di-normalize (text_utils.normalize_text):
+   - pertanyaan utama + variasi knowledge base
+   - top pertanyaan historis dari HRAnalytics.get_top_queries
+2. Setiap key menunjuk ke pertanyaan utama entry-nya (frasa kanonik). Pertanyaan
+   historis yang bukan pertanyaan KB diarahkan ke entry yang menjawabnya (matcher),
+   yang jatuh ke fallback tidak dipakai. Memilih saran = query persis pertanyaan
+   KB, sehingga engine bisa memakai exact path (MATCHER_EXACT_FAST_PATH)
+3. Bobot key = bobot dasar (pertanyaan utama > variasi) + jumlah kemunculan di
+   analytics. Top-k saran per node dihitung sekali saat build, sehingga satu
+   keystroke = jalan sepanjang prefix + ambil list yang sudah jadi
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from text_utils import normalize_text
+
+# Bobot dasar key dari knowledge base (pertanyaan historis: jumlah kemunculan)
+MAIN_QUESTION_WEIGHT = 2.0
+VARIATION_WEIGHT = 1.0
+
+
+class _Node:
+    """Node trie: anak per karakter + top-k (-bobot, id saran) di bawah node ini."""
+
+    __slots__ = ('children', 'top', 'weight', 'display_id')
+
+    def __init__(self):
+        self.children = {}
+        self.top = ()
+        self.weight = 0.0
+        self.display_id = -1
+
+
+class PrefixTrie:
+    """
+    Prefix trie dengan top-k completion per node (dihitung di build).
+    Setelah build() trie hanya dibaca, aman dipakai bersama banyak thread.
+    """
+
+    def __init__(self, limit: int = None):
+        """
+        Args:
+            limit: Jumlah saran per node (None = AUTOCOMPLETE_MAX_SUGGESTIONS)
+        """
+        self.limit = limit or config.AUTOCOMPLETE_MAX_SUGGESTIONS
+        self.root = _Node()
+        self.displays = []
+        self._display_ids = {}
+        self.keys = 0
+
+    def add(self, key: str, display: str, weight: float):
+        """
+        Tambah satu key. Key yang sama ditambahkan lagi: bobot dijumlah,
+        saran mengikuti penambahan dengan bobot terbesar.
+
+        Args:
+            key: Frasa yang sudah di-normalize
+            display: Teks saran yang ditampilkan / dikirim
+            weight: Popularitas
+        """
+        if not key:
+            return
+        display_id = self._display_ids.get(display)
+        if display_id is None:
+            display_id = self._display_ids[display] = len(self.displays)
+            self.displays.append(display)
+
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+
+        if node.display_id < 0:
+            self.keys += 1
+            node.display_id = display_id
+        elif weight > node.weight:
+            node.display_id = display_id
+        node.weight += weight
+
+    def build(self) -> 'PrefixTrie':
+        """Hitung top-k setiap node (post-order, iteratif). Returns self."""
+        stack = [(self.root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+
+            # Bobot terbaik per saran dari key di node ini + top anak-anaknya
+            best = {}
+            if node.display_id >= 0:
+                best[node.display_id] = -node.weight
+            for child in node.children.values():
+                for neg_weight, display_id in child.top:
+                    if neg_weight < best.get(display_id, 0.0):
+                        best[display_id] = neg_weight
+            ranked = sorted((neg_weight, display_id) for display_id, neg_weight in best.items())
+            node.top = tuple(ranked[:self.limit])
+        return self
+
+    def complete(self, prefix: str, limit: int = None) -> List[str]:
+        """
+        Saran untuk prefix yang sudah di-normalize.
+
+        Returns:
+            List teks saran, bobot tertinggi dulu (kosong jika tidak ada)
+        """
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.displays[display_id] for _, display_id in node.top[:limit or self.limit]]
+
+
+def build_autocompleter(kb, matcher=None, top_queries: Optional[List[Dict]] = None,
+                        resolved: Optional[Dict[str, Optional[str]]] = None) -> PrefixTrie:
+    """
+    Bangun trie dari knowledge base + pertanyaan historis.
+
+    Args:
+        kb: KnowledgeBase
+        matcher: HRFuzzyMatcher untuk mengarahkan pertanyaan historis ke entry
+            (None = hanya pertanyaan historis yang identik dengan pertanyaan KB)
+        top_queries: Hasil HRAnalytics.get_top_queries ({'query', 'count'})
+        resolved: Cache query -> pertanyaan utama (None = fallback), diisi & dipakai ulang
+
+    Returns:
+        PrefixTrie yang sudah di-build
+    """
+    trie = PrefixTrie()
+    resolved = {} if resolved is None else resolved
+
+    for question, entry_id in zip(kb.questions, kb.flat_entry_ids):
+        entry = kb.get(entry_id)
+        is_main = normalize_text(entry['pertanyaan_utama']) == question
+        trie.add(question, entry['pertanyaan_utama'], MAIN_QUESTION_WEIGHT if is_main else VARIATION_WEIGHT)
+
+    for item in top_queries or ():
+        query = normalize_text(item['query'])
+        if not query:
+            continue
+        if query not in resolved:
+            resolved[query] = _resolve(kb, matcher, query)
+        if resolved[query] is not None:
+            trie.add(query, resolved[query], item['count'])
+
+    return trie.build()
+
+
+def _resolve(kb, matcher, query: str) -> Optional[str]:
+    """Pertanyaan utama entry yang menjawab query (None jika fallback / tidak dikenal)."""
+    entry = kb.find_by_question(query)
+    if entry is None and matcher is not None:
+        top = matcher.find_top_matches(query, 1)
+        if top and top[0][2] >= matcher.threshold:
+            entry = kb.find_by_question(top[0][0])
+    return entry['pertanyaan_utama'] if entry is not None else None
+
+
+class Autocompleter:
+    """
+    Trie aktif + refresh otomatis: dibangun ulang jika knowledge base berganti
+    (hot reload) atau sudah lewat AUTOCOMPLETE_REFRESH_SECONDS (data analytics baru).
+
+    Keystroke tidak pernah menunggu fuzzy scoring: KB baru langsung dapat trie
+    tanpa pertanyaan historis (hanya pertanyaan KB), lalu trie lengkap dengan
+    pertanyaan historis dibangun di background thread dan di-swap saat selesai.
+    """
+    
+    def __init__(self, analytics=None, engine=None):
+        """
+        Args:
+            analytics: HRAnalytics sumber pertanyaan historis (None = tanpa historis)
+            engine: HRChatbotEngine yang matcher-nya dipakai mengarahkan query historis
+        """
+        self.analytics = analytics
+        self.engine = engine
+        self._trie = None
+        self._kb_hash = None
+        self._built_at = 0.0
+        self._resolved = {}
+        self._refreshing = False
+        self._lock = threading.Lock()
+    
+    def _current_trie(self) -> PrefixTrie:
+        """Trie yang dipakai sekarang; jadwalkan refresh di background jika sudah lama."""
+        from knowledge_base import get_knowledge_base
+        kb = get_knowledge_base()
+        trie = self._trie
+        if trie is None or self._kb_hash != kb.content_hash:
+            with self._lock:
+                if self._trie is None or self._kb_hash != kb.content_hash:
+                    # Pertanyaan KB saja: tanpa matcher, cepat; historis menyusul di background
+                    self._trie = build_autocompleter(kb)
+                    self._kb_hash = kb.content_hash
+                    self._built_at = 0.0
+                    self._resolved = {}
+                trie = self._trie
+        
+        if time.monotonic() - self._built_at >= config.AUTOCOMPLETE_REFRESH_SECONDS:
+            self._start_refresh(kb)
+        return trie
+    
+    def _start_refresh(self, kb):
+        """Jalankan _refresh di background thread (paling banyak satu sekaligus)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            # Refresh berikutnya dihitung dari awal refresh ini (juga jika gagal)
+            self._built_at = time.monotonic()
+            resolved = self._resolved
+        threading.Thread(
+            target=self._refresh, args=(kb, resolved), name='autocomplete-refresh', daemon=True
+        ).start()
+    
+    def _refresh(self, kb, resolved: Dict[str, Optional[str]]):
+        """Bangun trie lengkap (KB + pertanyaan historis) lalu swap jika KB belum berganti."""
+        try:
+            top_queries = []
+            if self.analytics is not None:
+                top_queries = self.analytics.get_top_queries(
+                    config.AUTOCOMPLETE_HISTORY_QUERIES, config.AUTOCOMPLETE_HISTORY_DAYS
+                )
+            
+            matcher = self.engine.matcher if self.engine is not None else None
+            trie = build_autocompleter(kb, matcher, top_queries, resolved)
+            with self._lock:
+                if self._kb_hash == kb.content_hash:
+                    self._trie = trie
+        except Exception as e:
+            print(f"⚠️ Error refreshing autocomplete: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def suggest(self, text: str, limit: int = None) -> List[str]:
+        """
+        Saran untuk teks yang sedang diketik user.
+
+        Args:
+            text: Input mentah (belum di-normalize)
+            limit: Maksimal saran (None = AUTOCOMPLETE_MAX_SUGGESTIONS)
+
+        Returns:
+            List pertanyaan kanonik (kosong jika prefix terlalu pendek / tidak ada)
+        """
+        prefix = normalize_text(text)
+        if len(prefix) < config.AUTOCOMPLETE_MIN_PREFIX:
+            return []
+        # Spasi di akhir input = kata sebelumnya sudah lengkap
+        if text[-1:].isspace():
+            prefix += ' '
+        suggestions = self._current_trie().complete(prefix, limit)
+        # Input yang sudah persis sama dengan saran tidak perlu disarankan lagi
+        return [s for s in suggestions if normalize_text(s) != prefix]
+
+
+# Singleton instance
+_autocompleter_instance = None
+_autocompleter_lock = threading.Lock()
+
+
+def get_autocompleter() -> Autocompleter:
+    """
+    Autocompleter bersama untuk semua session (KB aktif + analytics + engine bersama).
+
+    Returns:
+        Autocompleter instance
+    """
+    global _autocompleter_instance
+    with _autocompleter_lock:
+        if _autocompleter_instance is None:
+            from analytics import get_analytics
+            from fuzzy_matcher import get_chatbot_engine
+            _autocompleter_instance = Autocompleter(get_analytics(config.ANALYTICS_FILE), get_chatbot_engine())
+        return _autocompleter_instance
+
+
+# Quick test + latency per keystroke jika file dijalankan langsung
+if __name__ == "__main__":
+    from knowledge_base import get_knowledge_base
+
+    kb = get_knowledge_base()
+    start = time.perf_counter()
+    trie = build_autocompleter(kb)
+    print(f"Build: {len(kb.questions)} key, {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Simulasi mengetik setiap pertanyaan KB huruf per huruf
+    latencies = []
+    for question in kb.questions:
+        for end in range(1, len(question) + 1):
+            t0 = time.perf_counter()
+            trie.complete(question[:end])
+            latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"Keystroke: {len(latencies)} prefix | p50 {p50 * 1000:.1f} us | p99 {p99 * 1000:.1f} us"
+          f" | max {latencies[-1]:.3f} ms")
+
+    for text in ["cuti mel", "gaji", "annual", "reimb", "wfh"]:
+        print(f"\n⌨️ {text!r}")
+        for suggestion in trie.complete(normalize_text(text)):
+            print(f"   → {suggestion}")
@@ -0,0 +1,216 @@
+"""
+HR Chatbot Benchmark - Analytics pada Volume Besar
+===================================================
+Benchmark HRAnalytics dengan dataset sintetis 10k-10M event
+(lihat traffic_generator.py).
+
+Yang diukur per ukuran dataset:
+- Load time (HRAnalytics.__init__ -> _load_data) dan RSS setelah load
+- _save_data: durasi dan bytes yang ditulis
+- Latency setiap method get_* (cold: cache dashboard dikosongkan, warm: dari cache)
+
+Setiap ukuran dijalankan di proses terpisah agar pengukuran RSS tidak
+terpengaruh ukuran sebelumnya. Batas retensi di config dinaikkan selama run
+sehingga seluruh event benar-benar dimuat.
+
+Usage:
+    python benchmarks/bench_analytics.py                          # 10k, 100k, 1M
+    python benchmarks/bench_analytics.py --sizes 10000000         # 10M (butuh RAM besar)
+    python benchmarks/bench_analytics.py --update-baseline
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from bench_utils import (BASELINES_DIR, RESULTS_DIR, new_results, percentile, report_baseline,
+                         rss_mb, save_results)
+from traffic_generator import TrafficGenerator
+
+SIZES_DEFAULT = [10_000, 100_000, 1_000_000]
+SIZES_QUICK = [10_000, 100_000]
+
+# Method dashboard yang diukur: (nama, kwargs)
+GET_METHODS = [
+    ('get_summary_stats', {}),
+    ('get_top_queries', {'n': 10}),
+    ('get_category_distribution', {}),
+    ('get_daily_trends', {}),
+    ('get_hourly_distribution', {}),
+    ('get_feedback_stats', {}),
+    ('get_fallback_rate', {}),
+    ('get_confidence_stats', {}),
+    ('get_latency_stats', {}),
+]
+
+
+def config_overrides(n_events: int, days: int) -> Dict[str, object]:
+    """Setting config agar seluruh dataset dimuat (tanpa trimming retensi)."""
+    return {
+        'ANALYTICS_STORAGE_MODE': 'single',
+        'MAX_QUERIES_RETAINED': n_events,
+        'MAX_FEEDBACK_RETAINED': n_events,
+        'MAX_SESSIONS_RETAINED': n_events,
+        'QUERY_RETENTION_DAYS': days + 1,
+        'FEEDBACK_RETENTION_DAYS': days + 1,
+        'SESSION_RETENTION_DAYS': days + 1,
+        'HEAVY_HITTER_DAYS': days + 1,
+        'HISTOGRAM_DAYS': days + 1,
+    }
+
+
+def measure_dataset(data_file: str, overrides: Dict[str, object], repeats: int) -> Dict[str, dict]:
+    """
+    Ukur satu dataset. Dijalankan di proses anak (spawn).
+
+    Args:
+        data_file: File dataset (format hr_analytics_data.json)
+        overrides: Setting config yang di-override
+        repeats: Berapa kali setiap method get_* diulang (cold)
+
+    Returns:
+        Dict case -> metrics
+    """
+    from config import config
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    from analytics import HRAnalytics
+
+    cases = {}
+    rss_before, _ = rss_mb()
+
+    start = time.perf_counter()
+    analytics = HRAnalytics(data_file, async_writer=False)
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_after, rss_peak = rss_mb()
+
+    cases['load'] = {
+        'load_ms': round(load_ms, 2),
+        'queries': len(analytics.queries),
+        'feedback': len(analytics.feedback),
+        'sessions': len(analytics.sessions),
+        'rss_mb': round(rss_after - rss_before, 1),
+        'peak_rss_mb': round(rss_peak, 1),
+    }
+
+    # Save ditulis ke file lain agar dataset input tidak berubah
+    analytics.data_file = data_file + '.saved'
+    start = time.perf_counter()
+    analytics._save_data(force=True)
+    save_ms = (time.perf_counter() - start) * 1000
+    cases['save'] = {
+        'save_ms': round(save_ms, 2),
+        'save_bytes': analytics.get_writer_metrics()['last_flush_bytes'],
+    }
+    os.remove(analytics.data_file)
+
+    for method_name, kwargs in GET_METHODS:
+        method = getattr(analytics, method_name)
+        cold = []
+        for _ in range(repeats):
+            analytics._result_cache.clear()
+            start = time.perf_counter()
+            method(**kwargs)
+            cold.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        method(**kwargs)
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        cold.sort()
+        cases[method_name] = {
+            'cold_p50_ms': round(percentile(cold, 50), 3),
+            'cold_max_ms': round(cold[-1], 3),
+            'warm_ms': round(warm_ms, 4),
+        }
+
+    _, cases['load']['peak_rss_mb'] = rss_mb()
+    return cases
+
+
+def run_benchmark(sizes: List[int], days: int, repeats: int, seed: int, work_dir: str,
+                  timeout: float = None) -> dict:
+    """
+    Generate dataset untuk setiap ukuran lalu ukur di proses terpisah.
+    Proses pengukuran yang melewati timeout detik dihentikan (SystemExit 1),
+    sehingga method yang hang membuat benchmark gagal, bukan ikut hang.
+
+    Returns:
+        Dict hasil (lihat bench_utils.new_results), case key: <events>/<metric group>
+    """
+    results = new_results('analytics', {'sizes': sizes, 'days': days, 'repeats': repeats, 'seed': seed})
+    context = multiprocessing.get_context('spawn')
+
+    for n_events in sizes:
+        data_file = os.path.join(work_dir, f'analytics-{n_events}.json')
+        print(f"\n📦 {n_events:,} event: generate dataset...")
+        start = time.perf_counter()
+        stats = TrafficGenerator(seed=seed, days=days).write_dataset(data_file, n_events)
+        print(f"   {stats['queries']:,} queries, {stats['feedback']:,} feedback, {stats['sessions']:,} sessions"
+              f" ({stats['bytes'] / 1e6:.1f} MB) dalam {time.perf_counter() - start:.1f} s")
+
+        with context.Pool(1) as pool:
+            job = pool.apply_async(measure_dataset, (data_file, config_overrides(n_events, days), repeats))
+            try:
+                cases = job.get(timeout=timeout)
+            except multiprocessing.TimeoutError:
+                print(f"❌ Pengukuran {n_events:,} event tidak selesai dalam {timeout:g} s")
+                raise SystemExit(1)
+        os.remove(data_file)
+
+        cases['load']['file_mb'] = round(stats['bytes'] / 1e6, 1)
+        for name, metrics in cases.items():
+            results['cases'][f"{n_events}/{name}"] = metrics
+
+        load, save = cases['load'], cases['save']
+        print(f"   load {load['load_ms']:.0f} ms | RSS +{load['rss_mb']:.0f} MB (peak {load['peak_rss_mb']:.0f} MB)"
+              f" | save {save['save_ms']:.0f} ms, {save['save_bytes'] / 1e6:.1f} MB")
+        for method_name, _ in GET_METHODS:
+            metrics = cases[method_name]
+            print(f"   {method_name:<26} cold {metrics['cold_p50_ms']:>10.2f} ms"
+                  f" | warm {metrics['warm_ms']:>8.4f} ms")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark analytics dengan traffic sintetis")
+    parser.add_argument('--sizes', type=str, default=None,
+                        help="Jumlah event, dipisah koma (default: 10000,100000,1000000)")
+    parser.add_argument('--days', type=int, default=30, help="Rentang hari traffic")
+    parser.add_argument('--repeats', type=int, default=3, help="Pengulangan cold call per method")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quick', action='store_true', help="Run singkat: 10k dan 100k event")
+    parser.add_argument('--timeout', type=float, default=1800,
+                        help="Batas detik pengukuran per ukuran dataset")
+    parser.add_argument('--work-dir', type=str, default=None, help="Folder dataset sementara (default: temp)")
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'analytics-latest.json'))
+    parser.add_argument('--baseline', type=str, default=os.path.join(BASELINES_DIR, 'analytics.json'))
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(',')]
+    else:
+        sizes = SIZES_QUICK if args.quick else SIZES_DEFAULT
+
+    print("=" * 60)
+    print("HR CHATBOT - ANALYTICS BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        results = run_benchmark(sizes, args.days, args.repeats, args.seed, work_dir, args.timeout)
+    save_results(args.output, results)
+
+    exit_code = report_baseline(
+        results, args.baseline,
+        metrics=['load_ms', 'rss_mb', 'save_ms', 'save_bytes', 'cold_p50_ms'],
+        threshold=args.threshold,
+        update=args.update_baseline,
+    )
+    raise SystemExit(exit_code)
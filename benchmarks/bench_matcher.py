@@ -0,0 +1,261 @@
+"""
+HR Chatbot Benchmark - Matcher Latency vs Ukuran Knowledge Base
+================================================================
+Benchmark reproducible untuk HRFuzzyMatcher & HRChatbotEngine.
+
+Cara kerja:
+1. HR_KNOWLEDGE_BASE diperbesar secara sintetis 1x..100x: salinan ke-k
+   berisi pertanyaan yang sama dengan perturbasi acak (typo, kata pengisi,
+   urutan kata) dari seed tetap
+2. Untuk setiap ukuran, ukur find_best_match, find_top_matches dan
+   get_response pada 3 jenis query:
+   - hit       : identik dengan pertanyaan di knowledge base
+   - near_miss : pertanyaan knowledge base dengan typo
+   - fallback  : pertanyaan di luar topik HR
+3. Latency (p50/p95/p99), throughput dan peak memory (tracemalloc)
+   disimpan ke JSON, lalu dibandingkan dengan baseline
+
+Usage:
+    python benchmarks/bench_matcher.py                     # full run
+    python benchmarks/bench_matcher.py --quick             # run singkat
+    python benchmarks/bench_matcher.py --update-baseline   # simpan baseline baru
+"""
+
+import argparse
+import gc
+import os
+import random
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from bench_utils import BASELINES_DIR, RESULTS_DIR, new_results, report_baseline, save_results, summarize_latencies
+
+from config import config
+from fuzzy_matcher import HRChatbotEngine
+from hr_knowledge_base import get_flat_qa_pairs
+from query_samples import OFF_TOPIC_QUERIES, add_typo
+
+# Kata pengisi yang umum muncul di chat karyawan
+FILLER_WORDS = ["dong", "ya", "sih", "kak", "min", "tolong", "mohon info", "gimana"]
+
+SCALES_FULL = [1, 5, 10, 25, 50, 100]
+SCALES_QUICK = [1, 10]
+
+METHODS = ['find_best_match', 'find_top_matches', 'get_response']
+QUERY_KINDS = ['hit', 'near_miss', 'fallback']
+
+
+def perturb_question(text: str, rng: random.Random) -> str:
+    """
+    Buat variasi sintetis dari satu pertanyaan (1-3 perturbasi acak).
+
+    Args:
+        text: Pertanyaan asli
+        rng: Random generator (seeded)
+    """
+    for _ in range(rng.randint(1, 3)):
+        op = rng.choice(('typo', 'filler', 'reorder'))
+        if op == 'typo':
+            text = add_typo(text, rng)
+        elif op == 'filler':
+            words = text.split()
+            words.insert(rng.randint(0, len(words)), rng.choice(FILLER_WORDS))
+            text = ' '.join(words)
+        else:
+            words = text.split()
+            if len(words) >= 2:
+                i = rng.randrange(len(words) - 1)
+                words[i], words[i + 1] = words[i + 1], words[i]
+                text = ' '.join(words)
+    return text
+
+
+def scale_qa_pairs(qa_pairs: List[Tuple[str, str, str]], scale: int, seed: int) -> List[Tuple[str, str, str]]:
+    """
+    Perbesar knowledge base: salinan pertama asli, sisanya diperturbasi.
+
+    Args:
+        qa_pairs: List of (pertanyaan, jawaban, kategori) asli
+        scale: Faktor pembesaran (1 = asli)
+        seed: Seed agar hasil reproducible
+    """
+    rng = random.Random(seed)
+    scaled = list(qa_pairs)
+    for _ in range(scale - 1):
+        scaled.extend(
+            (perturb_question(question, rng), answer, category)
+            for question, answer, category in qa_pairs
+        )
+    return scaled
+
+
+def build_queries(qa_pairs: List[Tuple[str, str, str]], count: int, seed: int) -> dict:
+    """
+    Buat query per jenis (hit / near_miss / fallback) dari knowledge base asli.
+
+    Args:
+        qa_pairs: Knowledge base asli (belum diperbesar)
+        count: Jumlah query per jenis
+        seed: Seed agar hasil reproducible
+    """
+    rng = random.Random(seed)
+    questions = [q for q, _, _ in qa_pairs]
+
+    hits = rng.sample(questions, min(count, len(questions)))
+    near_misses = [add_typo(add_typo(q.lower(), rng), rng) for q in rng.sample(questions, min(count, len(questions)))]
+    fallbacks = [
+        OFF_TOPIC_QUERIES[i % len(OFF_TOPIC_QUERIES)] + ("" if i < len(OFF_TOPIC_QUERIES) else f" {i}")
+        for i in range(count)
+    ]
+
+    return {'hit': hits, 'near_miss': near_misses, 'fallback': fallbacks}
+
+
+def call_method(engine: HRChatbotEngine, method: str, query: str) -> bool:
+    """
+    Jalankan satu method dan kembalikan apakah query ter-match (bukan fallback).
+    """
+    if method == 'find_best_match':
+        answer, _, _ = engine.matcher.find_best_match(query)
+        return answer is not None
+    if method == 'find_top_matches':
+        top = engine.matcher.find_top_matches(query)
+        return bool(top) and top[0][2] >= engine.matcher.threshold
+    return not engine.get_response(query)['is_fallback']
+
+
+def time_queries(engine: HRChatbotEngine, method: str, queries: List[str]) -> dict:
+    """
+    Ukur latency setiap query untuk satu method.
+
+    Returns:
+        Ringkasan latency + match_rate
+    """
+    # Warm-up (import lazy, cache CPU) tidak ikut diukur
+    call_method(engine, method, queries[0])
+
+    latencies = []
+    matched = 0
+    start = time.perf_counter()
+    for query in queries:
+        t0 = time.perf_counter_ns()
+        matched += call_method(engine, method, query)
+        latencies.append((time.perf_counter_ns() - t0) / 1e6)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize_latencies(latencies, elapsed)
+    summary['match_rate'] = round(matched / len(queries), 3)
+    return summary
+
+
+def measure_memory(qa_pairs: List[Tuple[str, str, str]], queries: dict, per_kind: int) -> dict:
+    """
+    Ukur peak memory build index dan peak memory saat query (tracemalloc).
+    Dipisah dari pengukuran latency karena tracemalloc memperlambat eksekusi.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        engine = HRChatbotEngine(qa_pairs)
+        build_ms = (time.perf_counter() - t0) * 1000
+        _, build_peak = tracemalloc.get_traced_memory()
+
+        tracemalloc.reset_peak()
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        for kind in QUERY_KINDS:
+            for query in queries[kind][:per_kind]:
+                for method in METHODS:
+                    call_method(engine, method, query)
+        _, query_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'pairs': len(qa_pairs),
+        'build_ms': round(build_ms, 2),
+        'build_peak_kb': round(build_peak / 1024, 1),
+        'query_peak_kb': round((query_peak - baseline_current) / 1024, 1),
+    }
+
+
+def run_benchmark(scales: List[int], queries_per_kind: int, seed: int) -> dict:
+    """
+    Jalankan benchmark untuk semua scale.
+
+    Returns:
+        Dict hasil (lihat bench_utils.new_results), case key: x<scale>/<method>/<kind>
+    """
+    base_pairs = get_flat_qa_pairs()
+    queries = build_queries(base_pairs, queries_per_kind, seed)
+    results = new_results('matcher', {
+        'scales': scales,
+        'queries_per_kind': queries_per_kind,
+        'seed': seed,
+        'base_pairs': len(base_pairs),
+        'fuzzy_threshold': config.FUZZY_THRESHOLD,
+    })
+
+    # Response cache dimatikan agar get_response mengukur matching, bukan cache
+    original_cache_size = config.RESPONSE_CACHE_SIZE
+    config.RESPONSE_CACHE_SIZE = 0
+    try:
+        for scale in scales:
+            qa_pairs = scale_qa_pairs(base_pairs, scale, seed)
+            print(f"\n📏 Scale x{scale}: {len(qa_pairs)} pertanyaan")
+
+            memory = measure_memory(qa_pairs, queries, per_kind=2)
+            results['cases'][f"x{scale}/build"] = memory
+            print(f"   build {memory['build_ms']:.1f} ms | peak build {memory['build_peak_kb']:.0f} KB"
+                  f" | peak query {memory['query_peak_kb']:.0f} KB")
+
+            engine = HRChatbotEngine(qa_pairs)
+            for method in METHODS:
+                for kind in QUERY_KINDS:
+                    summary = time_queries(engine, method, queries[kind])
+                    results['cases'][f"x{scale}/{method}/{kind}"] = summary
+                    print(f"   {method:<17} {kind:<10} p50 {summary['p50_ms']:>9.3f} ms"
+                          f" | p95 {summary['p95_ms']:>9.3f} ms"
+                          f" | {summary['throughput_per_s']:>9.1f} q/s"
+                          f" | match {summary['match_rate']:.0%}")
+    finally:
+        config.RESPONSE_CACHE_SIZE = original_cache_size
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark latency matcher vs ukuran knowledge base")
+    parser.add_argument('--scales', type=str, default=None,
+                        help="Faktor pembesaran, dipisah koma (default: 1,5,10,25,50,100)")
+    parser.add_argument('--queries', type=int, default=20, help="Jumlah query per jenis")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quick', action='store_true', help="Run singkat: scale 1,10 dan 5 query per jenis")
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'matcher-latest.json'))
+    parser.add_argument('--baseline', type=str, default=os.path.join(BASELINES_DIR, 'matcher.json'))
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Regression jika lebih lambat/besar dari baseline lebih dari fraksi ini")
+    parser.add_argument('--update-baseline', action='store_true', help="Simpan hasil run ini sebagai baseline")
+    args = parser.parse_args()
+
+    if args.scales:
+        scales = [int(s) for s in args.scales.split(',')]
+    else:
+        scales = SCALES_QUICK if args.quick else SCALES_FULL
+    queries_per_kind = 5 if args.quick else args.queries
+
+    print("=" * 60)
+    print("HR CHATBOT - MATCHER BENCHMARK")
+    print("=" * 60)
+
+    results = run_benchmark(scales, queries_per_kind, args.seed)
+    save_results(args.output, results)
+
+    exit_code = report_baseline(
+        results, args.baseline,
+        metrics=['p50_ms', 'p95_ms', 'build_peak_kb', 'query_peak_kb'],
+        threshold=args.threshold,
+        update=args.update_baseline,
+    )
+    raise SystemExit(exit_code)
@@ -0,0 +1,176 @@
+"""
+HR Chatbot Benchmark - Memory per QA Pair
+==========================================
+Bandingkan memory representasi state HRFuzzyMatcher pada knowledge base besar
+(default ~100k pertanyaan, lihat bench_matcher.scale_qa_pairs):
+- lists    : representasi default (list paralel + tuple qa_pairs + dict exact index)
+- compact  : CompactQAStore (blob UTF-8 + offsets, tabel jawaban/kategori + id kecil)
+- snapshot : snapshot mmap (matcher_snapshot), data di page cache bukan heap
+
+Setiap mode dijalankan di proses spawn terpisah. QA pairs di-load (unpickle) di
+dalam pengukuran, jadi data input yang tetap dipegang matcher ikut terhitung,
+sedangkan yang bisa dibuang setelah build tidak.
+
+Yang diukur per mode:
+- bytes_per_pair : heap Python (tracemalloc) yang tersisa setelah build / jumlah baris
+- heap_mb, build_ms
+- rss_anon_mb    : kenaikan RssAnon, termasuk puncak saat build (allocator Python
+                   tidak selalu mengembalikan memory yang sudah dibebaskan ke OS)
+- fuzzy_p50_ms   : latency find_best_match (scan semua pertanyaan)
+- exact_us       : latency lookup exact index
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --scale 50 --update-baseline
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+
+from bench_matcher import scale_qa_pairs
+from bench_utils import (BASELINES_DIR, RESULTS_DIR, new_results, percentile, report_baseline,
+                         rss_breakdown_mb, save_results)
+
+from hr_knowledge_base import get_flat_qa_pairs
+
+MODES = ('lists', 'compact', 'snapshot')
+
+QUERIES = [
+    "berapa lama cuti melahirkan",
+    "kapan gaji dibayarkan bulan ini",
+    "cara klaim reimbursement kacamata",
+]
+
+
+def measure_mode(mode: str, pairs_file: str, snapshot_file: str, exact_lookups: int) -> dict:
+    """
+    Ukur satu representasi. Dijalankan di proses anak (spawn).
+
+    Returns:
+        Dict metrics
+    """
+    from config import config
+    from fuzzy_matcher import HRFuzzyMatcher
+    config.MATCHER_COMPACT_STORAGE = (mode == 'compact')
+
+    gc.collect()
+    rss_before = rss_breakdown_mb().get('anon_mb', 0.0)
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    if mode == 'snapshot':
+        from matcher_snapshot import open_snapshot
+        matcher = HRFuzzyMatcher.from_snapshot(open_snapshot(snapshot_file))
+    else:
+        with open(pairs_file, 'rb') as f:
+            pairs = pickle.load(f)
+        matcher = HRFuzzyMatcher(pairs)
+        del pairs
+    build_ms = (time.perf_counter() - start) * 1000
+
+    gc.collect()
+    heap_bytes, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_breakdown_mb().get('anon_mb', 0.0)
+    rows = len(matcher.questions)
+
+    latencies = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        matcher.find_best_match(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    step = max(1, rows // exact_lookups)
+    keys = [matcher.questions[i] for i in range(0, rows, step)]
+    start = time.perf_counter()
+    for key in keys:
+        matcher.exact_index.get(key)
+    exact_us = (time.perf_counter() - start) * 1e6 / len(keys)
+
+    return {
+        'rows': rows,
+        'bytes_per_pair': round(heap_bytes / rows, 1),
+        'heap_mb': round(heap_bytes / 1e6, 2),
+        'heap_peak_mb': round(heap_peak / 1e6, 2),
+        'rss_anon_mb': round(rss_after - rss_before, 2),
+        'build_ms': round(build_ms, 2),
+        'fuzzy_p50_ms': round(percentile(latencies, 50), 2),
+        'exact_us': round(exact_us, 3),
+    }
+
+
+def run_benchmark(scale: int, seed: int, modes, exact_lookups: int) -> dict:
+    """
+    Siapkan QA pairs + snapshot lalu ukur setiap mode di proses terpisah.
+
+    Returns:
+        Dict hasil (lihat bench_utils.new_results), case key: <mode>
+    """
+    from matcher_snapshot import write_snapshot
+    from text_utils import normalize_text
+
+    pairs = scale_qa_pairs(get_flat_qa_pairs(), scale, seed)
+    results = new_results('memory', {'scale': scale, 'pairs': len(pairs), 'seed': seed})
+    print(f"{len(pairs):,} QA pairs")
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as work_dir:
+        pairs_file = os.path.join(work_dir, 'pairs.pkl')
+        with open(pairs_file, 'wb') as f:
+            pickle.dump(pairs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot_file = os.path.join(work_dir, 'matcher.snap')
+        snapshot_bytes = write_snapshot(snapshot_file, pairs, [normalize_text(q) for q, _, _ in pairs])
+
+        for mode in modes:
+            with context.Pool(1) as pool:
+                metrics = pool.apply(measure_mode, (mode, pairs_file, snapshot_file, exact_lookups))
+            if mode == 'snapshot':
+                metrics['file_bytes_per_pair'] = round(snapshot_bytes / len(pairs), 1)
+            results['cases'][mode] = metrics
+
+            print(f"\n⚙️ {mode:<9} {metrics['bytes_per_pair']:>8.1f} B/pair | heap {metrics['heap_mb']:>7.2f} MB"
+                  f" | RSS anon +{metrics['rss_anon_mb']:.1f} MB | build {metrics['build_ms']:.0f} ms"
+                  f" | fuzzy p50 {metrics['fuzzy_p50_ms']:.0f} ms | exact {metrics['exact_us']:.2f} us")
+
+    reference = results['cases'].get('lists')
+    if reference:
+        for mode, metrics in results['cases'].items():
+            if mode != 'lists' and metrics['bytes_per_pair']:
+                ratio = reference['bytes_per_pair'] / metrics['bytes_per_pair']
+                print(f"   {mode}: {ratio:.1f}x lebih kecil dari lists")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory per QA pair")
+    parser.add_argument('--scale', type=int, default=220, help="Faktor perbesaran KB (220 = ~100k pairs)")
+    parser.add_argument('--modes', type=str, default=','.join(MODES))
+    parser.add_argument('--exact-lookups', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'memory-latest.json'))
+    parser.add_argument('--baseline', type=str, default=os.path.join(BASELINES_DIR, 'memory.json'))
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HR CHATBOT - MEMORY BENCHMARK")
+    print("=" * 60)
+
+    results = run_benchmark(args.scale, args.seed, args.modes.split(','), args.exact_lookups)
+    save_results(args.output, results)
+
+    exit_code = report_baseline(
+        results, args.baseline,
+        metrics=['bytes_per_pair', 'build_ms'],
+        threshold=args.threshold,
+        update=args.update_baseline,
+    )
+    raise SystemExit(exit_code)
@@ -0,0 +1,119 @@
+"""
+HR Chatbot Benchmark - Index Matcher Private vs Shared Memory
+==============================================================
+Ukur memory per proses worker untuk data knowledge base:
+- private : setiap worker membangun HRFuzzyMatcher sendiri (list di heap proses)
+- shared  : parent mem-publish index ke shared memory (matcher_shm),
+            worker hanya attach read-only
+
+Setiap worker dijalankan di proses spawn terpisah, load KB, lalu menjalankan
+beberapa query (menyentuh semua pertanyaan). Yang dilaporkan per worker:
+- startup_ms : waktu sampai matcher siap
+- anon_mb    : kenaikan RssAnon (memory private proses, yang dikalikan N worker)
+- shmem_mb   : kenaikan RssShmem (halaman shared memory, fisiknya hanya satu)
+
+Usage:
+    python benchmarks/bench_shared_index.py
+    python benchmarks/bench_shared_index.py --scale 220 --workers 4   # ~100k pertanyaan
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+
+from bench_matcher import scale_qa_pairs
+from bench_utils import RESULTS_DIR, new_results, rss_breakdown_mb, save_results
+
+from hr_knowledge_base import get_flat_qa_pairs
+
+QUERIES = [
+    "berapa lama cuti melahirkan",
+    "kapan gaji dibayarkan bulan ini",
+    "cara klaim reimbursement kacamata",
+]
+
+
+def run_worker(mode: str, pairs_file: str, kb_hash: str) -> dict:
+    """
+    Satu worker (proses spawn): siapkan matcher lalu jalankan query.
+
+    Returns:
+        Dict startup_ms, anon_mb, shmem_mb
+    """
+    from fuzzy_matcher import HRFuzzyMatcher
+    from text_utils import normalize_text
+
+    before = rss_breakdown_mb()
+    start = time.perf_counter()
+    if mode == 'private':
+        # Sama seperti proses tanpa shared memory: load KB lalu bangun list sendiri
+        with open(pairs_file, 'rb') as f:
+            pairs = pickle.load(f)
+        matcher = HRFuzzyMatcher(pairs)
+    else:
+        from matcher_shm import publish_or_attach
+        snapshot = publish_or_attach((), (), kb_hash)
+        matcher = HRFuzzyMatcher.from_snapshot(snapshot)
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    for query in QUERIES:
+        matcher.find_best_match(query)
+    matcher.find_best_match(normalize_text(matcher.qa_pairs[len(matcher.qa_pairs) // 2][0]))
+
+    after = rss_breakdown_mb()
+    return {
+        'startup_ms': round(startup_ms, 2),
+        'anon_mb': round(after.get('anon_mb', 0) - before.get('anon_mb', 0), 2),
+        'shmem_mb': round(after.get('shmem_mb', 0) - before.get('shmem_mb', 0), 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory index matcher private vs shared memory")
+    parser.add_argument('--scale', type=int, default=50, help="Faktor perbesaran knowledge base")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'shared-index-latest.json'))
+    args = parser.parse_args()
+
+    from matcher_shm import publish_or_attach
+    from text_utils import normalize_text
+
+    pairs = scale_qa_pairs(get_flat_qa_pairs(), args.scale, args.seed)
+    kb_hash = hashlib.sha256(pickle.dumps(pairs)).hexdigest()
+
+    print("=" * 60)
+    print("HR CHATBOT - SHARED INDEX BENCHMARK")
+    print("=" * 60)
+    print(f"{len(pairs)} pertanyaan | {args.workers} worker")
+
+    # Parent = proses pertama yang mem-publish segment
+    snapshot = publish_or_attach(pairs, [normalize_text(q) for q, _, _ in pairs], kb_hash)
+    if snapshot is None:
+        raise SystemExit(1)
+
+    results = new_results('shared_index', {'pairs': len(pairs), 'workers': args.workers, 'seed': args.seed})
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pairs_file = os.path.join(temp_dir, 'pairs.pkl')
+        with open(pairs_file, 'wb') as f:
+            pickle.dump(pairs, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        for mode in ('private', 'shared'):
+            with context.Pool(args.workers) as pool:
+                workers = pool.starmap(run_worker, [(mode, pairs_file, kb_hash)] * args.workers)
+            case = {
+                'startup_ms': round(sum(w['startup_ms'] for w in workers) / len(workers), 2),
+                'anon_mb_per_worker': round(sum(w['anon_mb'] for w in workers) / len(workers), 2),
+                'shmem_mb_per_worker': round(sum(w['shmem_mb'] for w in workers) / len(workers), 2),
+            }
+            case['anon_mb_total'] = round(case['anon_mb_per_worker'] * args.workers, 2)
+            results['cases'][mode] = case
+            print(f"\n⚙️ {mode:<8} startup {case['startup_ms']:>8.2f} ms | private {case['anon_mb_per_worker']:>7.2f} MB/worker"
+                  f" (total {case['anon_mb_total']:.1f} MB) | shared {case['shmem_mb_per_worker']:.2f} MB")
+
+    save_results(args.output, results)
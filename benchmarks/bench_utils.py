@@ -0,0 +1,229 @@
+"""
+HR Chatbot Benchmark Utilities
+===============================
+Helper bersama untuk script di folder benchmarks/:
+- Ringkasan latency (percentile, throughput)
+- Simpan / baca hasil JSON
+- Bandingkan hasil dengan baseline + regression threshold
+"""
+
+import json
+import math
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Root repo agar module chatbot bisa di-import saat script dijalankan langsung
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Folder default untuk hasil run & baseline
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+BASELINES_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'baselines')
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """
+    Percentile exact (nearest-rank) dari list yang sudah terurut.
+
+    Args:
+        sorted_values: Nilai terurut ascending
+        p: Percentile 0-100
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies_ms: List[float], total_seconds: float = None) -> dict:
+    """
+    Ringkas list latency menjadi statistik standar.
+
+    Args:
+        latencies_ms: Latency per operasi dalam milidetik
+        total_seconds: Durasi wall-clock seluruh run (None = jumlah latency)
+
+    Returns:
+        Dict: count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, throughput_per_s
+    """
+    values = sorted(latencies_ms)
+    count = len(values)
+    if total_seconds is None:
+        total_seconds = sum(values) / 1000
+
+    return {
+        'count': count,
+        'mean_ms': round(sum(values) / count, 4) if count else 0.0,
+        'p50_ms': round(percentile(values, 50), 4),
+        'p95_ms': round(percentile(values, 95), 4),
+        'p99_ms': round(percentile(values, 99), 4),
+        'max_ms': round(values[-1], 4) if count else 0.0,
+        'throughput_per_s': round(count / total_seconds, 2) if total_seconds > 0 else 0.0,
+    }
+
+
+def environment_info() -> dict:
+    """Info mesin/interpreter, disimpan bersama hasil agar baseline bisa dibandingkan."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def rss_mb() -> Tuple[float, float]:
+    """
+    Resident memory proses ini.
+
+    Returns:
+        Tuple of (current_mb, peak_mb). current_mb = peak_mb jika /proc tidak tersedia
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(fields['VmRSS'].split()[0]) / 1024, int(fields['VmHWM'].split()[0]) / 1024
+    except (IOError, OSError, KeyError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss dalam KB di Linux, bytes di macOS
+        peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+        return peak_mb, peak_mb
+
+
+def rss_breakdown_mb() -> Dict[str, float]:
+    """
+    Rincian resident memory (Linux): private anonymous, file-backed (mmap) dan shared memory.
+
+    Returns:
+        Dict anon_mb, file_mb, shmem_mb (kosong jika /proc tidak tersedia)
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {
+            'anon_mb': int(fields['RssAnon'].split()[0]) / 1024,
+            'file_mb': int(fields['RssFile'].split()[0]) / 1024,
+            'shmem_mb': int(fields['RssShmem'].split()[0]) / 1024,
+        }
+    except (IOError, OSError, KeyError, ValueError):
+        return {}
+
+
+def save_results(path: str, results: dict):
+    """
+    Simpan hasil benchmark ke file JSON (folder dibuat jika belum ada).
+
+    Args:
+        path: Path file output
+        results: Dict hasil benchmark
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Hasil disimpan ke {path}")
+
+
+def load_results(path: str) -> Optional[dict]:
+    """Baca hasil/baseline JSON. Return None jika file tidak ada atau rusak."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"⚠️ Error reading {path}: {e}")
+        return None
+
+
+def new_results(benchmark: str, params: dict) -> dict:
+    """Kerangka dict hasil: metadata + 'cases' yang diisi oleh benchmark."""
+    return {
+        'benchmark': benchmark,
+        'created_at': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'params': params,
+        'cases': {},
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, metrics: List[str], threshold: float,
+                        min_delta: float = 0.05) -> List[Tuple[str, str, float, float, float]]:
+    """
+    Bandingkan hasil dengan baseline untuk setiap case yang ada di keduanya.
+    Nilai metric diasumsikan "lebih kecil lebih baik" (latency, memory).
+
+    Args:
+        results: Hasil run sekarang
+        baseline: Hasil baseline
+        metrics: Nama metric yang dibandingkan, contoh ['p50_ms', 'p95_ms']
+        threshold: Regression jika current > baseline * (1 + threshold)
+        min_delta: Selisih absolut minimum agar dianggap regression
+            (menghindari false alarm pada operasi mikrodetik yang noisy)
+
+    Returns:
+        List regression: (case, metric, baseline_value, current_value, ratio)
+    """
+    if baseline.get('environment') != results.get('environment'):
+        print("⚠️ Baseline dibuat di environment berbeda, perbandingan bisa tidak akurat")
+    if baseline.get('params') != results.get('params'):
+        print("⚠️ Parameter benchmark berbeda dengan baseline, hanya case yang sama yang dibandingkan")
+
+    regressions = []
+    base_cases = baseline.get('cases', {})
+
+    print(f"\n{'case':<48} {'metric':<16} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for case, current in sorted(results.get('cases', {}).items()):
+        base = base_cases.get(case)
+        if base is None:
+            continue
+        for metric in metrics:
+            base_value, current_value = base.get(metric), current.get(metric)
+            if not base_value or current_value is None:
+                continue
+            ratio = current_value / base_value
+            flag = ""
+            if ratio > 1 + threshold and current_value - base_value >= min_delta:
+                regressions.append((case, metric, base_value, current_value, ratio))
+                flag = " ❌"
+            print(f"{case:<48} {metric:<16} {base_value:>12.3f} {current_value:>12.3f} {ratio:>6.2f}x{flag}")
+
+    return regressions
+
+
+def report_baseline(results: dict, baseline_path: str, metrics: List[str],
+                    threshold: float, update: bool) -> int:
+    """
+    Alur standar baseline di akhir benchmark.
+
+    Args:
+        results: Hasil run sekarang
+        baseline_path: Path file baseline
+        metrics: Metric yang dibandingkan
+        threshold: Regression threshold (0.2 = 20% lebih lambat)
+        update: True = tulis hasil sekarang sebagai baseline baru
+
+    Returns:
+        Exit code: 0 jika tidak ada regression, 1 jika ada
+    """
+    if update:
+        save_results(baseline_path, results)
+        return 0
+
+    baseline = load_results(baseline_path)
+    if baseline is None:
+        print(f"ℹ️ Baseline {baseline_path} belum ada, jalankan dengan --update-baseline untuk membuatnya")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, metrics, threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression melebihi threshold {threshold:.0%}")
+        return 1
+
+    print(f"\n✅ Tidak ada regression melebihi threshold {threshold:.0%}")
+    return 0
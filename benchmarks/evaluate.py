@@ -0,0 +1,267 @@
+"""
+HR Chatbot Evaluation - Akurasi + Latency pada Dataset Asli
+============================================================
+Evaluasi HRChatbotEngine dengan dataset_asli_qna_hr_internal.xlsx
+(kolom pertanyaan & jawaban yang diharapkan).
+
+Cara kerja:
+1. Workbook dibaca secara streaming (openpyxl read_only)
+2. Setiap pertanyaan (+ variasi typo opsional) dijalankan lewat get_response
+   secara paralel di beberapa proses
+3. Dilaporkan per konfigurasi matcher:
+   - accuracy      : jawaban sama dengan jawaban yang diharapkan
+   - precision     : accuracy di antara query yang tidak fallback
+   - fallback rate
+   - recall@k      : jawaban yang diharapkan ada di top-k find_top_matches
+   - latency p50/p95/p99 get_response
+4. Beberapa konfigurasi bisa dibandingkan berdampingan, sehingga optimasi
+   kecepatan terbukti tidak menurunkan kualitas jawaban
+
+Usage:
+    python benchmarks/evaluate.py
+    python benchmarks/evaluate.py --augment 3 \\
+        --config base \\
+        --config t60:FUZZY_THRESHOLD=60 \\
+        --config token_set:'FUZZY_WEIGHTS={"simple": 0.1, "partial": 0.2, "token_sort": 0.2, "token_set": 0.5}'
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from bench_utils import REPO_ROOT, RESULTS_DIR, new_results, save_results, summarize_latencies
+
+from config import config
+from query_samples import add_typo
+from text_utils import normalize_text
+
+DEFAULT_DATASET = os.path.join(REPO_ROOT, 'dataset_asli_qna_hr_internal.xlsx')
+
+# Nilai k untuk recall@k
+RECALL_KS = (1, 3, 5)
+
+# Engine per proses worker (dibuat oleh _init_worker)
+_worker_engine = None
+
+
+def iter_dataset(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Stream pasangan (pertanyaan, jawaban) dari workbook tanpa memuat seluruh file.
+    Kolom dicari dari header: yang mengandung 'pertanyaan' dan 'jawaban'.
+
+    Args:
+        path: Path file .xlsx
+
+    Yields:
+        Tuple of (question, expected_answer)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell or '').lower() for cell in next(rows, ())]
+        try:
+            question_col = next(i for i, h in enumerate(header) if 'pertanyaan' in h or 'question' in h)
+            answer_col = next(i for i, h in enumerate(header) if 'jawaban' in h or 'answer' in h)
+        except StopIteration:
+            raise ValueError(f"Header pertanyaan/jawaban tidak ditemukan di {path}: {header}")
+
+        for row in rows:
+            question = row[question_col] if question_col < len(row) else None
+            answer = row[answer_col] if answer_col < len(row) else None
+            if question and answer:
+                yield str(question).strip(), str(answer).strip()
+    finally:
+        workbook.close()
+
+
+def augment(items: List[Tuple[str, str]], variants: int, seed: int) -> List[Tuple[str, str, str]]:
+    """
+    Tambahkan variasi typo untuk setiap pertanyaan (menguji fuzzy path).
+
+    Returns:
+        List of (question, expected_answer, kind) dengan kind 'original' atau 'typo'
+    """
+    rng = random.Random(seed)
+    result = [(q, a, 'original') for q, a in items]
+    for question, answer in items:
+        for _ in range(variants):
+            result.append((add_typo(add_typo(question.lower(), rng), rng), answer, 'typo'))
+    return result
+
+
+def parse_config(spec: str) -> Tuple[str, Dict[str, object]]:
+    """
+    Parse spesifikasi konfigurasi 'nama:KEY=value,KEY=value'.
+    Value di-parse sebagai JSON jika bisa (angka, dict), selain itu string.
+
+    Returns:
+        Tuple of (name, overrides)
+    """
+    name, _, body = spec.partition(':')
+    overrides = {}
+    if body:
+        # Pisahkan KEY=value; koma di dalam JSON ({...}) tidak memisahkan item
+        depth, current, parts = 0, '', []
+        for char in body:
+            depth += char in '{['
+            depth -= char in '}]'
+            if char == ',' and depth == 0:
+                parts.append(current)
+                current = ''
+            else:
+                current += char
+        parts.append(current)
+
+        for part in parts:
+            key, _, raw = part.partition('=')
+            key = key.strip()
+            if not hasattr(config, key):
+                raise ValueError(f"Config tidak dikenal: {key}")
+            try:
+                overrides[key] = json.loads(raw)
+            except json.JSONDecodeError:
+                overrides[key] = raw
+    return name, overrides
+
+
+def _init_worker(overrides: Dict[str, object]):
+    """Initializer proses worker: terapkan config lalu bangun engine sekali."""
+    global _worker_engine
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    from fuzzy_matcher import HRChatbotEngine
+    from hr_knowledge_base import get_flat_qa_pairs
+    _worker_engine = HRChatbotEngine(get_flat_qa_pairs())
+
+
+def _evaluate_one(item: Tuple[str, str, str]) -> dict:
+    """Jalankan satu pertanyaan di proses worker."""
+    question, expected, kind = item
+    engine = _worker_engine
+    expected_key = normalize_text(expected)
+
+    response = engine.get_response(question)
+    top = engine.matcher.find_top_matches(question, max(RECALL_KS))
+    top_keys = [normalize_text(answer) for _, answer, _, _ in top]
+
+    return {
+        'question': question,
+        'kind': kind,
+        'correct': not response['is_fallback'] and normalize_text(response['answer']) == expected_key,
+        'is_fallback': response['is_fallback'],
+        'confidence': response['confidence'],
+        'latency_ms': response['latency_ms'],
+        # Posisi jawaban benar di top-k (None = tidak ada)
+        'rank': top_keys.index(expected_key) + 1 if expected_key in top_keys else None,
+    }
+
+
+def summarize(outcomes: List[dict], elapsed: float) -> dict:
+    """Ringkas hasil evaluasi satu konfigurasi."""
+    total = len(outcomes)
+    answered = [o for o in outcomes if not o['is_fallback']]
+    summary = {
+        'count': total,
+        'accuracy': round(sum(o['correct'] for o in outcomes) / total, 4) if total else 0.0,
+        'precision': round(sum(o['correct'] for o in answered) / len(answered), 4) if answered else 0.0,
+        'fallback_rate': round(1 - len(answered) / total, 4) if total else 0.0,
+    }
+    for k in RECALL_KS:
+        hits = sum(1 for o in outcomes if o['rank'] is not None and o['rank'] <= k)
+        summary[f'recall@{k}'] = round(hits / total, 4) if total else 0.0
+
+    latency = summarize_latencies([o['latency_ms'] for o in outcomes], elapsed)
+    summary.update({key: latency[key] for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_per_s')})
+    return summary
+
+
+def evaluate_config(items: List[Tuple[str, str, str]], overrides: Dict[str, object], workers: int) -> Tuple[dict, list]:
+    """
+    Evaluasi satu konfigurasi di pool proses.
+
+    Returns:
+        Tuple of (summary, outcomes)
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(overrides,)) as pool:
+        chunksize = max(1, len(items) // (workers * 4))
+        outcomes = list(pool.map(_evaluate_one, items, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    return summarize(outcomes, elapsed), outcomes
+
+
+def print_comparison(summaries: Dict[str, dict]):
+    """Tabel konfigurasi berdampingan, dengan selisih terhadap konfigurasi pertama."""
+    metrics = ['accuracy', 'precision', 'fallback_rate'] + [f'recall@{k}' for k in RECALL_KS] + \
+              ['p50_ms', 'p95_ms', 'p99_ms', 'throughput_per_s']
+    names = list(summaries)
+    reference = summaries[names[0]]
+
+    print(f"\n{'metric':<18}" + "".join(f"{name:>22}" for name in names))
+    for metric in metrics:
+        cells = []
+        for name in names:
+            value = summaries[name][metric]
+            cell = f"{value:.4f}" if isinstance(value, float) and value < 10 else f"{value:.2f}"
+            if name != names[0]:
+                cell += f" ({value - reference[metric]:+.3f})"
+            cells.append(f"{cell:>22}")
+        print(f"{metric:<18}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluasi akurasi + latency matcher pada dataset asli")
+    parser.add_argument('--dataset', type=str, default=DEFAULT_DATASET)
+    parser.add_argument('--config', action='append', default=None,
+                        help="Konfigurasi 'nama:KEY=value,...' (boleh diulang). Default: base")
+    parser.add_argument('--augment', type=int, default=0, help="Jumlah variasi typo per pertanyaan")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--show-errors', action='store_true', help="Tampilkan pertanyaan yang salah dijawab")
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'evaluation-latest.json'))
+    args = parser.parse_args()
+
+    items = augment(list(iter_dataset(args.dataset)), args.augment, args.seed)
+    configs = [parse_config(spec) for spec in (args.config or ['base'])]
+
+    print("=" * 60)
+    print("HR CHATBOT - EVALUATION")
+    print("=" * 60)
+    print(f"Dataset: {os.path.basename(args.dataset)} | {len(items)} pertanyaan | {args.workers} worker")
+
+    results = new_results('evaluation', {
+        'dataset': os.path.basename(args.dataset),
+        'items': len(items),
+        'augment': args.augment,
+        'seed': args.seed,
+        'configs': {name: overrides for name, overrides in configs},
+    })
+
+    summaries = {}
+    for name, overrides in configs:
+        # Response cache dimatikan agar latency mengukur matching (kecuali di-override)
+        overrides = dict({'RESPONSE_CACHE_SIZE': 0}, **overrides)
+        summary, outcomes = evaluate_config(items, overrides, args.workers)
+        summaries[name] = summary
+        results['cases'][name] = summary
+
+        print(f"\n⚙️ {name}: accuracy {summary['accuracy']:.1%} | fallback {summary['fallback_rate']:.1%}"
+              f" | recall@3 {summary['recall@3']:.1%} | p95 {summary['p95_ms']:.2f} ms")
+        if args.show_errors:
+            for outcome in outcomes:
+                if not outcome['correct']:
+                    status = 'fallback' if outcome['is_fallback'] else 'salah'
+                    print(f"   ❌ [{outcome['kind']}] {outcome['question']} ({status}, "
+                          f"confidence {outcome['confidence']:.1f}, rank {outcome['rank']})")
+
+    if len(summaries) > 1:
+        print_comparison(summaries)
+
+    save_results(args.output, results)
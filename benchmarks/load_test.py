@@ -0,0 +1,355 @@
+"""
+HR Chatbot Load Test - Banyak Session Chat Bersamaan
+=====================================================
+Simulasi N session chat (thread, seperti Streamlit, dan/atau beberapa proses)
+yang memanggil HRChatbotEngine.get_response + HRAnalytics.log_query /
+log_feedback pada target rate tertentu.
+
+Yang dilaporkan:
+- Throughput aktual vs target
+- Latency service (durasi panggilan) dan response time (dihitung dari jadwal
+  kirim, sehingga antrian di client ikut terhitung / tanpa coordinated omission)
+- Lock wait analytics (HRAnalytics.get_lock_metrics)
+- Event yang hilang / terduplikasi: setiap event yang dikirim dicocokkan dengan
+  record yang tersimpan (per session + event_id)
+
+Mode:
+- threads   : 1 proses, 1 engine + 1 HRAnalytics dipakai bersama semua session
+- processes : P proses, masing-masing dengan engine sendiri dan analytics
+              mode 'sharded' pada file yang sama
+
+Usage:
+    python benchmarks/load_test.py --sessions 50 --rate 200 --duration 10
+    python benchmarks/load_test.py --mode processes --processes 4 --sessions 100 --rate 400
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+from bench_matcher import build_queries
+from bench_utils import BASELINES_DIR, RESULTS_DIR, new_results, report_baseline, save_results, summarize_latencies
+
+from config import config
+from hr_knowledge_base import get_flat_qa_pairs
+
+# Campuran jenis query (hit / near_miss / fallback)
+QUERY_MIX = {'hit': 0.55, 'near_miss': 0.3, 'fallback': 0.15}
+
+
+def config_overrides(mode: str) -> Dict[str, object]:
+    """Setting config selama load test: tidak ada trimming retensi agar event bisa diverifikasi."""
+    return {
+        'ANALYTICS_STORAGE_MODE': 'sharded' if mode == 'processes' else 'single',
+        'MAX_QUERIES_RETAINED': 10_000_000,
+        'MAX_FEEDBACK_RETAINED': 10_000_000,
+        'MAX_SESSIONS_RETAINED': 10_000_000,
+    }
+
+
+def _session_loop(session_id: str, engine, analytics, queries: List[str], interval: float,
+                  phase: float, start_at: float, deadline: float, feedback_rate: float,
+                  seed: int, stats: dict):
+    """
+    Satu session chat: kirim query sesuai jadwal sampai deadline.
+
+    Args:
+        interval: Jarak antar query session ini (0 = closed loop, secepat mungkin)
+        phase: Offset jadwal awal agar session tidak mengirim bersamaan
+        stats: Dict hasil milik session ini (diisi oleh fungsi ini)
+    """
+    rng = random.Random(seed)
+    service, response = [], []
+    sent = errors = 0
+
+    next_send = start_at + phase
+    while True:
+        now = time.perf_counter()
+        if interval:
+            if next_send >= deadline:
+                break
+            if next_send > now:
+                time.sleep(next_send - now)
+            scheduled = next_send
+            next_send += interval
+        elif now >= deadline:
+            break
+        else:
+            scheduled = now
+
+        query = rng.choice(queries)
+        t0 = time.perf_counter()
+        try:
+            result = engine.get_response(query)
+            analytics.log_query(session_id, query, result)
+            sent += 1
+        except Exception:
+            errors += 1
+        t1 = time.perf_counter()
+        service.append((t1 - t0) * 1000)
+        response.append((t1 - scheduled) * 1000)
+
+    feedback = 0
+    if sent and rng.random() < feedback_rate:
+        analytics.log_feedback(session_id, rng.randint(config.MIN_RATING, config.MAX_RATING))
+        feedback = 1
+
+    stats.update({'sent': sent, 'feedback': feedback, 'errors': errors,
+                  'service': service, 'response': response})
+
+
+def _dashboard_loop(analytics, interval: float, deadline: float, latencies: list):
+    """Admin yang membuka dashboard berkala (membaca data di bawah lock analytics)."""
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        analytics.get_summary_stats()
+        analytics.get_top_queries(10)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        time.sleep(interval)
+
+
+def run_worker(worker_index: int, data_file: str, mode: str, sessions: int, rate: float,
+               duration: float, feedback_rate: float, seed: int, dashboard_interval: float) -> dict:
+    """
+    Jalankan sekumpulan session di satu proses (dipanggil langsung atau lewat Pool).
+
+    Returns:
+        Dict: expected (session -> jumlah query), feedback, errors, latency list
+        (service, response, dashboard), writer metrics, lock metrics
+    """
+    for key, value in config_overrides(mode).items():
+        setattr(config, key, value)
+    if mode == 'processes':
+        config.ANALYTICS_WORKER_ID = f"loadtest-{worker_index}"
+
+    from analytics import HRAnalytics
+    from fuzzy_matcher import HRChatbotEngine
+
+    engine = HRChatbotEngine(get_flat_qa_pairs())
+    analytics = HRAnalytics(data_file)
+
+    # Pool query campuran sesuai QUERY_MIX
+    by_kind = build_queries(get_flat_qa_pairs(), 200, seed + worker_index)
+    rng = random.Random(seed + worker_index)
+    queries = []
+    for kind, share in QUERY_MIX.items():
+        queries.extend(rng.choices(by_kind[kind], k=int(1000 * share)))
+
+    interval = sessions / rate if rate else 0.0
+    start_at = time.perf_counter() + 0.2
+    deadline = start_at + duration
+
+    session_stats = [{} for _ in range(sessions)]
+    threads = []
+    for i in range(sessions):
+        session_id = f"loadtest-{worker_index}-{i}"
+        thread = threading.Thread(
+            target=_session_loop,
+            args=(session_id, engine, analytics, queries, interval, interval * i / sessions,
+                  start_at, deadline, feedback_rate, seed * 1000 + worker_index * sessions + i,
+                  session_stats[i]),
+            daemon=True,
+        )
+        threads.append(thread)
+        thread.start()
+
+    dashboard = []
+    if dashboard_interval > 0:
+        thread = threading.Thread(target=_dashboard_loop,
+                                  args=(analytics, dashboard_interval, deadline, dashboard), daemon=True)
+        threads.append(thread)
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_at
+
+    # Semua event di queue harus tersimpan sebelum diverifikasi
+    analytics.close()
+
+    return {
+        'elapsed': elapsed,
+        'expected': {f"loadtest-{worker_index}-{i}": s['sent'] for i, s in enumerate(session_stats)},
+        'feedback': sum(s['feedback'] for s in session_stats),
+        'errors': sum(s['errors'] for s in session_stats),
+        'service': [ms for s in session_stats for ms in s['service']],
+        'response': [ms for s in session_stats for ms in s['response']],
+        'dashboard': dashboard,
+        'writer': analytics.get_writer_metrics(),
+        'lock': analytics.get_lock_metrics(),
+    }
+
+
+def load_persisted(data_file: str, mode: str):
+    """
+    Baca semua record yang tersimpan (mode processes: file utama + semua shard).
+
+    Returns:
+        Tuple of (queries, feedback)
+    """
+    if mode == 'processes':
+        from analytics_store import ShardedAnalyticsStore
+        queries, feedback, _ = ShardedAnalyticsStore(data_file, worker_id='loadtest-reader').read_others(0)
+        return queries, feedback
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('queries', []), data.get('feedback', [])
+
+
+def verify_events(expected: Dict[str, int], expected_feedback: int, queries: list,
+                  feedback: list, dropped: int) -> dict:
+    """
+    Cocokkan event yang dikirim dengan record yang tersimpan.
+
+    Args:
+        expected: session_id -> jumlah query yang dikirim
+        expected_feedback: Jumlah feedback yang dikirim
+        queries: Record query yang tersimpan
+        feedback: Record feedback yang tersimpan
+        dropped: Event yang sengaja dibuang overflow policy queue (bukan hilang)
+
+    Returns:
+        Dict: sent, persisted, dropped_by_policy, lost, duplicated, feedback_sent, feedback_persisted
+    """
+    # Record dengan event_id yang sama dihitung sekali (sisanya duplikat)
+    unique = {q.get('event_id'): q for q in queries}
+    duplicated = len(queries) - len(unique)
+
+    persisted = Counter(q['session_id'] for q in unique.values() if q.get('session_id') in expected)
+    missing = sum(max(0, count - persisted.get(sid, 0)) for sid, count in expected.items())
+    unexpected = sum(max(0, persisted.get(sid, 0) - count) for sid, count in expected.items())
+
+    return {
+        'sent': sum(expected.values()),
+        'persisted': sum(persisted.values()),
+        'dropped_by_policy': dropped,
+        'lost': max(0, missing - dropped),
+        'duplicated': duplicated + unexpected,
+        'feedback_sent': expected_feedback,
+        'feedback_persisted': len(feedback),
+    }
+
+
+def run_load_test(mode: str, processes: int, sessions: int, rate: float, duration: float,
+                  feedback_rate: float, seed: int, dashboard_interval: float) -> dict:
+    """
+    Jalankan load test lengkap dan verifikasi event.
+
+    Returns:
+        Dict hasil (lihat bench_utils.new_results)
+    """
+    results = new_results('load_test', {
+        'mode': mode, 'processes': processes if mode == 'processes' else 1,
+        'sessions': sessions, 'rate': rate, 'duration': duration,
+        'feedback_rate': feedback_rate, 'seed': seed, 'dashboard_interval': dashboard_interval,
+        'overflow_policy': config.ANALYTICS_QUEUE_OVERFLOW_POLICY,
+    })
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, 'analytics.json')
+
+        if mode == 'processes':
+            per_worker = max(1, sessions // processes)
+            worker_args = [
+                (i, data_file, mode, per_worker, rate / processes, duration, feedback_rate, seed,
+                 dashboard_interval)
+                for i in range(processes)
+            ]
+            with multiprocessing.get_context('spawn').Pool(processes) as pool:
+                workers = pool.starmap(run_worker, worker_args)
+        else:
+            workers = [run_worker(0, data_file, mode, sessions, rate, duration, feedback_rate, seed,
+                                  dashboard_interval)]
+
+        queries, feedback = load_persisted(data_file, mode)
+
+    expected = {}
+    for worker in workers:
+        expected.update(worker['expected'])
+    dropped = sum(w['writer']['dropped'] + w['writer']['sampled_out'] for w in workers)
+    events = verify_events(expected, sum(w['feedback'] for w in workers), queries, feedback, dropped)
+
+    elapsed = max(w['elapsed'] for w in workers)
+    service = summarize_latencies([ms for w in workers for ms in w['service']], elapsed)
+    response = summarize_latencies([ms for w in workers for ms in w['response']], elapsed)
+    dashboard = summarize_latencies([ms for w in workers for ms in w['dashboard']])
+
+    locks = [w['lock'] for w in workers]
+    contended = sum(l['contended'] for l in locks)
+    acquisitions = sum(l['acquisitions'] for l in locks)
+    wait_total_ms = sum(l['wait_total_ms'] for l in locks)
+    lock = {
+        'acquisitions': acquisitions,
+        'contended': contended,
+        'contention_rate': round(contended / acquisitions, 4) if acquisitions else 0.0,
+        'wait_total_ms': round(wait_total_ms, 3),
+        'wait_avg_ms': round(wait_total_ms / contended, 4) if contended else 0.0,
+        'wait_max_ms': max(l['wait_max_ms'] for l in locks),
+        'max_queue_depth': max(w['writer']['max_queue_depth'] for w in workers),
+    }
+
+    events['errors'] = sum(w['errors'] for w in workers)
+    results['cases'] = {'service': service, 'response': response, 'dashboard': dashboard,
+                        'lock': lock, 'events': events}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test session chat bersamaan")
+    parser.add_argument('--mode', choices=['threads', 'processes'], default='threads')
+    parser.add_argument('--processes', type=int, default=4, help="Jumlah proses (mode processes)")
+    parser.add_argument('--sessions', type=int, default=50, help="Total session bersamaan")
+    parser.add_argument('--rate', type=float, default=100.0, help="Target total query/detik (0 = secepat mungkin)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Durasi load test (detik)")
+    parser.add_argument('--feedback-rate', type=float, default=0.2, help="Fraksi session yang memberi rating")
+    parser.add_argument('--dashboard-interval', type=float, default=1.0,
+                        help="Interval admin membuka dashboard per proses (0 = tanpa dashboard)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'load-test-latest.json'))
+    parser.add_argument('--baseline', type=str, default=os.path.join(BASELINES_DIR, 'load_test.json'))
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HR CHATBOT - LOAD TEST")
+    print("=" * 60)
+    print(f"Mode: {args.mode} | Sessions: {args.sessions} | Target: {args.rate:g} q/s | Durasi: {args.duration:g} s")
+
+    results = run_load_test(args.mode, args.processes, args.sessions, args.rate,
+                            args.duration, args.feedback_rate, args.seed, args.dashboard_interval)
+    cases = results['cases']
+    service, response, lock, events = cases['service'], cases['response'], cases['lock'], cases['events']
+
+    print(f"\n🚀 Throughput: {service['throughput_per_s']:.1f} q/s (target {args.rate:g})")
+    print(f"⏱️ Service  p50 {service['p50_ms']:.2f} ms | p95 {service['p95_ms']:.2f} ms | p99 {service['p99_ms']:.2f} ms")
+    print(f"⏱️ Response p50 {response['p50_ms']:.2f} ms | p95 {response['p95_ms']:.2f} ms | p99 {response['p99_ms']:.2f} ms")
+    print(f"📊 Dashboard p50 {cases['dashboard']['p50_ms']:.2f} ms | p95 {cases['dashboard']['p95_ms']:.2f} ms")
+    print(f"🔒 Lock: {lock['contended']}/{lock['acquisitions']} contended | wait total {lock['wait_total_ms']:.1f} ms"
+          f" | max {lock['wait_max_ms']:.2f} ms | max queue depth {lock['max_queue_depth']}")
+    print(f"📨 Events: {events['persisted']}/{events['sent']} tersimpan | dropped (policy) {events['dropped_by_policy']}"
+          f" | lost {events['lost']} | duplicated {events['duplicated']}"
+          f" | feedback {events['feedback_persisted']}/{events['feedback_sent']} | errors {events['errors']}")
+
+    save_results(args.output, results)
+
+    exit_code = report_baseline(
+        results, args.baseline,
+        metrics=['p95_ms', 'p99_ms', 'wait_total_ms', 'wait_max_ms'],
+        threshold=args.threshold,
+        update=args.update_baseline,
+    )
+
+    integrity_ok = (events['lost'] == 0 and events['duplicated'] == 0 and events['errors'] == 0
+                    and events['feedback_persisted'] == events['feedback_sent'])
+    if not integrity_ok:
+        print("❌ Ada event yang hilang/duplikat/error")
+    raise SystemExit(exit_code or (0 if integrity_ok else 1))
@@ -0,0 +1,317 @@
+"""
+HR Chatbot KB Pruning - Variasi Redundan & Confusable dari Self-Similarity Matrix
+==================================================================================
+Setiap baris knowledge base (pertanyaan utama + variasi) = 4 pemanggilan scorer
+per query. Tool offline ini mencari baris yang tidak menambah apa-apa.
+
+Cara kerja:
+1. Hitung score mentah (simple, partial, token_sort, token_set) antar SEMUA
+   pertanyaan KB sekali, paralel per baris (hanya segitiga atas; semua scorer
+   simetris). Disimpan sebagai tensor uint8 [kb, kb, scorer] (cache .npz)
+2. Similarity weighted = satu tensordot tensor x FUZZY_WEIGHTS: matrix [kb, kb]
+3. Laporan:
+   - redundant  : variasi yang similarity-nya >= --redundant terhadap baris lain
+                  yang dipertahankan di entry yang sama (greedy, pertanyaan utama
+                  selalu dipertahankan)
+   - confusable : pasangan baris dari entry berbeda (jawaban berbeda) dengan
+                  similarity >= --confusable
+4. Verifikasi dengan evaluation set tune_matcher (score tensor query x kb):
+   akurasi KB penuh vs KB hasil pruning pada FUZZY_THRESHOLD saat ini. Query yang
+   memburuk mengembalikan baris yang menjawabnya di KB penuh, diulang sampai
+   tidak ada query yang memburuk
+5. KB hasil pruning ditulis sebagai JSON (bisa dipakai langsung lewat KB_SOURCE)
+
+Usage:
+    python benchmarks/prune_kb.py
+    python benchmarks/prune_kb.py --redundant 70 --confusable 80 --output-kb /tmp/kb_pruned.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from multiprocessing import Pool
+from typing import List, Tuple
+
+import numpy as np
+
+from bench_utils import RESULTS_DIR, new_results, save_results
+from evaluate import DEFAULT_DATASET
+from tune_matcher import SCORERS, build_eval_set, load_or_build_tensor
+
+from config import config
+from fuzzy_matcher import HRFuzzyMatcher
+from knowledge_base import get_knowledge_base
+from text_utils import normalize_text
+
+DEFAULT_CACHE = os.path.join(RESULTS_DIR, 'kb_similarity.npz')
+
+# Matcher per proses worker (dibuat oleh _init_worker)
+_worker_matcher = None
+
+
+def _init_worker(qa_pairs: List[Tuple[str, str, str]]):
+    """Initializer proses worker: bangun matcher sekali."""
+    global _worker_matcher
+    _worker_matcher = HRFuzzyMatcher(qa_pairs)
+
+
+def _score_upper_row(index: int) -> np.ndarray:
+    """Score mentah pertanyaan ke-index terhadap pertanyaan sesudahnya: uint8 [kb - index - 1, scorer]."""
+    questions = _worker_matcher.questions
+    query = questions[index]
+    row = np.zeros((len(questions) - index - 1, len(SCORERS)), dtype=np.uint8)
+    for offset, idx in enumerate(range(index + 1, len(questions))):
+        scores = _worker_matcher._calculate_scores(query, questions[idx])
+        row[offset] = [scores[name] for name in SCORERS]
+    return row
+
+
+def load_or_build_similarity(qa_pairs: List[Tuple[str, str, str]], questions: List[str],
+                             cache_path: str, workers: int) -> np.ndarray:
+    """
+    Load tensor similarity KB x KB dari cache, atau hitung (paralel) lalu simpan.
+
+    Args:
+        qa_pairs: Flat QA pairs knowledge base
+        questions: Pertanyaan yang sudah di-preprocess (urutan sama)
+        cache_path: File .npz
+        workers: Jumlah proses
+
+    Returns:
+        Array uint8 [K, K, 4], simetris, diagonal 100
+    """
+    digest = hashlib.sha256()
+    for text in list(SCORERS) + list(questions):
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    key = digest.hexdigest()
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cached:
+                if str(cached['key']) == key:
+                    print(f"📂 Similarity tensor dari cache {cache_path}")
+                    return cached['scores']
+        except (IOError, OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Error reading similarity cache: {e}")
+
+    n = len(questions)
+    print(f"🧮 Menghitung similarity {n} x {n} x {len(SCORERS)} ({n * (n - 1) // 2} pasangan)...")
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(list(qa_pairs),)) as pool:
+        rows = pool.map(_score_upper_row, range(n), chunksize=max(1, n // (workers * 8)))
+    print(f"   selesai dalam {time.perf_counter() - start:.1f} s")
+
+    scores = np.full((n, n, len(SCORERS)), 100, dtype=np.uint8)
+    for index, row in enumerate(rows):
+        scores[index, index + 1:] = row
+        scores[index + 1:, index] = row
+
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    np.savez_compressed(cache_path, scores=scores, key=np.array(key))
+    print(f"💾 Similarity tensor disimpan ke {cache_path} ({os.path.getsize(cache_path) / 1024:.0f} KB)")
+    return scores
+
+
+def weighted_similarity(scores: np.ndarray) -> np.ndarray:
+    """Similarity weighted dengan FUZZY_WEIGHTS saat ini: float [K, K] (0-100)."""
+    weights = np.array([config.FUZZY_WEIGHTS[name] for name in SCORERS], dtype=np.float64)
+    return np.tensordot(scores.astype(np.float64), weights, axes=([2], [0]))
+
+
+def find_redundant(similarity: np.ndarray, entry_rows: List[List[int]], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Variasi redundan di dalam entry (greedy sesuai urutan, baris pertama = pertanyaan utama).
+
+    Args:
+        similarity: Matrix [K, K]
+        entry_rows: Index baris flat per entry
+        threshold: Similarity minimal untuk dianggap redundan
+
+    Returns:
+        List of (row, covered_by_row, similarity)
+    """
+    redundant = []
+    for rows in entry_rows:
+        kept = [rows[0]]
+        for row in rows[1:]:
+            sims = similarity[row, kept]
+            best = int(sims.argmax())
+            if sims[best] >= threshold:
+                redundant.append((row, kept[best], float(sims[best])))
+            else:
+                kept.append(row)
+    return redundant
+
+
+def find_confusable(similarity: np.ndarray, kb_answer: np.ndarray, threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Pasangan baris dengan jawaban berbeda yang similarity-nya >= threshold.
+
+    Returns:
+        List of (row_a, row_b, similarity), terurut similarity menurun
+    """
+    different = kb_answer[:, None] != kb_answer[None, :]
+    rows_a, rows_b = np.nonzero(np.triu(different & (similarity >= threshold), k=1))
+    pairs = [(int(a), int(b), float(similarity[a, b])) for a, b in zip(rows_a, rows_b)]
+    pairs.sort(key=lambda pair: -pair[2])
+    return pairs
+
+
+def correct_per_query(tensor: dict, keep: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hasil evaluation set jika hanya baris keep yang di-scan (logika sama dengan tune_matcher.sweep).
+
+    Args:
+        tensor: Hasil tune_matcher.load_or_build_tensor
+        keep: Mask bool [K]
+        threshold: FUZZY_THRESHOLD
+
+    Returns:
+        Tuple of (correct [Q] bool, best_row [Q] int)
+    """
+    weights = np.array([config.FUZZY_WEIGHTS[name] for name in SCORERS], dtype=np.float64)
+    weighted = np.tensordot(tensor['scores'].astype(np.float64), weights, axes=([2], [0]))  # [Q, K]
+    weighted[:, ~keep] = -1
+    best_row = weighted.argmax(axis=1)
+    best_score = weighted[np.arange(len(best_row)), best_row]
+
+    answered = (best_score >= threshold) & (best_score > 0)
+    right_answer = tensor['kb_answer'][best_row] == tensor['expected']
+    correct = np.where(tensor['expected'] == -1, ~answered, answered & right_answer)
+    return correct, best_row
+
+
+def guard_accuracy(tensor: dict, keep: np.ndarray, threshold: float) -> List[int]:
+    """
+    Kembalikan baris yang di-prune sampai tidak ada query evaluation set yang memburuk.
+
+    Returns:
+        Index baris yang dikembalikan (keep diubah in-place)
+    """
+    full = np.ones_like(keep)
+    full_correct, full_best = correct_per_query(tensor, full, threshold)
+    restored = []
+    while True:
+        correct, _ = correct_per_query(tensor, keep, threshold)
+        regressed = full_correct & ~correct
+        rows = sorted({int(row) for row in full_best[regressed] if not keep[row]})
+        if not rows:
+            return restored
+        keep[rows] = True
+        restored.extend(rows)
+
+
+def pruned_entries(kb, keep: np.ndarray) -> List[dict]:
+    """Entry KB dengan variasi yang di-prune dibuang (pertanyaan utama selalu tetap)."""
+    kept_questions = {}
+    for row, (question, _, _) in enumerate(kb.flat_pairs):
+        if keep[row]:
+            kept_questions.setdefault(kb.flat_entry_ids[row], []).append(question)
+
+    entries = []
+    for entry in kb.to_entries():
+        variations = kept_questions.get(entry['id'], [])[1:]
+        entries.append(dict(entry, variasi=variations))
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cari variasi redundan/confusable & buat KB hasil pruning")
+    parser.add_argument('--redundant', type=float, default=80.0, help="Similarity minimal variasi redundan")
+    parser.add_argument('--confusable', type=float, default=float(config.FUZZY_THRESHOLD),
+                        help="Similarity minimal pasangan confusable (default FUZZY_THRESHOLD)")
+    parser.add_argument('--dataset', type=str, default=DEFAULT_DATASET)
+    parser.add_argument('--augment', type=int, default=3, help="Jumlah variasi typo per pertanyaan")
+    parser.add_argument('--top', type=int, default=20, help="Jumlah pasangan yang ditampilkan")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', type=str, default=DEFAULT_CACHE, help="File similarity tensor (.npz)")
+    parser.add_argument('--eval-cache', type=str, default=os.path.join(RESULTS_DIR, 'score_tensor.npz'),
+                        help="File score tensor evaluation set (dipakai bersama tune_matcher)")
+    parser.add_argument('--output-kb', type=str, default=os.path.join(RESULTS_DIR, 'kb_pruned.json'))
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'prune-latest.json'))
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HR CHATBOT - KB PRUNING")
+    print("=" * 60)
+
+    kb = get_knowledge_base()
+    qa_pairs = list(kb.flat_pairs)
+    print(f"{len(kb)} entry | {len(qa_pairs)} pertanyaan")
+
+    similarity = weighted_similarity(load_or_build_similarity(qa_pairs, kb.questions, args.cache, args.workers))
+
+    entry_rows = {}
+    for row, entry_id in enumerate(kb.flat_entry_ids):
+        entry_rows.setdefault(entry_id, []).append(row)
+    answer_ids = {}
+    kb_answer = np.array([answer_ids.setdefault(normalize_text(a), len(answer_ids)) for _, a, _ in qa_pairs])
+
+    redundant = find_redundant(similarity, list(entry_rows.values()), args.redundant)
+    confusable = find_confusable(similarity, kb_answer, args.confusable)
+
+    def describe(row: int) -> str:
+        return f"[{kb.flat_entry_ids[row]}] {qa_pairs[row][0]}"
+
+    print(f"\n🔁 {len(redundant)} variasi redundan (similarity >= {args.redundant:.0f} di entry yang sama)")
+    for row, covered_by, score in sorted(redundant, key=lambda item: -item[2])[:args.top]:
+        print(f"   {score:5.1f}  {describe(row)}  ~  {qa_pairs[covered_by][0]}")
+
+    print(f"\n⚠️ {len(confusable)} pasangan confusable (similarity >= {args.confusable:.0f}, jawaban berbeda)")
+    for row_a, row_b, score in confusable[:args.top]:
+        print(f"   {score:5.1f}  {describe(row_a)}  <>  {describe(row_b)}")
+
+    keep = np.ones(len(qa_pairs), dtype=bool)
+    keep[[row for row, _, _ in redundant]] = False
+
+    # Verifikasi: evaluation set tune_matcher (score tensor di-cache bersama)
+    items = build_eval_set(args.dataset, args.augment, args.seed, True)
+    tensor = load_or_build_tensor(items, args.eval_cache, args.workers)
+    threshold = float(config.FUZZY_THRESHOLD)
+    full_correct, _ = correct_per_query(tensor, np.ones_like(keep), threshold)
+    restored = guard_accuracy(tensor, keep, threshold)
+    pruned_correct, _ = correct_per_query(tensor, keep, threshold)
+
+    full_accuracy = float(full_correct.mean())
+    pruned_accuracy = float(pruned_correct.mean())
+    kept_rows = int(keep.sum())
+    print(f"\n✂️ {len(qa_pairs) - kept_rows} baris di-prune ({len(restored)} dikembalikan demi akurasi)"
+          f" -> {kept_rows}/{len(qa_pairs)} baris di-scan ({1 - kept_rows / len(qa_pairs):.1%} lebih sedikit)")
+    print(f"   accuracy {full_accuracy:.2%} -> {pruned_accuracy:.2%} ({len(items)} query)")
+
+    entries = pruned_entries(kb, keep)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output_kb)), exist_ok=True)
+    with open(args.output_kb, 'w', encoding='utf-8') as f:
+        json.dump({'entries': entries}, f, ensure_ascii=False, indent=2)
+    print(f"💾 KB hasil pruning disimpan ke {args.output_kb} (pakai dengan KB_SOURCE)")
+
+    results = new_results('prune_kb', {
+        'redundant_threshold': args.redundant,
+        'confusable_threshold': args.confusable,
+        'dataset': os.path.basename(args.dataset),
+        'items': len(items),
+        'augment': args.augment,
+        'seed': args.seed,
+    })
+    results['cases'] = {
+        'rows': len(qa_pairs),
+        'kept_rows': kept_rows,
+        'restored_rows': len(restored),
+        'accuracy_full': round(full_accuracy, 4),
+        'accuracy_pruned': round(pruned_accuracy, 4),
+        'redundant': [
+            {'entry': kb.flat_entry_ids[row], 'question': qa_pairs[row][0],
+             'covered_by': qa_pairs[covered_by][0], 'similarity': round(score, 2), 'pruned': not keep[row]}
+            for row, covered_by, score in redundant
+        ],
+        'confusable': [
+            {'a': describe(row_a), 'b': describe(row_b), 'similarity': round(score, 2)}
+            for row_a, row_b, score in confusable
+        ],
+    }
+    save_results(args.output, results)
+    raise SystemExit(0 if pruned_accuracy >= full_accuracy else 1)
@@ -0,0 +1,296 @@
+"""
+HR Chatbot Synthetic Traffic Generator
+=======================================
+Generator stream query/feedback/session yang realistis untuk benchmark analytics.
+
+Karakteristik traffic:
+- Pola harian per jam (diurnal): sepi malam hari, puncak jam kerja
+- Popularitas pertanyaan mengikuti distribusi Zipf atas knowledge base,
+  sehingga campuran kategori mengikuti pertanyaan yang paling sering ditanya
+- Sebagian query memakai typo (fuzzy match) dan sebagian di luar topik (fallback)
+- Satu session berisi beberapa query; sebagian session memberi rating
+
+Dataset ditulis secara streaming ke file JSON dengan format yang sama dengan
+hr_analytics_data.json, sehingga ukuran 10M event tidak perlu muat di memory.
+
+Usage:
+    python benchmarks/traffic_generator.py --events 100000 --output /tmp/analytics.json
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator, Tuple
+
+import bench_utils  # noqa: F401  (menambahkan root repo ke sys.path)
+
+from hr_knowledge_base import get_flat_qa_pairs
+from query_samples import OFF_TOPIC_QUERIES, add_typo
+
+# Bobot relatif traffic per jam (0-23): puncak jam kerja, turun saat makan siang
+HOURLY_WEIGHTS = [
+    0.2, 0.1, 0.1, 0.1, 0.1, 0.3, 0.8, 2.0,
+    4.5, 6.0, 6.5, 5.5, 3.5, 5.0, 6.0, 5.5,
+    4.5, 3.0, 1.5, 1.0, 0.8, 0.6, 0.4, 0.3,
+]
+
+# Distribusi rating 1-5 (mayoritas puas)
+RATING_WEIGHTS = [0.05, 0.07, 0.18, 0.35, 0.35]
+
+FEEDBACK_COMMENTS = [
+    "jawabannya membantu",
+    "kurang lengkap",
+    "tolong tambahkan info lembur",
+    "cepat dan jelas",
+    "tidak sesuai pertanyaan saya",
+]
+
+
+class TrafficGenerator:
+    """
+    Generator event analytics sintetis (seeded, reproducible).
+    """
+
+    def __init__(self, seed: int = 42, days: int = 30, fallback_rate: float = 0.15,
+                 typo_rate: float = 0.3, cache_rate: float = 0.3,
+                 queries_per_session: float = 4.0, feedback_rate: float = 0.2,
+                 zipf_s: float = 1.1, end_time: datetime = None):
+        """
+        Args:
+            seed: Seed random
+            days: Rentang hari traffic (berakhir di end_time)
+            fallback_rate: Fraksi query di luar topik
+            typo_rate: Fraksi query KB yang mengandung typo (fuzzy path)
+            cache_rate: Fraksi query KB tanpa typo yang dilayani response cache
+            queries_per_session: Rata-rata query per session
+            feedback_rate: Fraksi session yang memberi rating
+            zipf_s: Eksponen Zipf popularitas pertanyaan
+            end_time: Waktu event terakhir (None = sekarang)
+        """
+        self.rng = random.Random(seed)
+        self.days = days
+        self.fallback_rate = fallback_rate
+        self.typo_rate = typo_rate
+        self.cache_rate = cache_rate
+        self.queries_per_session = queries_per_session
+        self.feedback_rate = feedback_rate
+        self.end_time = end_time or datetime.now()
+
+        # Urutan popularitas pertanyaan diacak sekali (berdasarkan seed)
+        self.qa_pairs = get_flat_qa_pairs()
+        self.rng.shuffle(self.qa_pairs)
+        self.cum_weights = list(itertools.accumulate(
+            1 / (rank ** zipf_s) for rank in range(1, len(self.qa_pairs) + 1)
+        ))
+
+        # session_id -> [start_time, query_count, last_activity, rating]
+        self.sessions = {}
+
+    def _event_times(self, n_queries: int) -> Iterator[datetime]:
+        """Timestamp query terurut, tersebar per hari & jam sesuai HOURLY_WEIGHTS."""
+        start_day = (self.end_time - timedelta(days=self.days - 1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        # Slot per jam sampai end_time (hari terakhir bisa belum penuh)
+        slots = []
+        hour_start = start_day
+        while hour_start <= self.end_time:
+            slots.append(hour_start)
+            hour_start += timedelta(hours=1)
+        total_weight = sum(HOURLY_WEIGHTS[slot.hour] for slot in slots)
+
+        emitted = 0
+        carry = 0.0
+        for index, hour_start in enumerate(slots):
+            # Jumlah event di jam ini (pembulatan dengan carry agar total tepat)
+            expected = n_queries * HOURLY_WEIGHTS[hour_start.hour] / total_weight + carry
+            count = int(expected)
+            carry = expected - count
+            if index == len(slots) - 1:
+                count = n_queries - emitted
+            count = min(count, n_queries - emitted)
+
+            # Event di jam terakhir tidak boleh melewati end_time
+            span = min(3600.0, (self.end_time - hour_start).total_seconds())
+            offsets = sorted(self.rng.random() * span for _ in range(count))
+            for offset in offsets:
+                yield hour_start + timedelta(seconds=offset)
+            emitted += count
+
+    def _pick_session(self, active: list, timestamp: str) -> str:
+        """Lanjutkan session aktif atau mulai session baru."""
+        continue_prob = 1 - 1 / self.queries_per_session
+        if active and self.rng.random() < continue_prob:
+            return self.rng.choice(active)
+
+        session_id = str(uuid.UUID(int=self.rng.getrandbits(128)))
+        self.sessions[session_id] = [timestamp, 0, timestamp, None]
+        active.append(session_id)
+        if len(active) > 50:
+            # Session paling lama dianggap selesai
+            active.pop(0)
+        return session_id
+
+    def _query_record(self, timestamp: str, session_id: str) -> dict:
+        """Buat satu record query (format sama dengan HRAnalytics.log_query)."""
+        rng = self.rng
+
+        if rng.random() < self.fallback_rate:
+            user_input = rng.choice(OFF_TOPIC_QUERIES)
+            category, confidence, is_fallback, path = None, rng.uniform(20, 59), True, 'fallback'
+            stages = {'preprocess': 0.01, 'candidates': 0.001,
+                      'scoring': rng.lognormvariate(3.3, 0.3), 'suggestions': 0.05}
+        else:
+            question, _, category = self.qa_pairs[
+                bisect.bisect_left(self.cum_weights, rng.random() * self.cum_weights[-1])
+            ]
+            is_fallback = False
+            if rng.random() < self.typo_rate:
+                user_input = add_typo(question.lower(), rng)
+                confidence, path = rng.uniform(60, 99), 'fuzzy'
+                stages = {'preprocess': 0.01, 'candidates': 0.001,
+                          'scoring': rng.lognormvariate(3.1, 0.3), 'suggestions': 0.001}
+            else:
+                user_input = question
+                confidence = 100.0
+                path = 'cache' if rng.random() < self.cache_rate else 'exact'
+                stages = {'preprocess': 0.01, 'candidates': 0.0, 'scoring': 0.0, 'suggestions': 0.002}
+
+        return {
+            'event_id': uuid.UUID(int=rng.getrandbits(128)).hex,
+            'timestamp': timestamp,
+            'session_id': session_id,
+            'user_input': user_input,
+            'category': category,
+            'confidence': round(confidence, 2),
+            'is_fallback': is_fallback,
+            'path': path,
+            'latency_ms': round(sum(stages.values()), 3),
+            'timings_ms': {stage: round(ms, 3) for stage, ms in stages.items()},
+        }
+
+    def _feedback_record(self, timestamp: datetime, session_id: str) -> dict:
+        """Buat satu record feedback (format sama dengan HRAnalytics.log_feedback)."""
+        rng = self.rng
+        rating = rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+        return {
+            'event_id': uuid.UUID(int=rng.getrandbits(128)).hex,
+            # Feedback beberapa detik setelah query, tidak melewati end_time
+            'timestamp': min(timestamp + timedelta(seconds=rng.uniform(5, 60)), self.end_time).isoformat(),
+            'session_id': session_id,
+            'rating': rating,
+            'comment': rng.choice(FEEDBACK_COMMENTS) if rng.random() < 0.3 else None,
+        }
+
+    def iter_events(self, n_events: int) -> Iterator[Tuple[str, dict]]:
+        """
+        Stream event terurut waktu.
+
+        Args:
+            n_events: Total event (query + feedback)
+
+        Yields:
+            Tuple of (kind, record), kind = 'query' atau 'feedback'
+        """
+        # Setiap session rata-rata menghasilkan queries_per_session query
+        # dan feedback_rate feedback
+        feedback_per_query = self.feedback_rate / self.queries_per_session
+        n_queries = max(1, round(n_events / (1 + feedback_per_query)))
+        n_feedback = n_events - n_queries
+
+        active = []
+        emitted_feedback = 0
+        for index, event_time in enumerate(self._event_times(n_queries)):
+            timestamp = event_time.isoformat()
+            session_id = self._pick_session(active, timestamp)
+            session = self.sessions[session_id]
+            session[1] += 1
+            session[2] = timestamp
+            yield 'query', self._query_record(timestamp, session_id)
+
+            # Feedback tersebar merata sepanjang stream query
+            due = (index + 1) * n_feedback // n_queries
+            while emitted_feedback < due:
+                rated_session = self.rng.choice(active)
+                record = self._feedback_record(event_time, rated_session)
+                self.sessions[rated_session][3] = record['rating']
+                yield 'feedback', record
+                emitted_feedback += 1
+
+    def session_records(self) -> Iterator[Tuple[str, dict]]:
+        """Record session (format sama dengan HRAnalytics.sessions) untuk event yang sudah di-stream."""
+        for session_id, (start, count, last, rating) in self.sessions.items():
+            session = {
+                'start_time': start,
+                'query_count': count,
+                'last_activity': last,
+                'rated': rating is not None,
+            }
+            if rating is not None:
+                session['rating'] = rating
+            yield session_id, session
+
+    def write_dataset(self, path: str, n_events: int) -> dict:
+        """
+        Tulis dataset analytics ke file JSON secara streaming.
+
+        Args:
+            path: Path output (format hr_analytics_data.json)
+            n_events: Total event (query + feedback)
+
+        Returns:
+            Dict: queries, feedback, sessions, bytes
+        """
+        counts = {'query': 0, 'feedback': 0}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Feedback ditulis ke file sementara lalu disambung setelah queries
+        with open(path, 'w', encoding='utf-8') as out, \
+                tempfile.TemporaryFile('w+', encoding='utf-8', dir=directory) as feedback_file:
+            out.write('{"queries": [')
+            for kind, record in self.iter_events(n_events):
+                target = out if kind == 'query' else feedback_file
+                target.write((',\n' if counts[kind] else '\n') + json.dumps(record, ensure_ascii=False))
+                counts[kind] += 1
+
+            out.write('\n], "feedback": [')
+            feedback_file.seek(0)
+            while True:
+                chunk = feedback_file.read(1 << 20)
+                if not chunk:
+                    break
+                out.write(chunk)
+
+            out.write('\n], "sessions": {')
+            for index, (session_id, session) in enumerate(self.session_records()):
+                out.write((',\n' if index else '\n') + json.dumps(session_id) + ': ' + json.dumps(session))
+            out.write('\n}}\n')
+
+        return {
+            'queries': counts['query'],
+            'feedback': counts['feedback'],
+            'sessions': len(self.sessions),
+            'bytes': os.path.getsize(path),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate traffic analytics sintetis")
+    parser.add_argument('--events', type=int, default=10000, help="Total event (query + feedback)")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--fallback-rate', type=float, default=0.15)
+    parser.add_argument('--output', type=str, required=True)
+    args = parser.parse_args()
+
+    generator = TrafficGenerator(seed=args.seed, days=args.days, fallback_rate=args.fallback_rate)
+    stats = generator.write_dataset(args.output, args.events)
+    print(f"✅ {stats['queries']} queries, {stats['feedback']} feedback, "
+          f"{stats['sessions']} sessions ({stats['bytes'] / 1e6:.1f} MB) -> {args.output}")
@@ -0,0 +1,269 @@
+"""
+HR Chatbot Matcher Tuning - Sweep Threshold & Weights dari Score Tensor
+=======================================================================
+Tuning FUZZY_THRESHOLD dan FUZZY_WEIGHTS tanpa menjalankan ulang fuzzy scoring.
+
+Cara kerja:
+1. Untuk evaluation set (dataset asli + variasi typo + pertanyaan di luar topik),
+   hitung 4 score mentah (simple, partial, token_sort, token_set) terhadap
+   setiap pertanyaan knowledge base SEKALI
+2. Simpan sebagai tensor uint8 [query, kb, scorer] dengan np.savez_compressed.
+   Cache dipakai ulang selama knowledge base & evaluation set tidak berubah
+3. Setiap kombinasi weight = satu matmul tensor x vektor weight; semua threshold
+   dievaluasi sekaligus dari best score per query (vectorized)
+
+Query di luar topik dianggap benar jika berakhir di fallback.
+
+Usage:
+    python benchmarks/tune_matcher.py                       # grid weight step 0.05
+    python benchmarks/tune_matcher.py --weight-step 0.1 --thresholds 60:90:2
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+import time
+from multiprocessing import Pool
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from bench_utils import RESULTS_DIR, new_results, save_results
+from evaluate import DEFAULT_DATASET, augment, iter_dataset
+
+from config import config
+from fuzzy_matcher import HRFuzzyMatcher
+from hr_knowledge_base import get_flat_qa_pairs
+from query_samples import OFF_TOPIC_QUERIES
+from text_utils import normalize_text
+
+# Urutan scorer di sumbu terakhir tensor
+SCORERS = ('simple', 'partial', 'token_sort', 'token_set')
+
+DEFAULT_CACHE = os.path.join(RESULTS_DIR, 'score_tensor.npz')
+
+# Matcher per proses worker (dibuat oleh _init_worker)
+_worker_matcher = None
+
+
+def _init_worker():
+    """Initializer proses worker: bangun matcher sekali."""
+    global _worker_matcher
+    _worker_matcher = HRFuzzyMatcher(get_flat_qa_pairs())
+
+
+def _score_row(query: str) -> np.ndarray:
+    """Score mentah satu query terhadap semua pertanyaan KB: array uint8 [kb, scorer]."""
+    matcher = _worker_matcher
+    processed = matcher._preprocess(query)
+    row = np.zeros((len(matcher.questions), len(SCORERS)), dtype=np.uint8)
+    if processed:
+        for idx, question in enumerate(matcher.questions):
+            scores = matcher._calculate_scores(processed, question)
+            row[idx] = [scores[name] for name in SCORERS]
+    return row
+
+
+def build_eval_set(dataset: str, variants: int, seed: int, negatives: bool) -> List[Tuple[str, Optional[str]]]:
+    """
+    Evaluation set: (query, expected_answer). expected_answer None = harus fallback.
+    """
+    items = [(q, a) for q, a, _ in augment(list(iter_dataset(dataset)), variants, seed)]
+    if negatives:
+        items.extend((query, None) for query in OFF_TOPIC_QUERIES)
+    return items
+
+
+def tensor_key(questions: List[str], items: List[Tuple[str, Optional[str]]]) -> str:
+    """Hash isi KB + evaluation set; tensor cache hanya valid untuk kombinasi yang sama."""
+    digest = hashlib.sha256()
+    for text in itertools.chain(SCORERS, questions, (q for q, _ in items)):
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_or_build_tensor(items: List[Tuple[str, Optional[str]]], cache_path: str, workers: int) -> dict:
+    """
+    Load score tensor dari cache, atau hitung (paralel) lalu simpan.
+
+    Returns:
+        Dict: scores [Q, K, 4] uint8, expected [Q] int (-1 = harus fallback),
+        kb_answer [K] int, answers (list jawaban unik)
+    """
+    qa_pairs = get_flat_qa_pairs()
+    kb_questions = [q for q, _, _ in qa_pairs]
+    key = tensor_key(kb_questions, items)
+
+    # Jawaban dibandingkan lewat id (normalisasi sama dengan evaluate.py)
+    answers = sorted({normalize_text(a) for _, a, _ in qa_pairs})
+    answer_ids = {answer: i for i, answer in enumerate(answers)}
+    kb_answer = np.array([answer_ids[normalize_text(a)] for _, a, _ in qa_pairs], dtype=np.int32)
+    expected = np.array([
+        -1 if answer is None else answer_ids.get(normalize_text(answer), -2)
+        for _, answer in items
+    ], dtype=np.int32)
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cached:
+                if str(cached['key']) == key:
+                    print(f"📂 Score tensor dari cache {cache_path}")
+                    return {'scores': cached['scores'], 'expected': expected,
+                            'kb_answer': kb_answer, 'answers': answers}
+        except (IOError, OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Error reading tensor cache: {e}")
+
+    print(f"🧮 Menghitung score tensor {len(items)} x {len(kb_questions)} x {len(SCORERS)}...")
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker) as pool:
+        rows = pool.map(_score_row, [q for q, _ in items], chunksize=max(1, len(items) // (workers * 4)))
+    scores = np.stack(rows)
+    print(f"   selesai dalam {time.perf_counter() - start:.1f} s")
+
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    np.savez_compressed(cache_path, scores=scores, key=np.array(key))
+    print(f"💾 Score tensor disimpan ke {cache_path} ({os.path.getsize(cache_path) / 1024:.0f} KB)")
+
+    return {'scores': scores, 'expected': expected, 'kb_answer': kb_answer, 'answers': answers}
+
+
+def weight_grid(step: float) -> np.ndarray:
+    """Semua kombinasi 4 weight kelipatan step dengan total 1.0: array [W, 4]."""
+    units = round(1 / step)
+    combos = [
+        (a, b, c, units - a - b - c)
+        for a in range(units + 1)
+        for b in range(units + 1 - a)
+        for c in range(units + 1 - a - b)
+    ]
+    return np.array(combos, dtype=np.float64) / units
+
+
+def sweep(tensor: dict, weights: np.ndarray, thresholds: np.ndarray, batch: int = 64) -> dict:
+    """
+    Evaluasi semua kombinasi (weight, threshold).
+
+    Args:
+        tensor: Hasil load_or_build_tensor
+        weights: Array [W, 4]
+        thresholds: Array [T]
+        batch: Jumlah kombinasi weight per matmul (membatasi memory)
+
+    Returns:
+        Dict berisi array [W, T]: accuracy, precision, fallback_rate
+    """
+    scores = tensor['scores'].astype(np.float64)       # [Q, K, 4]
+    expected = tensor['expected']                      # [Q]
+    kb_answer = tensor['kb_answer']                    # [K]
+    negative = expected == -1
+    n_queries = len(expected)
+
+    accuracy = np.zeros((len(weights), len(thresholds)), dtype=np.float64)
+    precision = np.zeros_like(accuracy)
+    fallback_rate = np.zeros_like(accuracy)
+
+    for start in range(0, len(weights), batch):
+        w = weights[start:start + batch]                        # [B, 4]
+        weighted = np.einsum('qkf,bf->bqk', scores, w)           # [B, Q, K]
+        # argmax = index pertama dengan score tertinggi (sama dengan pick_best)
+        best_idx = weighted.argmax(axis=2)                       # [B, Q]
+        best_score = np.take_along_axis(weighted, best_idx[..., None], axis=2)[..., 0]
+        right_answer = kb_answer[best_idx] == expected           # [B, Q]
+
+        # [B, Q, T]: query dijawab jika best_score >= threshold (dan > 0)
+        answered = (best_score[..., None] >= thresholds) & (best_score[..., None] > 0)
+        correct = np.where(negative[None, :, None], ~answered, answered & right_answer[..., None])
+
+        n_answered = answered.sum(axis=1)
+        accuracy[start:start + batch] = correct.sum(axis=1) / n_queries
+        precision[start:start + batch] = np.where(
+            n_answered > 0, (answered & right_answer[..., None]).sum(axis=1) / np.maximum(n_answered, 1), 0
+        )
+        fallback_rate[start:start + batch] = 1 - n_answered / n_queries
+
+    return {'accuracy': accuracy, 'precision': precision, 'fallback_rate': fallback_rate}
+
+
+def parse_thresholds(spec: str) -> np.ndarray:
+    """'start:stop:step' (inklusif) atau daftar dipisah koma."""
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        return np.arange(start, stop + step / 2, step, dtype=np.float64)
+    return np.array([float(x) for x in spec.split(',')], dtype=np.float64)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep FUZZY_THRESHOLD & FUZZY_WEIGHTS dari score tensor")
+    parser.add_argument('--dataset', type=str, default=DEFAULT_DATASET)
+    parser.add_argument('--augment', type=int, default=3, help="Jumlah variasi typo per pertanyaan")
+    parser.add_argument('--no-negatives', action='store_true', help="Tanpa pertanyaan di luar topik")
+    parser.add_argument('--weight-step', type=float, default=0.05)
+    parser.add_argument('--thresholds', type=str, default='50:95:1', help="start:stop:step atau a,b,c")
+    parser.add_argument('--top', type=int, default=10, help="Jumlah konfigurasi terbaik yang ditampilkan")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', type=str, default=DEFAULT_CACHE, help="File score tensor (.npz)")
+    parser.add_argument('--output', type=str, default=os.path.join(RESULTS_DIR, 'tuning-latest.json'))
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HR CHATBOT - MATCHER TUNING")
+    print("=" * 60)
+
+    items = build_eval_set(args.dataset, args.augment, args.seed, not args.no_negatives)
+    tensor = load_or_build_tensor(items, args.cache, args.workers)
+
+    # Konfigurasi saat ini selalu ikut dievaluasi sebagai pembanding
+    current_weights = np.array([[config.FUZZY_WEIGHTS[name] for name in SCORERS]], dtype=np.float64)
+    weights = np.concatenate([current_weights, weight_grid(args.weight_step)])
+    thresholds = np.union1d(parse_thresholds(args.thresholds), [config.FUZZY_THRESHOLD])
+
+    start = time.perf_counter()
+    metrics = sweep(tensor, weights, thresholds)
+    elapsed = time.perf_counter() - start
+    n_configs = metrics['accuracy'].size
+    print(f"⚡ {n_configs} konfigurasi dievaluasi dalam {elapsed:.2f} s ({len(items)} query)")
+
+    def row(w_index: int, t_index: int) -> dict:
+        return {
+            'weights': {name: round(float(v), 4) for name, v in zip(SCORERS, weights[w_index])},
+            'threshold': float(thresholds[t_index]),
+            'accuracy': round(float(metrics['accuracy'][w_index, t_index]), 4),
+            'precision': round(float(metrics['precision'][w_index, t_index]), 4),
+            'fallback_rate': round(float(metrics['fallback_rate'][w_index, t_index]), 4),
+        }
+
+    current = row(0, int(np.searchsorted(thresholds, config.FUZZY_THRESHOLD)))
+
+    # Urutkan: accuracy tertinggi, lalu precision tertinggi, lalu threshold tertinggi (lebih konservatif)
+    flat_order = np.lexsort((
+        -np.broadcast_to(thresholds, metrics['accuracy'].shape).ravel(),
+        -metrics['precision'].ravel(),
+        -metrics['accuracy'].ravel(),
+    ))
+    best = []
+    for flat_index in flat_order[:args.top]:
+        w_index, t_index = np.unravel_index(flat_index, metrics['accuracy'].shape)
+        best.append(row(int(w_index), int(t_index)))
+
+    print(f"\n{'weights (simple/partial/token_sort/token_set)':<46} {'thr':>5} {'acc':>7} {'prec':>7} {'fallback':>9}")
+    for label, entry in [('current', current)] + [(f'#{i + 1}', e) for i, e in enumerate(best)]:
+        w = entry['weights']
+        weights_text = '/'.join(f"{w[name]:.2f}" for name in SCORERS)
+        print(f"{label:<8} {weights_text:<37} {entry['threshold']:>5.0f} {entry['accuracy']:>7.2%}"
+              f" {entry['precision']:>7.2%} {entry['fallback_rate']:>9.2%}")
+
+    results = new_results('tuning', {
+        'dataset': os.path.basename(args.dataset),
+        'items': len(items),
+        'augment': args.augment,
+        'negatives': not args.no_negatives,
+        'weight_step': args.weight_step,
+        'thresholds': args.thresholds,
+        'seed': args.seed,
+    })
+    results['cases'] = {'current': current, 'best': best, 'sweep_seconds': round(elapsed, 3),
+                        'configurations': n_configs}
+    save_results(args.output, results)
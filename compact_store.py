@@ -0,0 +1,81 @@
+"""
+HR Chatbot Compact QA Store
+============================
+Representasi ringkas QA pairs matcher di memory proses.
+
+Representasi default HRFuzzyMatcher memakai empat list paralel + dict:
+per baris ada 1 tuple (qa_pairs), 2 object str (pertanyaan asli & preprocessed),
+4 pointer list dan 1 entry dict exact index. Jawaban yang sama memang di-share,
+tapi overhead per baris tetap ratusan byte.
+
+CompactQAStore menyimpan hal yang sama dalam beberapa buffer kontigu:
+- pertanyaan (asli & preprocessed): satu blob UTF-8 + array offsets
+- jawaban & kategori: tabel nilai unik + array id kecil per baris
+- exact index: hash table array uint32 (tanpa object key)
+
+View-nya (PackedStrings, CodedStrings, QAPairsView, ExactIndexView) sama dengan
+snapshot mmap/shared memory, jadi HRFuzzyMatcher memakainya tanpa perubahan
+logika matching. String di-decode saat diakses; tuple (pertanyaan, jawaban,
+kategori) dibuat saat dibutuhkan, tidak disimpan per baris.
+"""
+
+from array import array
+from typing import Sequence
+
+from matcher_snapshot import (CodedStrings, ExactIndexView, PackedStrings, QAPairsView,
+                              build_exact_slots, intern_values, pack_strings)
+
+
+def _id_typecode(count: int) -> str:
+    """Typecode array terkecil untuk id 0..count-1."""
+    if count <= 0xFF:
+        return 'B'
+    if count <= 0xFFFF:
+        return 'H'
+    return 'I'
+
+
+def _pack(values: Sequence) -> PackedStrings:
+    """Blob + offsets; offsets uint32 jika blob < 4 GB."""
+    blob, offsets = pack_strings(values, 'Q')
+    if len(blob) <= 0xFFFFFFFF:
+        offsets = array('I', offsets)
+    return PackedStrings(memoryview(blob), offsets)
+
+
+class CompactQAStore:
+    """
+    QA pairs + pertanyaan preprocessed dalam buffer kontigu.
+    Atribut qa_pairs, questions, answers, categories dan exact_index bisa
+    langsung dipakai HRFuzzyMatcher (lihat HRFuzzyMatcher.from_snapshot).
+    """
+
+    __slots__ = ('qa_pairs', 'questions', 'answers', 'categories', 'exact_index')
+
+    def __init__(self, qa_pairs: Sequence, questions: Sequence):
+        """
+        Args:
+            qa_pairs: (pertanyaan, jawaban, kategori) per baris
+            questions: Pertanyaan yang sudah di-preprocess (urutan sama)
+        """
+        answers_table, answer_ids = intern_values([a for _, a, _ in qa_pairs])
+        categories_table, category_ids = intern_values([c for _, _, c in qa_pairs])
+
+        self.questions = _pack(questions)
+        self.answers = CodedStrings(answers_table, array(_id_typecode(len(answers_table)), answer_ids))
+        self.categories = CodedStrings(categories_table, array(_id_typecode(len(categories_table)), category_ids))
+        self.qa_pairs = QAPairsView(_pack([q for q, _, _ in qa_pairs]), self.answers, self.categories)
+        self.exact_index = ExactIndexView(self.questions, build_exact_slots(questions))
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def nbytes(self) -> int:
+        """Perkiraan ukuran buffer (blob, offsets, id, slot; tanpa tabel jawaban/kategori)."""
+        total = 0
+        for packed in (self.questions, self.qa_pairs._originals):
+            total += packed._blob.nbytes + packed._offsets.itemsize * len(packed._offsets)
+        for coded in (self.answers, self.categories):
+            total += coded._ids.itemsize * len(coded._ids)
+        slots = self.exact_index._slots
+        return total + slots.itemsize * len(slots)
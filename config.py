@@ -27,6 +27,54 @@ class Config:
         'token_set': 0.35,   # Abaikan kata duplikat
     }
     
+    # Jumlah response yang di-cache per engine (LRU, key = query setelah preprocess)
+    # 0 = nonaktif (default), contoh 1000 untuk mengaktifkan
+    RESPONSE_CACHE_SIZE = 0
+    
+    # Fast path: query yang identik dengan pertanyaan KB (setelah preprocess)
+    # langsung dijawab tanpa fuzzy scoring. Nonaktif = semua query di-score
+    MATCHER_EXACT_FAST_PATH = False
+    
+    # Routing kandidat per bahasa (lihat language.py): query Indonesia / Inggris
+    # di-score dulu terhadap pertanyaan bahasanya sendiri (+ pertanyaan campuran),
+    # bahasa lain hanya di-score jika belum ada match >= FUZZY_THRESHOLD
+    MATCHER_LANGUAGE_ROUTING = False
+    
+    # ==================================================
+    # KNOWLEDGE BASE SOURCE
+    # ==================================================
+    # File sumber knowledge base (.xlsx / .csv / .json), lihat kb_loader.py
+    # None = pakai HR_KNOWLEDGE_BASE built-in di hr_knowledge_base.py
+    KB_SOURCE = None
+    
+    # Folder cache hasil kompilasi (di-reuse selama file sumber tidak berubah)
+    KB_CACHE_DIR = ".kb_cache"
+    
+    # Kategori untuk baris tanpa kolom Kategori yang jawabannya tidak ada di KB built-in
+    KB_DEFAULT_CATEGORY = "umum"
+    
+    # Hot reload: file sumber (atau hr_knowledge_base.py jika KB_SOURCE = None)
+    # dipantau di background thread; perubahan di-patch ke matcher tanpa restart
+    KB_WATCH_ENABLED = False
+    KB_WATCH_INTERVAL_SECONDS = 2
+    
+    # Simpan QA pairs matcher dalam buffer kontigu (lihat compact_store.py):
+    # memory per pertanyaan jauh lebih kecil, scoring sedikit lebih lambat
+    # karena pertanyaan di-decode saat di-score
+    MATCHER_COMPACT_STORAGE = False
+    
+    # Snapshot biner index matcher (lihat matcher_snapshot.py). Jika aktif, engine
+    # me-mmap snapshot ini (dibuat ulang otomatis jika knowledge base berubah),
+    # sehingga startup tidak perlu preprocess dan semua proses berbagi memory yang sama
+    MATCHER_SNAPSHOT_ENABLED = False
+    MATCHER_SNAPSHOT_FILE = ".kb_cache/matcher_index.snap"
+    
+    # Index matcher di multiprocessing.shared_memory (lihat matcher_shm.py).
+    # Proses pertama membuat segment, proses lain attach read-only
+    # (didahulukan dari MATCHER_SNAPSHOT_ENABLED jika keduanya aktif)
+    MATCHER_SHARED_MEMORY_ENABLED = False
+    MATCHER_SHM_PREFIX = "hr_matcher"
+    
     # ==================================================
     # SESSION MANAGEMENT
     # ==================================================
@@ -48,15 +96,87 @@ class Config:
     MAX_FEEDBACK_RETAINED = 5000   # Simpan max 5k feedback terakhir
     MAX_SESSIONS_RETAINED = 1000   # Simpan max 1k sessions terakhir
     
+    # Batasan umur data di memory (hari). Data lebih tua dibuang saat insert,
+    # sehingga memory proses yang berjalan lama tetap konstan
+    QUERY_RETENTION_DAYS = 365
+    FEEDBACK_RETENTION_DAYS = 365
+    SESSION_RETENTION_DAYS = 90
+    
     # Pengaturan batch saving (untuk efisiensi)
     SAVE_BATCH_SIZE = 10          # Save setiap 10 queries
     SAVE_INTERVAL_SECONDS = 60    # Atau save setiap 60 detik
     
+    # Writer thread untuk analytics: event dimasukkan ke queue lalu ditulis
+    # oleh background thread, sehingga response chat tidak menunggu disk I/O
+    ANALYTICS_ASYNC_WRITER = True
+    ANALYTICS_QUEUE_MAXSIZE = 5000          # Maksimal event yang antri
+    
+    # Policy saat queue penuh:
+    # - 'block'       : tunggu sampai ada slot (max BLOCK_TIMEOUT detik)
+    # - 'drop_oldest' : buang event paling lama di queue
+    # - 'sample'      : saat queue di atas high watermark, terima sebagian event saja
+    ANALYTICS_QUEUE_OVERFLOW_POLICY = 'drop_oldest'
+    ANALYTICS_QUEUE_BLOCK_TIMEOUT_SECONDS = 5.0
+    ANALYTICS_QUEUE_SAMPLE_RATE = 0.1       # Probabilitas event diterima (policy 'sample')
+    ANALYTICS_QUEUE_HIGH_WATERMARK = 0.8    # Fraksi kapasitas queue sebelum sampling aktif
+    
+    # Mode storage analytics:
+    # - 'single'  : satu file JSON (cukup untuk 1 proses Streamlit)
+    # - 'sharded' : tiap proses menulis shard sendiri, dashboard merge semua shard
+    #               (wajib jika ada beberapa proses di belakang load balancer)
+    ANALYTICS_STORAGE_MODE = 'single'
+    ANALYTICS_WORKER_ID = None              # None = env HR_ANALYTICS_WORKER_ID atau hostname-pid
+    ANALYTICS_SHARD_REFRESH_SECONDS = 5     # Interval baca ulang shard worker lain
+    ANALYTICS_SHARD_STALE_SECONDS = 3600    # Shard tidak berubah selama ini di-compact ke file utama
+    
+    # Cache hasil perhitungan dashboard. Hasil dipakai ulang selama data
+    # belum berubah (data version sama) dan belum lewat TTL
+    DASHBOARD_CACHE_TTL_SECONDS = 30
+    
+    # Top pertanyaan dihitung dengan summary Space-Saving per hari
+    # (memory tetap, tidak bertambah dengan jumlah pertanyaan unik)
+    HEAVY_HITTER_CAPACITY = 200   # Jumlah pertanyaan unik yang dilacak per hari
+    HEAVY_HITTER_DAYS = 30        # Berapa hari summary disimpan
+    
+    # Histogram latency & confidence per hari dan kategori
+    HISTOGRAM_DAYS = 30           # Berapa hari histogram disimpan
+    
     # Default periode untuk analytics
     DEFAULT_ANALYTICS_DAYS = 7
     DEFAULT_TREND_DAYS = 7
     DEFAULT_FEEDBACK_DAYS = 30
     
+    # ==================================================
+    # METRICS EXPORTER (Prometheus)
+    # ==================================================
+    # Jika aktif, app.py menjalankan endpoint http://HOST:PORT/metrics
+    # di background thread untuk di-scrape Prometheus
+    METRICS_ENABLED = False
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 9108
+    
+    # ==================================================
+    # PROFILING (opsional, untuk investigasi latency di production)
+    # ==================================================
+    # Jika aktif, sebagian request get_response & log_query dijalankan di bawah
+    # cProfile + stack sampler, hasilnya di-dump berkala ke PROFILING_OUTPUT_DIR
+    PROFILING_ENABLED = False
+    PROFILING_SAMPLE_RATE = 0.01            # Fraksi request yang diprofile (1%)
+    PROFILING_OUTPUT_DIR = "profiles"
+    PROFILING_DUMP_INTERVAL_SECONDS = 300   # Dump .pstats & .collapsed setiap 5 menit
+    PROFILING_STACK_INTERVAL_MS = 1         # Interval stack sampler
+    
+    # ==================================================
+    # MATCHER ORACLE (verifikasi matcher teroptimasi)
+    # ==================================================
+    # Jika aktif, sebagian response dibandingkan dengan matcher referensi
+    # brute-force di background thread; perbedaan dicatat ke ORACLE_REPORT_FILE
+    ORACLE_ENABLED = False
+    ORACLE_SAMPLE_RATE = 0.01               # Fraksi request yang diverifikasi (1%)
+    ORACLE_TOLERANCE = 0.01                 # Selisih confidence yang masih dianggap sama
+    ORACLE_REPORT_FILE = "matcher_oracle_report.jsonl"
+    ORACLE_QUEUE_MAXSIZE = 100              # Sample dibuang jika verifikasi tertinggal
+    
     # ==================================================
     # UI SETTINGS
     # ==================================================
@@ -73,6 +193,20 @@ class Config:
         "halo",
     ]
     
+    # Jumlah FAQ per halaman di FAQ browser
+    FAQ_PAGE_SIZE = 10
+    
+    # ==================================================
+    # AUTOCOMPLETE (saran saat mengetik di halaman chat)
+    # ==================================================
+    # Prefix trie dari pertanyaan KB + top pertanyaan historis analytics (autocomplete.py)
+    AUTOCOMPLETE_ENABLED = True
+    AUTOCOMPLETE_MAX_SUGGESTIONS = 5
+    AUTOCOMPLETE_MIN_PREFIX = 2             # Minimal karakter sebelum saran muncul
+    AUTOCOMPLETE_HISTORY_QUERIES = 50       # Jumlah top pertanyaan historis yang dipakai
+    AUTOCOMPLETE_HISTORY_DAYS = 30
+    AUTOCOMPLETE_REFRESH_SECONDS = 300      # Interval build ulang di background (data analytics baru)
+    
     # ==================================================
     # DATA VALIDATION
     # ==================================================
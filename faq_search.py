@@ -0,0 +1,229 @@
+"""
+HR Chatbot FAQ Search
+======================
+Inverted index untuk pencarian di halaman FAQ.
+
+Sebelumnya setiap rerun halaman FAQ men-scan semua entry dengan substring match
+di pertanyaan utama & jawaban (variasi tidak ikut dicari, typo = tidak ketemu).
+Index ini dibangun sekali per versi knowledge base (content_hash):
+- term -> posting (posisi entry, bobot field terbaik): pertanyaan utama > variasi > jawaban
+- idf per term: kata umum ("apa", "berapa") hampir tidak berpengaruh ke ranking
+- typo: index symmetric-delete (term tanpa satu huruf -> term), sehingga term query
+  dengan satu huruf salah / kurang / lebih / tertukar tetap ketemu tanpa scan vocabulary
+- prefix: term query minimal 3 huruf juga cocok dengan term yang diawalinya ("reimb")
+
+Skor entry = jumlah (bobot kecocokan x idf x bobot field) per term query, dikalikan
+fraksi term query yang cocok, sehingga entry yang memuat semua kata diutamakan.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from text_utils import normalize_text
+
+# Bobot field (term yang muncul di beberapa field memakai bobot terbesar)
+FIELD_WEIGHTS = {
+    'pertanyaan_utama': 3.0,
+    'variasi': 2.0,
+    'jawaban': 1.0,
+}
+
+# Bobot jenis kecocokan term query vs term index
+EXACT_MATCH = 1.0
+TYPO_MATCH = 0.7
+PREFIX_MATCH = 0.5
+
+# Panjang term minimal untuk pencocokan typo / prefix (term pendek terlalu banyak false positive)
+MIN_TYPO_LENGTH = 4
+MIN_PREFIX_LENGTH = 3
+
+
+def _deletes(term: str) -> set:
+    """Semua variasi term dengan satu huruf dihapus."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class FAQSearchIndex:
+    """
+    Index pencarian FAQ untuk satu versi knowledge base (immutable setelah dibuat).
+    """
+
+    def __init__(self, kb):
+        """
+        Build index dari KnowledgeBase.
+
+        Args:
+            kb: KnowledgeBase (lihat knowledge_base.py)
+        """
+        self.kb = kb
+        self.content_hash = kb.content_hash
+
+        postings = {}
+        for position, entry in enumerate(kb.entries):
+            weights = {}
+            fields = (
+                ('pertanyaan_utama', entry['pertanyaan_utama']),
+                ('variasi', ' '.join(entry['variasi'])),
+                ('jawaban', entry['jawaban']),
+            )
+            for field, text in fields:
+                for term in normalize_text(text).split():
+                    weights[term] = max(weights.get(term, 0.0), FIELD_WEIGHTS[field])
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((position, weight))
+
+        self.postings = {term: tuple(items) for term, items in postings.items()}
+        total = max(len(kb.entries), 1)
+        self.idf = {term: math.log(1 + total / len(items)) for term, items in self.postings.items()}
+        self.vocabulary = sorted(self.postings)
+
+        self.delete_index = {}
+        for term in self.vocabulary:
+            if len(term) >= MIN_TYPO_LENGTH:
+                for deleted in _deletes(term):
+                    self.delete_index.setdefault(deleted, []).append(term)
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """
+        Term index yang cocok dengan satu term query.
+
+        Returns:
+            Dict term index -> bobot kecocokan (terbaik jika cocok dengan beberapa cara)
+        """
+        matches = {}
+        if term in self.postings:
+            matches[term] = EXACT_MATCH
+
+        if len(term) >= MIN_TYPO_LENGTH:
+            # Kurang satu huruf: term query = delete dari term index
+            candidates = list(self.delete_index.get(term, ()))
+            for deleted in _deletes(term):
+                # Lebih satu huruf: delete dari term query = term index
+                if deleted in self.postings and len(deleted) >= MIN_TYPO_LENGTH - 1:
+                    candidates.append(deleted)
+                # Satu huruf salah / tertukar: delete keduanya sama
+                candidates.extend(self.delete_index.get(deleted, ()))
+            for candidate in candidates:
+                matches.setdefault(candidate, TYPO_MATCH)
+
+        if len(term) >= MIN_PREFIX_LENGTH:
+            start = bisect_left(self.vocabulary, term)
+            for candidate in self.vocabulary[start:]:
+                if not candidate.startswith(term):
+                    break
+                matches.setdefault(candidate, PREFIX_MATCH)
+        return matches
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = None) -> List[Tuple[dict, float]]:
+        """
+        Cari entry FAQ yang relevan dengan query.
+
+        Args:
+            query: Input pencarian mentah
+            category: Filter kategori (None = semua)
+            limit: Maksimal hasil (None = semua yang cocok)
+
+        Returns:
+            List of (entry, score), score tertinggi dulu (urutan KB jika seri)
+        """
+        terms = list(dict.fromkeys(normalize_text(query).split()))
+        if not terms:
+            return []
+
+        scores = {}
+        matched_terms = {}
+        for term in terms:
+            # Bobot terbaik per entry untuk term query ini
+            best = {}
+            for candidate, match_weight in self._expand(term).items():
+                weight = match_weight * self.idf[candidate]
+                for position, field_weight in self.postings[candidate]:
+                    value = weight * field_weight
+                    if value > best.get(position, 0.0):
+                        best[position] = value
+            for position, value in best.items():
+                scores[position] = scores.get(position, 0.0) + value
+                matched_terms[position] = matched_terms.get(position, 0) + 1
+
+        entries = self.kb.entries
+        ranked = []
+        for position, score in scores.items():
+            entry = entries[position]
+            if category is not None and entry['kategori'] != category:
+                continue
+            ranked.append((-score * matched_terms[position] / len(terms), position))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(entries[position], -neg_score) for neg_score, position in ranked]
+
+
+# Index untuk knowledge base aktif (dibangun ulang jika content_hash berubah)
+_index_instance = None
+_index_lock = threading.Lock()
+
+
+def get_faq_index() -> FAQSearchIndex:
+    """
+    Index FAQ untuk knowledge base aktif (knowledge_base.get_knowledge_base).
+    Dibangun sekali per versi knowledge base, dipakai bersama semua session.
+
+    Returns:
+        FAQSearchIndex instance
+    """
+    global _index_instance
+    from knowledge_base import get_knowledge_base
+    kb = get_knowledge_base()
+    with _index_lock:
+        if _index_instance is None or _index_instance.content_hash != kb.content_hash:
+            _index_instance = FAQSearchIndex(kb)
+        return _index_instance
+
+
+# Quick test + latency pada KB yang diperbesar jika file dijalankan langsung
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    from knowledge_base import KnowledgeBase, get_knowledge_base
+
+    parser = argparse.ArgumentParser(description="Quick test & latency FAQ search")
+    parser.add_argument('--scale', type=int, default=100, help="Salinan entry KB (100 = ~4000 entry)")
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    base = get_knowledge_base()
+    for query in ["cuti melahirkan", "reimb kacamata", "gaji turun tanggal", "lembru", "asurasi keluarga"]:
+        results = FAQSearchIndex(base).search(query, limit=3)
+        print(f"\n🔍 {query!r}")
+        for entry, score in results:
+            print(f"   {score:6.2f}  {entry['pertanyaan_utama']}")
+
+    entries = base.to_entries()
+    for entry in entries:
+        entry.pop('id')
+    kb = KnowledgeBase(entries * args.scale)
+    start = time.perf_counter()
+    index = FAQSearchIndex(kb)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(42)
+    questions = [q for q, _, _ in kb.flat_pairs]
+    latencies = []
+    for _ in range(args.queries):
+        words = normalize_text(rng.choice(questions)).split()
+        if words and rng.random() < 0.5:
+            # Satu typo (huruf dihapus) di kata acak
+            i = rng.randrange(len(words))
+            if len(words[i]) > 4:
+                j = rng.randrange(len(words[i]))
+                words[i] = words[i][:j] + words[i][j + 1:]
+        t0 = time.perf_counter()
+        index.search(' '.join(words), limit=10)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    print(f"\n{len(kb)} entry | {len(index.postings)} term | build {build_ms:.0f} ms")
+    print(f"Search: p50 {latencies[len(latencies) // 2]:.2f} ms | p99 {latencies[int(len(latencies) * 0.99)]:.2f} ms")
@@ -6,13 +6,28 @@ Cara kerja:
 2. Hitung 4 jenis fuzzy scores
 3. Weighted average dari scores
 4. Return jawaban jika score >= threshold
+
+Setiap tahap di HRChatbotEngine.get_response diukur dengan perf_counter_ns,
+hasilnya dikembalikan di response dan disimpan bersama record analytics.
 """
 
+from array import array
+from collections import Counter, OrderedDict
 from fuzzywuzzy import fuzz
-from typing import Tuple, List, Optional
-import re
+from typing import Tuple, List, Optional, Sequence
+import copy
+import heapq
+import random
+import threading
+import time
 
+from compact_store import CompactQAStore
 from config import config
+from language import LANG_MIX, detect_language, label_questions, partition_by_language
+from matcher_oracle import MatcherOracle
+from metrics_exporter import MATCHER_CANDIDATES_SCORED, RESPONSE_CACHE_HITS, RESPONSE_LATENCY
+from profiler import profiled
+from text_utils import normalize_text
 
 
 class HRFuzzyMatcher:
@@ -26,25 +41,150 @@ class HRFuzzyMatcher:
     4. Simple Ratio - untuk pertanyaan yang mirip persis
     """
     
-    def __init__(self, qa_pairs: List[Tuple[str, str, str]], threshold: int = None):
+    def __init__(self, qa_pairs: Sequence[Tuple[str, str, str]], threshold: int = None,
+                 preprocessed_questions: List[str] = None):
         """
         Initialize matcher dengan QA pairs.
         
         Args:
-            qa_pairs: List of (pertanyaan, jawaban, kategori)
+            qa_pairs: List / tuple of (pertanyaan, jawaban, kategori), tidak disalin
             threshold: Minimum score untuk match (0-100). None = ambil dari config
+            preprocessed_questions: Pertanyaan yang sudah di-preprocess (mis. dari
+                cache kb_loader), urutan sama dengan qa_pairs. None = preprocess di sini
         """
         self.qa_pairs = qa_pairs
         self.threshold = threshold or config.FUZZY_THRESHOLD
         
         # Preprocess semua pertanyaan untuk efisiensi
-        self.questions = [self._preprocess(q) for q, _, _ in qa_pairs]
+        if preprocessed_questions is not None and len(preprocessed_questions) == len(qa_pairs):
+            self.questions = list(preprocessed_questions)
+        else:
+            self.questions = [self._preprocess(q) for q, _, _ in qa_pairs]
         self.answers = [a for _, a, _ in qa_pairs]
         self.categories = [c for _, _, c in qa_pairs]
         
+        # Index exact match: pertanyaan (preprocessed) -> index pertama
+        # Query yang identik pasti mendapat skor maksimal, tidak perlu fuzzy scoring
+        self.exact_index = {}
+        for idx, question in enumerate(self.questions):
+            self.exact_index.setdefault(question, idx)
+        
+        # MatcherSnapshot / CompactQAStore sumber data (None = list biasa)
+        self.snapshot = None
+        if config.MATCHER_COMPACT_STORAGE:
+            self._use_store(CompactQAStore(qa_pairs, self.questions))
+        self._index_languages()
+    
+    def _use_store(self, store):
+        """Pakai view dari snapshot / compact store sebagai state matcher."""
+        self.qa_pairs = store.qa_pairs
+        self.questions = store.questions
+        self.answers = store.answers
+        self.categories = store.categories
+        self.exact_index = store.exact_index
+        self.snapshot = store
+    
+    def _index_languages(self, labels=None):
+        """
+        Label & partisi bahasa pertanyaan (MATCHER_LANGUAGE_ROUTING, lihat language.py).
+        Dipanggil setiap kali self.questions diganti.
+        
+        Args:
+            labels: Label bahasa yang sudah diketahui (urutan sama dengan self.questions)
+        """
+        if not config.MATCHER_LANGUAGE_ROUTING:
+            self.language_labels = self.language_partitions = None
+            return
+        self.language_labels = labels if labels is not None else label_questions(self.questions)
+        self.language_partitions = partition_by_language(self.language_labels)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, threshold: int = None) -> 'HRFuzzyMatcher':
+        """
+        Matcher yang membaca state-nya langsung dari snapshot biner (mmap / shared memory)
+        atau CompactQAStore, tanpa preprocess dan tanpa menyalin list ke memory proses.
+        
+        Args:
+            snapshot: MatcherSnapshot (lihat matcher_snapshot.open_snapshot) atau CompactQAStore
+            threshold: Minimum score untuk match (0-100). None = ambil dari config
+        
+        Returns:
+            HRFuzzyMatcher
+        """
+        matcher = cls.__new__(cls)
+        matcher.threshold = threshold or config.FUZZY_THRESHOLD
+        matcher._use_store(snapshot)
+        matcher._index_languages()
+        return matcher
+    
+    def patched(self, removed_pairs: List[Tuple[str, str, str]],
+                added_pairs: List[Tuple[str, str, str]]) -> 'HRFuzzyMatcher':
+        """
+        Matcher baru hasil patch incremental (copy-on-write, matcher ini tidak berubah).
+        Hanya pertanyaan yang ditambahkan yang di-preprocess; baris lain dipakai ulang.
+        
+        Args:
+            removed_pairs: (pertanyaan, jawaban, kategori) yang dibuang
+            added_pairs: (pertanyaan, jawaban, kategori) yang ditambahkan (di akhir)
+        
+        Returns:
+            HRFuzzyMatcher baru
+        """
+        to_remove = Counter(removed_pairs)
+        keep = None
+        if to_remove:
+            keep = []
+            for idx, pair in enumerate(self.qa_pairs):
+                if to_remove[pair] > 0:
+                    to_remove[pair] -= 1
+                else:
+                    keep.append(idx)
+            qa_pairs = [self.qa_pairs[idx] for idx in keep]
+            questions = [self.questions[idx] for idx in keep]
+            answers = [self.answers[idx] for idx in keep]
+            categories = [self.categories[idx] for idx in keep]
+            # Posisi bergeser: exact index dibangun ulang (tanpa preprocess ulang)
+            exact_index = {}
+            for idx, question in enumerate(questions):
+                exact_index.setdefault(question, idx)
+        else:
+            qa_pairs = list(self.qa_pairs)
+            questions = list(self.questions)
+            answers = list(self.answers)
+            categories = list(self.categories)
+            exact_index = dict(self.exact_index)
+        
+        for question, answer, category in added_pairs:
+            processed = self._preprocess(question)
+            exact_index.setdefault(processed, len(questions))
+            qa_pairs.append((question, answer, category))
+            questions.append(processed)
+            answers.append(answer)
+            categories.append(category)
+        
+        matcher = copy.copy(self)
+        matcher.qa_pairs = qa_pairs
+        matcher.questions = questions
+        matcher.answers = answers
+        matcher.categories = categories
+        matcher.exact_index = exact_index
+        matcher.snapshot = None
+        if config.MATCHER_COMPACT_STORAGE:
+            matcher._use_store(CompactQAStore(qa_pairs, questions))
+        
+        # Label bahasa baris lama dipakai ulang, hanya baris baru yang dideteksi
+        labels = None
+        if config.MATCHER_LANGUAGE_ROUTING and self.language_labels is not None:
+            old_labels = self.language_labels
+            labels = old_labels[:] if keep is None else array('B', (old_labels[idx] for idx in keep))
+            labels.extend(label_questions(questions[len(labels):]))
+        matcher._index_languages(labels)
+        return matcher
+    
     def _preprocess(self, text: str) -> str:
         """
         Preprocess text: lowercase, remove punctuation, normalize whitespace.
+        Normalisasi yang sama dipakai analytics (lihat text_utils.normalize_text).
         
         Args:
             text: Text mentah
@@ -52,24 +192,7 @@ class HRFuzzyMatcher:
         Returns:
             Text yang sudah dibersihkan
         """
-        # Validasi input
-        if not text or not isinstance(text, str):
-            return ""
-        
-        try:
-            # Lowercase
-            text = text.lower()
-            
-            # Remove punctuation (keep alphanumeric dan spaces)
-            text = re.sub(r'[^\w\s]', ' ', text)
-            
-            # Normalize multiple spaces ke single space
-            text = re.sub(r'\s+', ' ', text)
-            
-            return text.strip()
-        except Exception as e:
-            print(f"⚠️ Error preprocessing text: {e}")
-            return ""
+        return normalize_text(text)
     
     def _calculate_scores(self, query: str, target: str) -> dict:
         """
@@ -103,6 +226,116 @@ class HRFuzzyMatcher:
         weights = config.FUZZY_WEIGHTS
         return sum(scores[k] * weights[k] for k in weights)
     
+    def get_candidates(self, processed_query: str):
+        """
+        Pilih index pertanyaan yang perlu di-score untuk query ini.
+        Tanpa language routing: semua pertanyaan di knowledge base. Dengan routing:
+        pertanyaan bahasa query + pertanyaan campuran (query campuran = semua).
+        
+        Args:
+            processed_query: Query yang sudah di-preprocess
+        
+        Returns:
+            Iterable index pertanyaan (terurut)
+        """
+        if self.language_partitions is not None:
+            language = detect_language(processed_query)
+            if language != LANG_MIX:
+                return self.language_partitions[language][0]
+        return range(len(self.questions))
+    
+    def get_secondary_candidates(self, processed_query: str):
+        """
+        Pertanyaan bahasa lain yang dilewati get_candidates (kosong tanpa routing).
+        Hanya di-score jika kandidat utama tidak menghasilkan match (lihat score_query).
+        
+        Returns:
+            Iterable index pertanyaan (terurut)
+        """
+        if self.language_partitions is not None:
+            language = detect_language(processed_query)
+            if language != LANG_MIX:
+                return self.language_partitions[language][1]
+        return ()
+    
+    def score_query(self, processed_query: str, candidates) -> List[Tuple[int, float]]:
+        """
+        Score kandidat utama; jika tidak ada yang mencapai threshold, score juga
+        kandidat sekunder (bahasa lain) agar match lintas bahasa tidak hilang.
+        
+        Args:
+            processed_query: Query yang sudah di-preprocess
+            candidates: Index pertanyaan dari get_candidates
+        
+        Returns:
+            List of (index, weighted_score) terurut index
+        """
+        scored = self.score_candidates(processed_query, candidates)
+        if self.language_partitions is None or self.pick_best(scored)[1] >= self.threshold:
+            return scored
+        secondary = self.get_secondary_candidates(processed_query)
+        if not secondary:
+            return scored
+        # Urutan index dipertahankan agar pick_best memilih index pertama jika seri
+        return list(heapq.merge(scored, self.score_candidates(processed_query, secondary)))
+    
+    def score_candidates(self, processed_query: str, candidates) -> List[Tuple[int, float]]:
+        """
+        Hitung weighted score untuk setiap kandidat.
+        
+        Args:
+            processed_query: Query yang sudah di-preprocess
+            candidates: Index pertanyaan dari get_candidates
+        
+        Returns:
+            List of (index, weighted_score) dengan urutan sama seperti candidates
+        """
+        questions = self.questions
+        return [
+            (idx, self._weighted_score(self._calculate_scores(processed_query, questions[idx])))
+            for idx in candidates
+        ]
+    
+    def exact_match_score(self) -> float:
+        """Skor untuk query yang identik dengan pertanyaan di knowledge base."""
+        return self._weighted_score({k: 100 for k in config.FUZZY_WEIGHTS})
+    
+    @staticmethod
+    def pick_best(scored: List[Tuple[int, float]]) -> Tuple[int, float]:
+        """
+        Ambil kandidat dengan score tertinggi (index pertama jika seri).
+        
+        Returns:
+            Tuple of (best_idx, best_score). best_idx = -1 jika tidak ada kandidat > 0
+        """
+        best_score = 0
+        best_idx = -1
+        
+        for idx, weighted in scored:
+            if weighted > best_score:
+                best_score = weighted
+                best_idx = idx
+        
+        return best_idx, best_score
+    
+    def rank_top(self, scored: List[Tuple[int, float]], top_n: int) -> List[Tuple[str, str, float, str]]:
+        """
+        Urutkan kandidat berdasarkan score dan ambil top N.
+        
+        Returns:
+            List of (original_question, answer, score, category)
+        """
+        ranked = sorted(scored, key=lambda x: x[1], reverse=True)[:top_n]
+        return [
+            (
+                self.qa_pairs[idx][0],  # original question
+                self.answers[idx],
+                weighted,
+                self.categories[idx]
+            )
+            for idx, weighted in ranked
+        ]
+    
     def find_best_match(self, query: str) -> Tuple[Optional[str], float, Optional[str]]:
         """
         Cari jawaban terbaik untuk query user.
@@ -124,17 +357,13 @@ class HRFuzzyMatcher:
         if not processed_query:
             return None, 0, None
         
-        best_score = 0
-        best_idx = -1
-        
-        # Loop semua pertanyaan di knowledge base
-        for idx, question in enumerate(self.questions):
-            scores = self._calculate_scores(processed_query, question)
-            weighted = self._weighted_score(scores)
-            
-            if weighted > best_score:
-                best_score = weighted
-                best_idx = idx
+        # Fast path (opsional): query identik dengan pertanyaan di knowledge base
+        exact_idx = self.exact_index.get(processed_query) if config.MATCHER_EXACT_FAST_PATH else None
+        if exact_idx is not None:
+            best_idx, best_score = exact_idx, self.exact_match_score()
+        else:
+            scored = self.score_query(processed_query, self.get_candidates(processed_query))
+            best_idx, best_score = self.pick_best(scored)
         
         # Return jawaban jika score cukup tinggi
         if best_score >= self.threshold and best_idx >= 0:
@@ -165,22 +394,11 @@ class HRFuzzyMatcher:
         if not processed_query:
             return []
         
-        results = []
-        
-        # Hitung score untuk semua pertanyaan
-        for idx, question in enumerate(self.questions):
-            scores = self._calculate_scores(processed_query, question)
-            weighted = self._weighted_score(scores)
-            results.append((
-                self.qa_pairs[idx][0],  # original question
-                self.answers[idx],
-                weighted,
-                self.categories[idx]
-            ))
+        # Hitung score untuk semua kandidat
+        scored = self.score_query(processed_query, self.get_candidates(processed_query))
         
         # Sort by score descending dan ambil top N
-        results.sort(key=lambda x: x[2], reverse=True)
-        return results[:top_n]
+        return self.rank_top(scored, top_n)
     
     def get_fallback_response(self) -> str:
         """
@@ -202,16 +420,115 @@ class HRChatbotEngine:
     Ini adalah interface utama yang digunakan oleh aplikasi.
     """
     
-    def __init__(self, qa_pairs: List[Tuple[str, str, str]], threshold: int = None):
+    def __init__(self, qa_pairs: Sequence[Tuple[str, str, str]], threshold: int = None,
+                 preprocessed_questions: List[str] = None, matcher: HRFuzzyMatcher = None):
         """
         Initialize chatbot engine.
         
         Args:
-            qa_pairs: List of (pertanyaan, jawaban, kategori)
+            qa_pairs: List / tuple of (pertanyaan, jawaban, kategori), tidak disalin
             threshold: Minimum confidence score (None = dari config)
+            preprocessed_questions: Pertanyaan yang sudah di-preprocess (opsional)
+            matcher: Matcher yang sudah jadi (mis. dari snapshot); qa_pairs diabaikan
+        """
+        if matcher is None:
+            matcher = HRFuzzyMatcher(qa_pairs, threshold, preprocessed_questions)
+        self.matcher = matcher
+        
+        # LRU cache response per query (preprocessed)
+        self._response_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Oracle matcher referensi (dibuat saat pertama kali dibutuhkan)
+        self._oracle = None
+    
+    def get_oracle(self) -> MatcherOracle:
+        """Oracle yang membandingkan engine ini dengan matcher referensi (lazy)."""
+        if self._oracle is None:
+            self._oracle = MatcherOracle(self.matcher.qa_pairs, self.matcher.threshold)
+        return self._oracle
+    
+    def _cache_get(self, processed_query: str) -> Optional[dict]:
+        """Ambil response dari cache (dan tandai sebagai baru dipakai)."""
+        if config.RESPONSE_CACHE_SIZE <= 0:
+            return None
+        with self._cache_lock:
+            cached = self._response_cache.get(processed_query)
+            if cached is not None:
+                self._response_cache.move_to_end(processed_query)
+            return cached
+    
+    def _cache_put(self, processed_query: str, response: dict, matcher: HRFuzzyMatcher = None):
+        """
+        Simpan response ke cache, buang entry paling lama jika penuh.
+        Response dari matcher yang sudah diganti (hot reload) tidak di-cache.
         """
-        self.matcher = HRFuzzyMatcher(qa_pairs, threshold)
+        if config.RESPONSE_CACHE_SIZE <= 0:
+            return
+        with self._cache_lock:
+            if matcher is not None and matcher is not self.matcher:
+                return
+            self._response_cache[processed_query] = response
+            self._response_cache.move_to_end(processed_query)
+            while len(self._response_cache) > config.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def swap_matcher(self, matcher: HRFuzzyMatcher):
+        """
+        Ganti matcher secara atomic (hot reload knowledge base).
+        Request yang sedang berjalan tetap memakai matcher lama sampai selesai,
+        request berikutnya langsung memakai matcher baru.
         
+        Args:
+            matcher: Matcher baru (mis. hasil HRFuzzyMatcher.patched)
+        """
+        with self._cache_lock:
+            self.matcher = matcher
+            self._response_cache.clear()
+        self._oracle = None
+    
+    def apply_diff(self, removed_pairs: List[Tuple[str, str, str]],
+                   added_pairs: List[Tuple[str, str, str]]):
+        """Patch index matcher secara incremental lalu swap (lihat diff_knowledge_bases)."""
+        self.swap_matcher(self.matcher.patched(removed_pairs, added_pairs))
+    
+    def _build_response(self, matcher: HRFuzzyMatcher, best_idx: int, confidence: float,
+                        scored: List[Tuple[int, float]]) -> dict:
+        """
+        Bangun response dict dari hasil matching.
+        matcher = matcher yang menghasilkan best_idx & scored (bukan self.matcher,
+        yang bisa sudah diganti hot reload di tengah request).
+        """
+        if best_idx >= 0 and confidence >= matcher.threshold:
+            # Ada match yang bagus
+            return {
+                'answer': matcher.answers[best_idx],
+                'confidence': confidence,
+                'category': matcher.categories[best_idx],
+                'is_fallback': False,
+                'suggestions': []
+            }
+        
+        # Tidak ada match, berikan fallback + suggestions
+        # (pakai score yang sudah dihitung, tidak scoring ulang)
+        top_matches = matcher.rank_top(scored, config.MAX_SUGGESTIONS)
+        
+        # Filter suggestions dengan minimum score
+        suggestions = [
+            {'question': q, 'score': s} 
+            for q, _, s, _ in top_matches 
+            if s >= config.SUGGESTION_MIN_SCORE
+        ]
+        
+        return {
+            'answer': matcher.get_fallback_response(),
+            'confidence': confidence,
+            'category': None,
+            'is_fallback': True,
+            'suggestions': suggestions[:config.MAX_SUGGESTIONS]
+        }
+    
+    @profiled('get_response')
     def get_response(self, user_input: str) -> dict:
         """
         Dapatkan response untuk user input.
@@ -227,40 +544,128 @@ class HRChatbotEngine:
             - category: Kategori pertanyaan
             - is_fallback: Boolean, True jika tidak ada match
             - suggestions: List suggestion jika fallback
+            - path: 'cache', 'exact', 'fuzzy', 'fallback', atau 'invalid'
+            - candidates_scored: Jumlah pertanyaan yang di-score
+            - timings_ms: Durasi per tahap (preprocess, candidates, scoring, suggestions)
+            - latency_ms: Total durasi get_response
         """
-        answer, confidence, category = self.matcher.find_best_match(user_input)
-        
-        if answer:
-            # Ada match yang bagus
-            response = {
-                'answer': answer,
-                'confidence': confidence,
-                'category': category,
-                'is_fallback': False,
-                'suggestions': []
-            }
+        matcher = self.matcher
+        t_start = time.perf_counter_ns()
+        
+        # Tahap 1: preprocess
+        processed_query = matcher._preprocess(user_input) if isinstance(user_input, str) else ""
+        t_preprocess = time.perf_counter_ns()
+        
+        t_candidates = t_scoring = t_preprocess
+        candidates_scored = 0
+        scored = []
+        
+        cached = self._cache_get(processed_query) if processed_query else None
+        if cached is not None:
+            response = dict(cached)
+            response['suggestions'] = list(cached['suggestions'])
+            path = 'cache'
+            t_suggestions = time.perf_counter_ns()
         else:
-            # Tidak ada match, berikan fallback + suggestions
-            top_matches = self.matcher.find_top_matches(user_input)
+            if not processed_query:
+                best_idx, confidence = -1, 0
+            elif config.MATCHER_EXACT_FAST_PATH and processed_query in matcher.exact_index:
+                # Fast path (opsional): identik dengan pertanyaan di knowledge base
+                best_idx, confidence = matcher.exact_index[processed_query], matcher.exact_match_score()
+            else:
+                # Tahap 2: candidate generation
+                candidates = matcher.get_candidates(processed_query)
+                t_candidates = time.perf_counter_ns()
+                
+                # Tahap 3: scoring (+ kandidat bahasa lain jika belum ada match)
+                scored = matcher.score_query(processed_query, candidates)
+                candidates_scored = len(scored)
+                best_idx, confidence = matcher.pick_best(scored)
+                t_scoring = time.perf_counter_ns()
             
-            # Filter suggestions dengan minimum score
-            suggestions = [
-                {'question': q, 'score': s} 
-                for q, _, s, _ in top_matches 
-                if s >= config.SUGGESTION_MIN_SCORE
-            ]
+            # Tahap 4: suggestion building (hanya untuk fallback)
+            response = self._build_response(matcher, best_idx, confidence, scored)
+            t_suggestions = time.perf_counter_ns()
             
-            response = {
-                'answer': self.matcher.get_fallback_response(),
-                'confidence': confidence,
-                'category': None,
-                'is_fallback': True,
-                'suggestions': suggestions[:config.MAX_SUGGESTIONS]
-            }
+            if not processed_query:
+                path = 'invalid'
+            elif response['is_fallback']:
+                path = 'fallback'
+            elif candidates_scored == 0:
+                path = 'exact'
+            else:
+                path = 'fuzzy'
+            
+            if processed_query:
+                self._cache_put(processed_query, response, matcher)
+                response = dict(response)
+                response['suggestions'] = list(response['suggestions'])
+        
+        response['path'] = path
+        response['candidates_scored'] = candidates_scored
+        response['timings_ms'] = {
+            'preprocess': (t_preprocess - t_start) / 1e6,
+            'candidates': (t_candidates - t_preprocess) / 1e6,
+            'scoring': (t_scoring - t_candidates) / 1e6,
+            'suggestions': (t_suggestions - t_scoring) / 1e6,
+        }
+        response['latency_ms'] = (time.perf_counter_ns() - t_start) / 1e6
+        
+        # Metrics untuk exporter Prometheus
+        RESPONSE_LATENCY.observe(response['latency_ms'] / 1000, labels=(path,))
+        if candidates_scored:
+            MATCHER_CANDIDATES_SCORED.inc(candidates_scored)
+        if path == 'cache':
+            RESPONSE_CACHE_HITS.inc()
+        
+        # Verifikasi sebagian response terhadap matcher referensi (di background)
+        if (config.ORACLE_ENABLED and path != 'invalid' and matcher is self.matcher
+                and random.random() < config.ORACLE_SAMPLE_RATE):
+            self.get_oracle().submit(user_input, response)
         
         return response
 
 
+# Singleton engine yang dipakai bersama semua session (dan di-update oleh kb_watcher)
+_engine_instance = None
+_engine_lock = threading.Lock()
+
+def get_chatbot_engine() -> HRChatbotEngine:
+    """
+    Engine bersama dari knowledge base aktif (knowledge_base.get_knowledge_base).
+    Dibuat sekali per proses; hot reload mengganti matcher-nya, bukan engine-nya.
+    Jika MATCHER_SHARED_MEMORY_ENABLED / MATCHER_SNAPSHOT_ENABLED, matcher dibaca
+    dari shared memory / snapshot mmap.
+    
+    Returns:
+        HRChatbotEngine instance
+    """
+    global _engine_instance
+    with _engine_lock:
+        if _engine_instance is None:
+            from knowledge_base import get_knowledge_base
+            kb = get_knowledge_base()
+            
+            snapshot = None
+            if config.MATCHER_SHARED_MEMORY_ENABLED:
+                from matcher_shm import publish_or_attach
+                snapshot = publish_or_attach(kb.flat_pairs, kb.questions, kb.content_hash)
+            if snapshot is None and config.MATCHER_SNAPSHOT_ENABLED:
+                from matcher_snapshot import load_or_create_snapshot
+                snapshot = load_or_create_snapshot(
+                    config.MATCHER_SNAPSHOT_FILE, kb.flat_pairs, kb.questions, kb.content_hash
+                )
+            matcher = HRFuzzyMatcher.from_snapshot(snapshot, config.FUZZY_THRESHOLD) if snapshot is not None else None
+            
+            _engine_instance = HRChatbotEngine(
+                kb.flat_pairs,
+                threshold=config.FUZZY_THRESHOLD,
+                preprocessed_questions=kb.questions,
+                matcher=matcher
+            )
+        return _engine_instance
+
+
 # Quick test jika file dijalankan langsung
 if __name__ == "__main__":
     from hr_knowledge_base import get_flat_qa_pairs
@@ -280,7 +685,7 @@ if __name__ == "__main__":
         result = engine.get_response(query)
         print(f"   A: {result['answer'][:100]}...")
         print(f"   Confidence: {result['confidence']:.1f}% | Category: {result['category']}")
-        print(f"   Fallback: {result['is_fallback']}")
+        print(f"   Fallback: {result['is_fallback']} | Path: {result['path']} | Latency: {result['latency_ms']:.2f} ms")
         
         if result['suggestions']:
             print(f"   Suggestions: {len(result['suggestions'])} items")
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+HR Chatbot Heavy Hitters
+=========================
+Struktur Space-Saving (Metwally et al.) untuk menghitung pertanyaan
+paling sering dengan memory terbatas.
+
+Cara kerja:
+1. Simpan maksimal `capacity` key beserta count-nya
+2. Key baru saat penuh menggantikan key dengan count terkecil
+   (count baru = count terkecil + 1, error = count terkecil)
+3. Summary per hari bisa di-merge untuk window 7/14/30 hari
+
+Memory tidak bertambah walau jumlah pertanyaan unik terus bertambah.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class SpaceSaving:
+    """
+    Summary heavy hitters dengan kapasitas tetap.
+    Count yang dilaporkan adalah batas atas; count - error adalah batas bawah.
+    """
+    
+    __slots__ = ('capacity', 'counts', 'errors', 'total')
+    
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Jumlah maksimal key yang dilacak
+        """
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+    
+    def add(self, key: str, count: int = 1):
+        """
+        Tambah count untuk satu key.
+        
+        Args:
+            key: Key (pertanyaan yang sudah dinormalisasi)
+            count: Jumlah kemunculan
+        """
+        self.total += count
+        
+        if key in self.counts:
+            self.counts[key] += count
+            return
+        
+        if len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+            return
+        
+        # Ganti key dengan count terkecil (O(capacity), jarang terjadi untuk key populer)
+        min_key = min(self.counts, key=self.counts.__getitem__)
+        min_count = self.counts.pop(min_key)
+        del self.errors[min_key]
+        
+        self.counts[key] = min_count + count
+        self.errors[key] = min_count
+    
+    def merge(self, other: 'SpaceSaving'):
+        """
+        Gabungkan summary lain ke summary ini (count & error dijumlahkan),
+        lalu potong kembali ke kapasitas.
+        
+        Args:
+            other: Summary lain
+        """
+        self.total += other.total
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+            self.errors[key] = self.errors.get(key, 0) + other.errors.get(key, 0)
+        
+        if len(self.counts) > self.capacity:
+            keep = sorted(self.counts, key=self.counts.__getitem__, reverse=True)[:self.capacity]
+            self.counts = {k: self.counts[k] for k in keep}
+            self.errors = {k: self.errors[k] for k in keep}
+    
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """
+        Top N key berdasarkan count terjamin (count - error).
+        Key yang baru masuk menggantikan key lain tidak ikut terangkat
+        oleh count warisan, sehingga noise tidak muncul di atas.
+        
+        Args:
+            n: Jumlah key
+        
+        Returns:
+            List of (key, count) urut count descending
+        """
+        items = [
+            (key, count - self.errors[key])
+            for key, count in self.counts.items()
+        ]
+        items.sort(key=lambda item: item[1], reverse=True)
+        return items[:n]
+    
+    @classmethod
+    def merged(cls, summaries: Iterable['SpaceSaving'], capacity: int) -> 'SpaceSaving':
+        """
+        Buat summary baru hasil merge beberapa summary.
+        
+        Args:
+            summaries: Summary yang akan digabung
+            capacity: Kapasitas summary hasil
+        """
+        result = cls(capacity)
+        for summary in summaries:
+            result.merge(summary)
+        return result
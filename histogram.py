@@ -0,0 +1,121 @@
+"""
+HR Chatbot Histogram
+=====================
+Histogram log-linear (gaya HDR Histogram) untuk latency dan confidence.
+
+Cara kerja:
+1. Nilai dibagi `unit` lalu dibulatkan ke integer
+2. Nilai < SUB_BUCKETS disimpan linear (presisi penuh)
+3. Nilai lebih besar dikelompokkan per pangkat 2, masing-masing dibagi
+   SUB_BUCKETS bucket linear -> relative error maksimal 1/SUB_BUCKETS
+4. Bucket disimpan sparse (dict), sehingga histogram kecil dan bisa di-merge
+"""
+
+import math
+from typing import Dict, Optional
+
+# Jumlah sub-bucket per pangkat 2 (32 -> error percentile maksimal ~3%)
+SUB_BUCKETS = 32
+
+
+class LogLinearHistogram:
+    """
+    Histogram log-linear yang mergeable.
+    Menyimpan count per bucket + count/sum/min/max yang exact.
+    """
+    
+    __slots__ = ('unit', 'buckets', 'count', 'total', 'min', 'max')
+    
+    def __init__(self, unit: float = 0.001):
+        """
+        Args:
+            unit: Resolusi terkecil (contoh: 0.001 ms untuk latency, 0.01 untuk confidence)
+        """
+        self.unit = unit
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    @staticmethod
+    def _bucket_index(units: int) -> int:
+        """Index bucket untuk nilai dalam satuan unit."""
+        if units < SUB_BUCKETS:
+            return units
+        shift = units.bit_length() - SUB_BUCKETS.bit_length()
+        return SUB_BUCKETS + shift * SUB_BUCKETS + ((units >> shift) - SUB_BUCKETS)
+    
+    @staticmethod
+    def _bucket_bounds(index: int):
+        """Batas bawah (inklusif) dan atas (eksklusif) bucket dalam satuan unit."""
+        if index < SUB_BUCKETS:
+            return index, index + 1
+        shift, offset = divmod(index - SUB_BUCKETS, SUB_BUCKETS)
+        mantissa = SUB_BUCKETS + offset
+        return mantissa << shift, (mantissa + 1) << shift
+    
+    def record(self, value: float, count: int = 1):
+        """
+        Catat satu nilai.
+        
+        Args:
+            value: Nilai (negatif dianggap 0)
+            count: Berapa kali nilai ini muncul
+        """
+        if value is None:
+            return
+        value = max(0.0, float(value))
+        index = self._bucket_index(int(value / self.unit))
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: 'LogLinearHistogram'):
+        """
+        Gabungkan histogram lain (unit harus sama) ke histogram ini.
+        
+        Args:
+            other: Histogram lain
+        """
+        if other.unit != self.unit:
+            raise ValueError(f"Unit histogram berbeda: {self.unit} vs {other.unit}")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+    
+    def percentile(self, p: float) -> float:
+        """
+        Nilai pada percentile p (0-100), diwakili titik tengah bucket
+        dan dibatasi oleh min/max yang exact.
+        
+        Args:
+            p: Percentile, contoh 50, 95, 99
+        
+        Returns:
+            Nilai percentile (0 jika histogram kosong)
+        """
+        if not self.count:
+            return 0.0
+        
+        # Rank 1-based dari nilai yang dicari
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = self._bucket_bounds(index)
+                value = (low + high) / 2 * self.unit
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def mean(self) -> float:
+        """Rata-rata exact (dari sum dan count)."""
+        return self.total / self.count if self.count else 0.0
@@ -728,19 +728,17 @@ HR_KNOWLEDGE_BASE = [
 
 # Fungsi untuk mendapatkan semua pertanyaan dan jawaban dalam format flat
 def get_flat_qa_pairs():
-    """Menghasilkan list of tuples (pertanyaan, jawaban, kategori)"""
-    pairs = []
-    for item in HR_KNOWLEDGE_BASE:
-        # Tambahkan pertanyaan utama
-        pairs.append((item["pertanyaan_utama"], item["jawaban"], item["kategori"]))
-        # Tambahkan semua variasi
-        for variasi in item["variasi"]:
-            pairs.append((variasi, item["jawaban"], item["kategori"]))
-    return pairs
+    """
+    Menghasilkan list of tuples (pertanyaan, jawaban, kategori).
+    Dibaca dari index KnowledgeBase aktif (dihitung sekali), list baru per panggilan.
+    """
+    from knowledge_base import get_knowledge_base
+    return list(get_knowledge_base().flat_pairs)
 
 # Fungsi untuk mendapatkan semua kategori unik
 def get_categories():
-    return list(set(item["kategori"] for item in HR_KNOWLEDGE_BASE))
+    from knowledge_base import get_knowledge_base
+    return list(get_knowledge_base().categories)
 
 if __name__ == "__main__":
     pairs = get_flat_qa_pairs()
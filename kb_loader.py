@@ -0,0 +1,288 @@
+"""
+HR Chatbot Knowledge Base Loader
+=================================
+Load knowledge base dari file sumber yang dikelola HR, dengan cache hasil kompilasi.
+
+Sumber yang didukung (schema entry sama dengan HR_KNOWLEDGE_BASE):
+- .xlsx : kolom Pertanyaan & Jawaban (wajib), Kategori & Variasi (opsional).
+          Baris dengan jawaban yang sama digabung menjadi satu entry
+          (pertanyaan pertama = pertanyaan utama, sisanya = variasi)
+- .csv  : kolom sama dengan .xlsx
+- .json : list entry, atau {"entries": [...]}
+- None  : HR_KNOWLEDGE_BASE built-in (hr_knowledge_base.py)
+
+Cache kompilasi (pickle) berisi KnowledgeBase lengkap: entry, flat QA pairs,
+pertanyaan yang sudah di-preprocess dan semua index-nya. Cache dipakai jika mtime+size sumber sama,
+atau jika isi file (sha256) sama walau mtime berubah, sehingga restart tidak
+perlu mem-parse workbook lagi.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from knowledge_base import KnowledgeBase
+from text_utils import normalize_text
+
+# Naikkan jika format cache atau normalisasi teks berubah (cache lama diabaikan)
+CACHE_FORMAT_VERSION = 2
+
+# Separator untuk kolom Variasi di xlsx/csv
+_VARIATION_SEPARATORS = ('\n', ';', '|')
+
+
+def _split_variations(value) -> List[str]:
+    """Pecah isi kolom Variasi menjadi list."""
+    if not value:
+        return []
+    text = str(value)
+    for separator in _VARIATION_SEPARATORS[1:]:
+        text = text.replace(separator, _VARIATION_SEPARATORS[0])
+    return [v.strip() for v in text.split(_VARIATION_SEPARATORS[0]) if v.strip()]
+
+
+def _find_column(header: List[str], *names: str) -> Optional[int]:
+    """Index kolom pertama yang namanya mengandung salah satu names."""
+    for index, column in enumerate(header):
+        if any(name in column for name in names):
+            return index
+    return None
+
+
+def _default_category(answer: str) -> str:
+    """
+    Kategori untuk baris tanpa kolom Kategori: kategori entry built-in dengan
+    jawaban yang sama, atau KB_DEFAULT_CATEGORY.
+    """
+    from hr_knowledge_base import HR_KNOWLEDGE_BASE
+
+    key = normalize_text(answer)
+    for item in HR_KNOWLEDGE_BASE:
+        if normalize_text(item['jawaban']) == key:
+            return item['kategori']
+    return config.KB_DEFAULT_CATEGORY
+
+
+def _rows_to_entries(header: List[str], rows) -> List[dict]:
+    """
+    Ubah baris tabel (xlsx/csv) menjadi entry knowledge base.
+
+    Args:
+        header: Nama kolom (lowercase)
+        rows: Iterable list nilai per baris
+    """
+    question_col = _find_column(header, 'pertanyaan', 'question')
+    answer_col = _find_column(header, 'jawaban', 'answer')
+    category_col = _find_column(header, 'kategori', 'category')
+    variation_col = _find_column(header, 'variasi', 'variation')
+    if question_col is None or answer_col is None:
+        raise ValueError(f"Kolom pertanyaan/jawaban tidak ditemukan: {header}")
+
+    def cell(row, col):
+        if col is None or col >= len(row) or row[col] is None:
+            return ''
+        return str(row[col]).strip()
+
+    # Entry dikelompokkan per jawaban, urutan mengikuti kemunculan pertama
+    entries: Dict[Tuple[str, str], dict] = {}
+    for row in rows:
+        question, answer = cell(row, question_col), cell(row, answer_col)
+        if not question or not answer:
+            continue
+
+        category = cell(row, category_col).lower() or _default_category(answer)
+        key = (category, normalize_text(answer))
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = {
+                'kategori': category,
+                'pertanyaan_utama': question,
+                'variasi': [],
+                'jawaban': answer,
+            }
+        else:
+            entry['variasi'].append(question)
+        entry['variasi'].extend(_split_variations(cell(row, variation_col)))
+
+    return list(entries.values())
+
+
+def _parse_xlsx(path: str) -> List[dict]:
+    """Parse workbook secara streaming (openpyxl read_only)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(c or '').strip().lower() for c in next(rows, ())]
+        return _rows_to_entries(header, rows)
+    finally:
+        workbook.close()
+
+
+def _parse_csv(path: str) -> List[dict]:
+    """Parse CSV (UTF-8, boleh dengan BOM)."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = [c.strip().lower() for c in next(reader, [])]
+        return _rows_to_entries(header, reader)
+
+
+def _parse_json(path: str) -> List[dict]:
+    """Parse JSON: list entry atau {"entries": [...]}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('entries', [])
+    if not isinstance(data, list):
+        raise ValueError("JSON knowledge base harus berupa list entry atau {'entries': [...]}")
+
+    entries = []
+    for item in data:
+        if not item.get('pertanyaan_utama') or not item.get('jawaban'):
+            continue
+        entries.append({
+            'kategori': item.get('kategori') or config.KB_DEFAULT_CATEGORY,
+            'pertanyaan_utama': item['pertanyaan_utama'],
+            'variasi': list(item.get('variasi', [])),
+            'jawaban': item['jawaban'],
+        })
+    return entries
+
+
+_PARSERS = {
+    '.xlsx': _parse_xlsx,
+    '.xlsm': _parse_xlsx,
+    '.csv': _parse_csv,
+    '.json': _parse_json,
+}
+
+
+def parse_source(path: str) -> List[dict]:
+    """
+    Parse file sumber menjadi list entry (tanpa cache).
+
+    Args:
+        path: Path .xlsx / .csv / .json
+    """
+    ext = os.path.splitext(path)[1].lower()
+    parser = _PARSERS.get(ext)
+    if parser is None:
+        raise ValueError(f"Format knowledge base tidak didukung: {ext}")
+    return parser(path)
+
+
+def _file_sha256(path: str) -> str:
+    """Hash isi file (dibaca per blok)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path_for(source: str) -> str:
+    """Path file cache untuk satu sumber (nama file + hash path absolut)."""
+    source = os.path.abspath(source)
+    path_hash = hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(config.KB_CACHE_DIR, f"{os.path.basename(source)}.{path_hash}.kbc")
+
+
+def _read_cache(cache_file: str) -> Optional[dict]:
+    """Baca file cache. None jika tidak ada, rusak, atau format lama."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ Error reading KB cache {cache_file}: {e}")
+        return None
+    if not isinstance(cached, dict) or cached.get('format') != CACHE_FORMAT_VERSION:
+        return None
+    return cached
+
+
+def _write_cache(cache_file: str, payload: dict):
+    """Tulis cache secara atomic (temp file + os.replace)."""
+    temp_file = f"{cache_file}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except (IOError, OSError) as e:
+        print(f"⚠️ Error writing KB cache {cache_file}: {e}")
+        if os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+
+def load_knowledge_base(source: str = None, use_cache: bool = True) -> KnowledgeBase:
+    """
+    Load knowledge base dari sumber, memakai cache kompilasi jika valid.
+
+    Args:
+        source: Path file sumber (None = config.KB_SOURCE; jika itu juga None,
+                pakai HR_KNOWLEDGE_BASE built-in)
+        use_cache: False = selalu parse ulang (cache tetap diperbarui)
+
+    Returns:
+        KnowledgeBase
+    """
+    source = source if source is not None else config.KB_SOURCE
+
+    if source is None:
+        from hr_knowledge_base import HR_KNOWLEDGE_BASE
+        return KnowledgeBase(HR_KNOWLEDGE_BASE)
+
+    stat = os.stat(source)
+    cache_file = cache_path_for(source)
+    cached = _read_cache(cache_file) if use_cache else None
+
+    # 1. mtime & size sama: pakai cache tanpa membaca sumber sama sekali
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached['knowledge_base']
+
+    # 2. mtime berubah tapi isi sama (file di-touch/di-copy): pakai cache, perbarui mtime
+    source_hash = _file_sha256(source)
+    if cached and cached['source_hash'] == source_hash:
+        cached.update({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size})
+        _write_cache(cache_file, cached)
+        return cached['knowledge_base']
+
+    # 3. Sumber berubah: parse + build index ulang
+    knowledge_base = KnowledgeBase(parse_source(source), source=source)
+    _write_cache(cache_file, {
+        'format': CACHE_FORMAT_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'source_hash': source_hash,
+        'knowledge_base': knowledge_base,
+    })
+    return knowledge_base
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load & compile knowledge base")
+    parser.add_argument('source', nargs='?', default=None, help="File .xlsx/.csv/.json (default: config)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse ulang walau cache valid")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    kb = load_knowledge_base(args.source, use_cache=not args.no_cache)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Source: {kb.source or 'HR_KNOWLEDGE_BASE (built-in)'}")
+    print(f"Entries: {len(kb)} | Pertanyaan (dengan variasi): {len(kb.flat_pairs)}")
+    print(f"Kategori: {list(kb.categories)}")
+    print(f"Content hash: {kb.content_hash[:16]}")
+    print(f"Load: {load_ms:.2f} ms")
@@ -0,0 +1,183 @@
+"""
+HR Chatbot Knowledge Base Watcher
+==================================
+Hot reload knowledge base tanpa restart aplikasi.
+
+Cara kerja:
+1. Background thread mengecek mtime & size file sumber setiap
+   KB_WATCH_INTERVAL_SECONDS (config.KB_SOURCE, atau hr_knowledge_base.py
+   jika memakai knowledge base built-in)
+2. Jika berubah, versi baru di-load (kb_loader, memakai cache kompilasi)
+3. diff_knowledge_bases menghitung entry yang ditambah/dihapus/diubah
+4. Matcher di-patch secara incremental (HRFuzzyMatcher.patched, hanya baris yang
+   berubah yang di-preprocess) lalu di-swap secara atomic ke engine;
+   request yang sedang berjalan tidak pernah di-pause
+5. Jika file gagal di-parse (mis. masih ditulis), versi lama tetap dipakai
+   dan reload dicoba lagi di interval berikutnya
+"""
+
+import importlib
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from config import config
+from knowledge_base import KnowledgeBase, diff_knowledge_bases, get_knowledge_base, set_knowledge_base
+from metrics_exporter import KB_RELOAD_DURATION, KB_RELOADS
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) file, None jika file tidak ada."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class KnowledgeBaseWatcher:
+    """
+    Pantau file sumber knowledge base dan terapkan perubahannya ke engine.
+    """
+
+    def __init__(self, engine=None, source: str = None, interval: float = None):
+        """
+        Args:
+            engine: HRChatbotEngine yang di-update (None = get_chatbot_engine())
+            source: File sumber (None = config.KB_SOURCE; jika itu juga None,
+                    hr_knowledge_base.py)
+            interval: Interval polling dalam detik (None = dari config)
+        """
+        if engine is None:
+            from fuzzy_matcher import get_chatbot_engine
+            engine = get_chatbot_engine()
+
+        self.engine = engine
+        self.source = source if source is not None else config.KB_SOURCE
+        self.interval = interval or config.KB_WATCH_INTERVAL_SECONDS
+
+        if self.source is None:
+            import hr_knowledge_base
+            self.path = hr_knowledge_base.__file__
+        else:
+            self.path = self.source
+
+        self._applied_signature = _signature(self.path)
+        self._failed_signature = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.reloads = 0
+        self.last_diff = None
+
+    def _load(self) -> KnowledgeBase:
+        """Load versi terbaru dari file sumber."""
+        if self.source is None:
+            import hr_knowledge_base
+            module = importlib.reload(hr_knowledge_base)
+            return KnowledgeBase(module.HR_KNOWLEDGE_BASE)
+
+        from kb_loader import load_knowledge_base
+        return load_knowledge_base(self.source)
+
+    def check(self) -> Optional[dict]:
+        """
+        Reload jika file sumber berubah sejak reload terakhir.
+
+        Returns:
+            Diff yang diterapkan, atau None jika tidak ada perubahan
+        """
+        signature = _signature(self.path)
+        if signature is None or signature == self._applied_signature:
+            return None
+        return self.reload(signature)
+
+    def reload(self, signature: Tuple[int, int] = None) -> Optional[dict]:
+        """
+        Load versi baru, hitung diff dan patch matcher engine.
+
+        Args:
+            signature: Signature file yang di-load (None = baca sekarang)
+
+        Returns:
+            Diff yang diterapkan, atau None jika isi knowledge base sama / gagal
+        """
+        with self._reload_lock:
+            signature = signature or _signature(self.path)
+            start = time.perf_counter()
+
+            try:
+                new_kb = self._load()
+            except Exception as e:
+                # Error hanya di-print sekali per versi file
+                if signature != self._failed_signature:
+                    print(f"❌ Error reloading knowledge base {self.path}: {e}")
+                    KB_RELOADS.inc(labels=('error',))
+                self._failed_signature = signature
+                return None
+
+            self._applied_signature = signature
+            self._failed_signature = None
+            old_kb = get_knowledge_base()
+
+            if new_kb.content_hash == old_kb.content_hash:
+                KB_RELOADS.inc(labels=('unchanged',))
+                return None
+
+            diff = diff_knowledge_bases(old_kb, new_kb)
+            self.engine.apply_diff(diff['removed_pairs'], diff['added_pairs'])
+            set_knowledge_base(new_kb)
+
+            elapsed = time.perf_counter() - start
+            KB_RELOADS.inc(labels=('applied',))
+            KB_RELOAD_DURATION.observe(elapsed)
+            self.reloads += 1
+            self.last_diff = diff
+
+            print(f"✅ Knowledge base reloaded in {elapsed * 1000:.1f} ms: "
+                  f"+{len(diff['added'])} / -{len(diff['removed'])} / ~{len(diff['changed'])} entry "
+                  f"({len(diff['added_pairs'])} pertanyaan baru, {len(diff['removed_pairs'])} dibuang)")
+            return diff
+
+    def _run(self):
+        """Loop polling di background thread."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"❌ Error in knowledge base watcher: {e}")
+
+    def start(self):
+        """Mulai polling di background thread (daemon)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="hr-kb-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Hentikan polling."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+
+_watcher: Optional[KnowledgeBaseWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def start_kb_watcher() -> KnowledgeBaseWatcher:
+    """
+    Start watcher untuk engine bersama (idempotent per proses).
+    Aman dipanggil di setiap rerun Streamlit.
+
+    Returns:
+        KnowledgeBaseWatcher yang berjalan
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = KnowledgeBaseWatcher()
+            _watcher.start()
+        return _watcher
@@ -0,0 +1,283 @@
+"""
+HR Chatbot Knowledge Base
+==========================
+Objek knowledge base immutable dengan index yang dihitung sekali saat dibuat.
+
+Sebelumnya setiap consumer menurunkan ulang datanya sendiri dari
+HR_KNOWLEDGE_BASE (flat QA pairs, set kategori, scan linear di FAQ page).
+KnowledgeBase menyimpan hasilnya sekali:
+- entries                : tuple entry read-only (masing-masing punya 'id' stabil)
+- by_id                  : id -> entry
+- by_category            : kategori -> tuple entry
+- by_normalized_question : pertanyaan (normalize_text) -> id entry
+- flat_pairs             : tuple (pertanyaan, jawaban, kategori), format matcher
+- flat_entry_ids         : id entry untuk setiap flat pair (urutan sama)
+- questions              : flat pairs yang sudah di-normalize (urutan sama)
+- categories             : kategori unik, terurut
+- content_hash           : sha256 isi entry (berubah jika ada FAQ yang berubah)
+"""
+
+import hashlib
+import json
+from collections import Counter
+from types import MappingProxyType
+from typing import Iterator, List, Mapping, Optional, Tuple
+
+from text_utils import normalize_text
+
+
+def make_entry_id(item: dict) -> str:
+    """
+    Id stabil untuk satu entry: 'id' eksplisit jika ada, selain itu
+    kategori + hash pertanyaan utama (tidak berubah walau urutan entry berubah).
+
+    Args:
+        item: Entry knowledge base
+
+    Returns:
+        Entry id, mis. 'cuti-3f2a9c1b'
+    """
+    if item.get('id'):
+        return str(item['id'])
+    digest = hashlib.sha1(normalize_text(item['pertanyaan_utama']).encode('utf-8')).hexdigest()
+    return f"{item['kategori']}-{digest[:8]}"
+
+
+class KnowledgeBase:
+    """
+    Knowledge base immutable. Semua index dibangun di __init__,
+    atribut tidak bisa diubah setelahnya (buat instance baru untuk versi baru).
+    """
+
+    __slots__ = ('entries', 'by_id', 'by_category', 'by_normalized_question',
+                 'flat_pairs', 'flat_entry_ids', 'questions', 'categories',
+                 'content_hash', 'source')
+
+    def __init__(self, entries: List[dict], source: Optional[str] = None,
+                 questions: Optional[List[str]] = None):
+        """
+        Build knowledge base dan semua index-nya.
+
+        Args:
+            entries: List entry dengan schema HR_KNOWLEDGE_BASE
+                (kategori, pertanyaan_utama, variasi, jawaban, opsional id)
+            source: Asal data (path file, None = built-in)
+            questions: Flat pertanyaan yang sudah di-normalize (opsional, dari cache)
+        """
+        frozen = []
+        seen_ids = set()
+        for item in entries:
+            entry_id = make_entry_id(item)
+            # Pertanyaan utama sama di kategori yang sama: beri suffix agar id tetap unik
+            base_id, suffix = entry_id, 2
+            while entry_id in seen_ids:
+                entry_id = f"{base_id}-{suffix}"
+                suffix += 1
+            seen_ids.add(entry_id)
+
+            frozen.append(MappingProxyType({
+                'id': entry_id,
+                'kategori': item['kategori'],
+                'pertanyaan_utama': item['pertanyaan_utama'],
+                'variasi': tuple(item.get('variasi', ())),
+                'jawaban': item['jawaban'],
+            }))
+
+        flat_pairs, flat_entry_ids = [], []
+        for entry in frozen:
+            for question in (entry['pertanyaan_utama'],) + entry['variasi']:
+                flat_pairs.append((question, entry['jawaban'], entry['kategori']))
+                flat_entry_ids.append(entry['id'])
+
+        if questions is None or len(questions) != len(flat_pairs):
+            questions = [normalize_text(q) for q, _, _ in flat_pairs]
+
+        by_normalized_question = {}
+        for question, entry_id in zip(questions, flat_entry_ids):
+            by_normalized_question.setdefault(question, entry_id)
+
+        self._freeze(frozen, flat_pairs, flat_entry_ids, questions, by_normalized_question, source)
+
+    def _freeze(self, entries, flat_pairs, flat_entry_ids, questions, by_normalized_question,
+                source, content_hash=None):
+        """Set semua atribut (satu-satunya tempat atribut ditulis)."""
+        by_category = {}
+        for entry in entries:
+            by_category.setdefault(entry['kategori'], []).append(entry)
+
+        if content_hash is None:
+            hasher = hashlib.sha256()
+            for entry in entries:
+                hasher.update(json.dumps(dict(entry), ensure_ascii=False, sort_keys=True).encode('utf-8'))
+                hasher.update(b'\n')
+            content_hash = hasher.hexdigest()
+
+        values = {
+            'entries': tuple(entries),
+            'by_id': MappingProxyType({entry['id']: entry for entry in entries}),
+            'by_category': MappingProxyType({k: tuple(v) for k, v in by_category.items()}),
+            'by_normalized_question': MappingProxyType(by_normalized_question),
+            'flat_pairs': tuple(flat_pairs),
+            'flat_entry_ids': tuple(flat_entry_ids),
+            'questions': tuple(questions),
+            'categories': tuple(sorted(by_category)),
+            'content_hash': content_hash,
+            'source': source,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KnowledgeBase immutable, buat instance baru untuk versi baru")
+
+    def __delattr__(self, name):
+        raise AttributeError("KnowledgeBase immutable, buat instance baru untuk versi baru")
+
+    def __reduce__(self):
+        # Pickle menyimpan hasil index (dipakai cache kb_loader), bukan entry mentah saja
+        state = {
+            'entries': [dict(entry) for entry in self.entries],
+            'flat_pairs': self.flat_pairs,
+            'flat_entry_ids': self.flat_entry_ids,
+            'questions': self.questions,
+            'by_normalized_question': dict(self.by_normalized_question),
+            'source': self.source,
+            'content_hash': self.content_hash,
+        }
+        return (_restore_knowledge_base, (state,))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Mapping]:
+        return iter(self.entries)
+
+    def __repr__(self) -> str:
+        return (f"KnowledgeBase({len(self.entries)} entries, {len(self.flat_pairs)} questions, "
+                f"hash={self.content_hash[:12]})")
+
+    def get(self, entry_id: str) -> Optional[Mapping]:
+        """Entry berdasarkan id (None jika tidak ada)."""
+        return self.by_id.get(entry_id)
+
+    def entries_in(self, category: str) -> Tuple[Mapping, ...]:
+        """Entry di satu kategori (tuple kosong jika kategori tidak ada)."""
+        return self.by_category.get(category, ())
+
+    def find_by_question(self, question: str) -> Optional[Mapping]:
+        """Entry yang pertanyaan utama/variasinya sama persis (setelah normalize_text)."""
+        entry_id = self.by_normalized_question.get(normalize_text(question))
+        return self.by_id[entry_id] if entry_id is not None else None
+
+    def to_entries(self) -> List[dict]:
+        """Salinan entry sebagai dict biasa (mis. untuk disimpan ke JSON)."""
+        return [dict(entry, variasi=list(entry['variasi'])) for entry in self.entries]
+
+
+def _restore_knowledge_base(state: dict) -> KnowledgeBase:
+    """Bangun ulang KnowledgeBase dari pickle tanpa normalize/index ulang pertanyaan."""
+    kb = object.__new__(KnowledgeBase)
+    entries = [MappingProxyType(dict(entry, variasi=tuple(entry['variasi']))) for entry in state['entries']]
+    kb._freeze(entries, state['flat_pairs'], state['flat_entry_ids'], state['questions'],
+               state['by_normalized_question'], state['source'], state['content_hash'])
+    return kb
+
+
+def _questions_of(entry: Mapping) -> List[str]:
+    """Pertanyaan utama + variasi satu entry."""
+    return [entry['pertanyaan_utama']] + list(entry['variasi'])
+
+
+def _multiset_minus(items: List[str], other: List[str]) -> List[str]:
+    """items dikurangi other (per kemunculan, urutan items dipertahankan)."""
+    remaining = Counter(other)
+    result = []
+    for item in items:
+        if remaining[item] > 0:
+            remaining[item] -= 1
+        else:
+            result.append(item)
+    return result
+
+
+def diff_knowledge_bases(old: KnowledgeBase, new: KnowledgeBase) -> dict:
+    """
+    Diff level entry antara dua versi knowledge base (dicocokkan lewat entry id).
+
+    Returns:
+        Dict dengan keys:
+        - added: id entry baru
+        - removed: id entry yang dihapus
+        - changed: id -> {questions_added, questions_removed, answer_changed, category_changed}
+        - unchanged: jumlah entry yang sama persis
+        - removed_pairs / added_pairs: flat pair (pertanyaan, jawaban, kategori)
+          yang harus dibuang / ditambahkan di index matcher
+    """
+    diff = {'added': [], 'removed': [], 'changed': {}, 'unchanged': 0,
+            'removed_pairs': [], 'added_pairs': []}
+
+    for entry in old.entries:
+        if entry['id'] not in new.by_id:
+            diff['removed'].append(entry['id'])
+            diff['removed_pairs'].extend(
+                (q, entry['jawaban'], entry['kategori']) for q in _questions_of(entry))
+
+    for entry in new.entries:
+        previous = old.by_id.get(entry['id'])
+        if previous is None:
+            diff['added'].append(entry['id'])
+            diff['added_pairs'].extend(
+                (q, entry['jawaban'], entry['kategori']) for q in _questions_of(entry))
+            continue
+
+        old_questions, new_questions = _questions_of(previous), _questions_of(entry)
+        answer_changed = previous['jawaban'] != entry['jawaban']
+        category_changed = previous['kategori'] != entry['kategori']
+        if not answer_changed and not category_changed and old_questions == new_questions:
+            diff['unchanged'] += 1
+            continue
+
+        if answer_changed or category_changed:
+            # Semua baris entry ini membawa jawaban/kategori lama: ganti semuanya
+            removed_questions, added_questions = old_questions, new_questions
+        else:
+            removed_questions = _multiset_minus(old_questions, new_questions)
+            added_questions = _multiset_minus(new_questions, old_questions)
+
+        diff['changed'][entry['id']] = {
+            'questions_added': _multiset_minus(new_questions, old_questions),
+            'questions_removed': _multiset_minus(old_questions, new_questions),
+            'answer_changed': answer_changed,
+            'category_changed': category_changed,
+        }
+        diff['removed_pairs'].extend(
+            (q, previous['jawaban'], previous['kategori']) for q in removed_questions)
+        diff['added_pairs'].extend(
+            (q, entry['jawaban'], entry['kategori']) for q in added_questions)
+
+    return diff
+
+
+# Singleton instance
+_knowledge_base_instance = None
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """
+    Knowledge base aktif (dari config.KB_SOURCE, lihat kb_loader).
+    Menggunakan singleton pattern agar index hanya dibangun sekali per proses.
+
+    Returns:
+        KnowledgeBase instance
+    """
+    global _knowledge_base_instance
+    if _knowledge_base_instance is None:
+        from kb_loader import load_knowledge_base
+        _knowledge_base_instance = load_knowledge_base()
+    return _knowledge_base_instance
+
+
+def set_knowledge_base(knowledge_base: KnowledgeBase):
+    """Ganti knowledge base aktif (dipakai hot reload, lihat kb_watcher)."""
+    global _knowledge_base_instance
+    _knowledge_base_instance = knowledge_base
@@ -0,0 +1,150 @@
+"""
+HR Chatbot Language Detection
+==============================
+Deteksi bahasa murah (Indonesia / Inggris) untuk routing kandidat matcher.
+
+Knowledge base mencampur frasa Indonesia dan Inggris ("annual leave berapa hari",
+"maternity leave", "work from home"). Detector ini tidak memakai model: per token
+dihitung bukti dari
+- stopword / kata umum masing-masing bahasa (bobot penuh)
+- statistik karakter: bigram & akhiran khas ('ny', 'ng', '-kan', '-nya' vs
+  'th', 'sh', 'w', '-ing', '-tion'), bobot kecil
+
+Hasil:
+- 'id' / 'en' : bukti salah satu bahasa jelas lebih besar
+- 'mix'       : campuran, atau tidak ada bukti yang cukup (tidak di-route)
+"""
+
+import re
+from array import array
+from typing import Dict, Sequence, Tuple
+
+LANG_ID = 'id'
+LANG_EN = 'en'
+LANG_MIX = 'mix'
+
+# Urutan kode label (lihat label_questions)
+LANGUAGES = (LANG_MIX, LANG_ID, LANG_EN)
+
+# Kata serapan yang lazim di kalimat Indonesia (benefit, claim, bonus, reimburse, meeting)
+# sengaja tidak dimasukkan ke daftar Inggris
+_STOPWORDS = {
+    LANG_ID: frozenset("""
+        apa apakah siapa kapan dimana mana bagaimana berapa kenapa mengapa gimana bisa boleh
+        dapat dapet harus perlu mau ingin sudah belum sedang akan masih pernah tidak gak nggak
+        enggak tak bukan ada adalah ialah yang dan atau dengan untuk bagi dari ke di pada dalam
+        oleh karena jika kalau agar supaya saat ketika setelah sebelum selama sampai hingga
+        saya aku kita kami anda kamu dia mereka ini itu tersebut juga saja lagi sih dong kah
+        cara hari bulan tahun minggu jam kantor karyawan gaji cuti libur lembur izin
+        ijin sakit hamil melahirkan nikah tunjangan jatah klaim biaya lama baru kerja
+    """.split()),
+    LANG_EN: frozenset("""
+        what which who whom whose when where why how is are was were be been being am do does
+        did have has had can could should would will shall may might must not no yes the an
+        and or but of to in on at for from by with about as into than then if so my your our
+        their his her its you we they he she it this that these those there here get much many
+        leave annual sick maternity paternity salary pay payroll overtime allowance work
+        home office day days month year week policy employee insurance
+    """.split()),
+}
+
+# Bigram / akhiran kata yang khas (bukti lemah, hanya untuk kata di luar daftar)
+_CHAR_HINTS = {
+    LANG_ID: (re.compile('ny|ng|kh|uan|aan|ai'), ('kan', 'nya', 'lah', 'an', 'kah', 'i', 'a', 'u')),
+    LANG_EN: (re.compile('th|sh|ph|w|ee|oo|ea|ck|q|x'), ('ing', 'tion', 'ed', 'ly', 'ment', 'ness', 'ce')),
+}
+
+# Bobot bukti karakter relatif terhadap satu stopword
+_CHAR_WEIGHT = 0.5
+
+# Selisih bukti minimal (relatif terhadap total) agar tidak dianggap campuran
+_MIN_MARGIN = 0.5
+
+# Bukti minimal bahasa dominan (= satu stopword); di bawah ini dianggap tidak yakin
+_MIN_EVIDENCE = 0.5
+
+
+def language_scores(text: str) -> Dict[str, float]:
+    """
+    Bukti per bahasa untuk text yang sudah di-normalize (lihat text_utils.normalize_text).
+
+    Args:
+        text: Text lowercase tanpa tanda baca
+
+    Returns:
+        Dict {'id': score, 'en': score}
+    """
+    scores = {LANG_ID: 0.0, LANG_EN: 0.0}
+    for token in text.split():
+        # Angka dan huruf tunggal (sering sisa typo) tidak memberi bukti
+        if len(token) < 2 or token.isdigit():
+            continue
+        in_id = token in _STOPWORDS[LANG_ID]
+        in_en = token in _STOPWORDS[LANG_EN]
+        if in_id or in_en:
+            # Kata yang ada di kedua daftar tidak memberi bukti
+            if in_id != in_en:
+                scores[LANG_ID if in_id else LANG_EN] += 1.0
+            continue
+        for lang, (bigrams, suffixes) in _CHAR_HINTS.items():
+            if bigrams.search(token):
+                scores[lang] += _CHAR_WEIGHT
+            if token.endswith(suffixes):
+                scores[lang] += _CHAR_WEIGHT
+    return scores
+
+
+def detect_language(text: str) -> str:
+    """
+    Bahasa dominan text yang sudah di-normalize.
+
+    Args:
+        text: Text lowercase tanpa tanda baca
+
+    Returns:
+        'id', 'en', atau 'mix' (campuran / tidak yakin)
+    """
+    scores = language_scores(text)
+    id_score, en_score = scores[LANG_ID], scores[LANG_EN]
+    total = id_score + en_score
+    if max(id_score, en_score) < _MIN_EVIDENCE or abs(id_score - en_score) < _MIN_MARGIN * total:
+        return LANG_MIX
+    return LANG_ID if id_score > en_score else LANG_EN
+
+
+def label_questions(questions: Sequence[str]) -> array:
+    """
+    Label bahasa setiap pertanyaan sebagai kode kecil (index di LANGUAGES).
+
+    Args:
+        questions: Pertanyaan yang sudah di-preprocess
+
+    Returns:
+        array uint8, satu kode per pertanyaan
+    """
+    return array('B', (LANGUAGES.index(detect_language(question)) for question in questions))
+
+
+def partition_by_language(labels: Sequence[int]) -> Dict[str, Tuple[array, array]]:
+    """
+    Partisi index pertanyaan per bahasa untuk routing kandidat.
+
+    Pertanyaan campuran ('mix') masuk ke partisi utama kedua bahasa, sehingga
+    partisi utama + sekunder satu bahasa selalu mencakup semua pertanyaan.
+
+    Args:
+        labels: Hasil label_questions
+
+    Returns:
+        Dict bahasa -> (primary, secondary), masing-masing array index uint32 terurut:
+        primary = pertanyaan bahasa itu + campuran, secondary = pertanyaan bahasa lain
+    """
+    mix_code = LANGUAGES.index(LANG_MIX)
+    partitions = {}
+    for lang in (LANG_ID, LANG_EN):
+        code = LANGUAGES.index(lang)
+        primary, secondary = array('I'), array('I')
+        for idx, label in enumerate(labels):
+            (primary if label == code or label == mix_code else secondary).append(idx)
+        partitions[lang] = (primary, secondary)
+    return partitions
@@ -0,0 +1,352 @@
+"""
+HR Chatbot Matcher Oracle
+==========================
+Verifikasi bahwa matcher yang dioptimasi memberikan jawaban yang sama dengan
+implementasi brute-force referensi.
+
+Cara kerja:
+1. ReferenceMatcher adalah salinan beku algoritma matching asli: setiap query
+   di-score terhadap SEMUA pertanyaan knowledge base, tanpa index atau filter kandidat
+2. MatcherOracle membandingkan response engine aktif dengan hasil referensi:
+   - fallback vs tidak fallback
+   - jawaban dan kategori
+   - confidence (selisih > ORACLE_TOLERANCE)
+   - suggestion (untuk fallback)
+3. Setiap perbedaan ditulis sebagai satu baris JSON ke ORACLE_REPORT_FILE
+
+Dua mode:
+- Live: jika ORACLE_ENABLED, sebagian request (ORACLE_SAMPLE_RATE) diverifikasi
+  oleh background thread, sehingga latency chat tidak bertambah
+- Corpus: python matcher_oracle.py --queries 2000 (exit 1 jika ada perbedaan)
+
+JANGAN mengoptimasi ReferenceMatcher: nilainya justru karena ia lambat dan sederhana.
+"""
+
+import json
+import queue
+import random
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fuzzywuzzy import fuzz
+
+from config import config
+from query_samples import OFF_TOPIC_QUERIES, add_typo
+from text_utils import normalize_text
+
+
+class ReferenceMatcher:
+    """
+    Implementasi referensi (brute-force) dari HRFuzzyMatcher.find_best_match
+    dan find_top_matches.
+    """
+
+    def __init__(self, qa_pairs: List[Tuple[str, str, str]], threshold: int = None):
+        """
+        Args:
+            qa_pairs: List of (pertanyaan, jawaban, kategori)
+            threshold: Minimum score untuk match (None = dari config)
+        """
+        self.qa_pairs = list(qa_pairs)
+        self.threshold = threshold or config.FUZZY_THRESHOLD
+        self.questions = [normalize_text(q) for q, _, _ in self.qa_pairs]
+
+    def score_all(self, query: str) -> List[float]:
+        """Weighted score query terhadap setiap pertanyaan (urutan knowledge base)."""
+        processed = normalize_text(query) if isinstance(query, str) else ""
+        if not processed:
+            return []
+
+        weights = config.FUZZY_WEIGHTS
+        scored = []
+        for question in self.questions:
+            scores = {
+                'simple': fuzz.ratio(processed, question),
+                'partial': fuzz.partial_ratio(processed, question),
+                'token_sort': fuzz.token_sort_ratio(processed, question),
+                'token_set': fuzz.token_set_ratio(processed, question),
+            }
+            scored.append(sum(scores[k] * weights[k] for k in weights))
+        return scored
+
+    def evaluate(self, query: str, top_n: int = None) -> dict:
+        """
+        Hasil referensi untuk satu query.
+
+        Returns:
+            Dict: answer, category, confidence, is_fallback, suggestions (pertanyaan top-N)
+        """
+        top_n = top_n or config.MAX_SUGGESTIONS
+        scored = self.score_all(query)
+
+        # Index pertama dengan score tertinggi
+        best_idx, best_score = -1, 0
+        for idx, score in enumerate(scored):
+            if score > best_score:
+                best_idx, best_score = idx, score
+
+        if best_idx >= 0 and best_score >= self.threshold:
+            _, answer, category = self.qa_pairs[best_idx]
+            return {'answer': answer, 'category': category, 'confidence': best_score,
+                    'is_fallback': False, 'suggestions': []}
+
+        ranked = sorted(range(len(scored)), key=lambda i: scored[i], reverse=True)[:top_n]
+        suggestions = [
+            self.qa_pairs[i][0] for i in ranked
+            if scored[i] >= config.SUGGESTION_MIN_SCORE
+        ]
+        return {'answer': None, 'category': None, 'confidence': best_score,
+                'is_fallback': True, 'suggestions': suggestions}
+
+
+def compare(reference: dict, response: dict, tolerance: float) -> List[str]:
+    """
+    Bandingkan response engine dengan hasil referensi.
+
+    Args:
+        reference: Hasil ReferenceMatcher.evaluate
+        response: Response HRChatbotEngine.get_response
+        tolerance: Selisih confidence maksimal yang masih dianggap sama
+
+    Returns:
+        List jenis perbedaan: 'fallback', 'answer', 'category', 'score', 'suggestions'
+    """
+    diffs = []
+    if bool(response.get('is_fallback')) != reference['is_fallback']:
+        diffs.append('fallback')
+    elif not reference['is_fallback']:
+        if response.get('answer') != reference['answer']:
+            diffs.append('answer')
+        if response.get('category') != reference['category']:
+            diffs.append('category')
+    else:
+        active = [s['question'] for s in response.get('suggestions', [])]
+        if active != reference['suggestions']:
+            diffs.append('suggestions')
+
+    if abs((response.get('confidence') or 0) - reference['confidence']) > tolerance:
+        diffs.append('score')
+    return diffs
+
+
+class MatcherOracle:
+    """
+    Membandingkan response engine aktif dengan ReferenceMatcher dan
+    mencatat perbedaan ke file laporan (JSON Lines).
+    """
+
+    def __init__(self, qa_pairs: List[Tuple[str, str, str]], threshold: int = None,
+                 report_file: str = None, tolerance: float = None):
+        """
+        Args:
+            qa_pairs: Knowledge base yang sama dengan engine aktif
+            threshold: Threshold engine aktif (None = dari config)
+            report_file: File laporan perbedaan (None = dari config)
+            tolerance: Toleransi selisih confidence (None = dari config)
+        """
+        self.reference = ReferenceMatcher(qa_pairs, threshold)
+        self.report_file = report_file or config.ORACLE_REPORT_FILE
+        self.tolerance = config.ORACLE_TOLERANCE if tolerance is None else tolerance
+
+        self._lock = threading.Lock()
+        self.stats = {'checked': 0, 'diverged': 0, 'dropped': 0}
+        self.diff_counts: Dict[str, int] = {}
+
+        # Queue untuk mode live (diproses background thread)
+        self._queue = queue.Queue(maxsize=config.ORACLE_QUEUE_MAXSIZE)
+        self._worker = None
+
+    def check(self, query: str, response: dict) -> Optional[dict]:
+        """
+        Verifikasi satu response secara sinkron.
+
+        Args:
+            query: Input user
+            response: Response engine aktif untuk query tersebut
+
+        Returns:
+            Record divergence jika berbeda, None jika sama
+        """
+        reference = self.reference.evaluate(query)
+        diffs = compare(reference, response, self.tolerance)
+
+        with self._lock:
+            self.stats['checked'] += 1
+            if not diffs:
+                return None
+            self.stats['diverged'] += 1
+            for diff in diffs:
+                self.diff_counts[diff] = self.diff_counts.get(diff, 0) + 1
+
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'query': query,
+            'diffs': diffs,
+            'path': response.get('path'),
+            'active': {
+                'answer': response.get('answer') if not response.get('is_fallback') else None,
+                'category': response.get('category'),
+                'confidence': response.get('confidence'),
+                'is_fallback': response.get('is_fallback'),
+                'suggestions': [s['question'] for s in response.get('suggestions', [])],
+            },
+            'reference': reference,
+        }
+        self._write(record)
+        return record
+
+    def _write(self, record: dict):
+        """Append satu baris laporan."""
+        if not self.report_file:
+            return
+        try:
+            with self._lock, open(self.report_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except (IOError, OSError) as e:
+            print(f"❌ Error writing oracle report: {e}")
+
+    def submit(self, query: str, response: dict):
+        """
+        Verifikasi asynchronous (mode live). Jika queue penuh, sample dibuang.
+
+        Args:
+            query: Input user
+            response: Response engine aktif (di-copy, aman dimodifikasi pemanggil)
+        """
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._worker_loop, name="hr-matcher-oracle", daemon=True
+                    )
+                    self._worker.start()
+
+        snapshot = {
+            'answer': response.get('answer'),
+            'category': response.get('category'),
+            'confidence': response.get('confidence'),
+            'is_fallback': response.get('is_fallback'),
+            'suggestions': list(response.get('suggestions', [])),
+            'path': response.get('path'),
+        }
+        try:
+            self._queue.put_nowait((query, snapshot))
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+
+    def _worker_loop(self):
+        """Background thread: verifikasi sample dari queue."""
+        while True:
+            query, response = self._queue.get()
+            try:
+                record = self.check(query, response)
+                if record is not None:
+                    print(f"⚠️ Matcher oracle divergence ({', '.join(record['diffs'])}): {query!r}")
+            except Exception as e:
+                print(f"❌ Error in matcher oracle: {e}")
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """Tunggu semua sample di queue selesai diverifikasi."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def summary(self) -> dict:
+        """Ringkasan: checked, diverged, dropped, divergence_rate, diffs per jenis."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['diffs'] = dict(self.diff_counts)
+        stats['divergence_rate'] = round(stats['diverged'] / stats['checked'], 4) if stats['checked'] else 0.0
+        return stats
+
+
+# ============================================================================
+# MODE CORPUS: verifikasi engine aktif atas corpus query yang di-generate
+# ============================================================================
+
+def _perturb(text: str, rng: random.Random) -> str:
+    """Satu perturbasi acak: typo karakter (lihat query_samples), hapus kata, atau tukar urutan kata."""
+    words = text.lower().split()
+    op = rng.choice(('typo', 'drop', 'swap'))
+    if op == 'drop' and len(words) > 2:
+        del words[rng.randrange(len(words))]
+    elif op == 'swap' and len(words) > 1:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    else:
+        return add_typo(' '.join(words), rng)
+    return ' '.join(words)
+
+
+def generate_corpus(qa_pairs: List[Tuple[str, str, str]], count: int, seed: int = 42) -> List[str]:
+    """
+    Corpus query campuran: pertanyaan asli, variasi perturbasi, gabungan kata acak
+    dari knowledge base, dan query di luar topik.
+    """
+    rng = random.Random(seed)
+    questions = [q for q, _, _ in qa_pairs]
+    vocabulary = sorted({w for q in questions for w in normalize_text(q).split()})
+
+    corpus = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.25:
+            corpus.append(rng.choice(questions))
+        elif kind < 0.65:
+            query = rng.choice(questions)
+            for _ in range(rng.randint(1, 3)):
+                query = _perturb(query, rng)
+            corpus.append(query)
+        elif kind < 0.9:
+            corpus.append(' '.join(rng.sample(vocabulary, rng.randint(1, 5))))
+        else:
+            corpus.append(rng.choice(OFF_TOPIC_QUERIES))
+    return corpus
+
+
+def run_corpus(engine, queries: List[str], report_file: str = None, tolerance: float = None) -> dict:
+    """
+    Verifikasi engine aktif atas seluruh corpus (sinkron).
+
+    Args:
+        engine: HRChatbotEngine aktif
+        queries: Corpus query
+        report_file: File laporan perbedaan
+        tolerance: Toleransi selisih confidence
+
+    Returns:
+        Ringkasan MatcherOracle.summary
+    """
+    oracle = MatcherOracle(engine.matcher.qa_pairs, engine.matcher.threshold, report_file, tolerance)
+    for query in queries:
+        oracle.check(query, engine.get_response(query))
+    return oracle.summary()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from fuzzy_matcher import HRChatbotEngine
+    from hr_knowledge_base import get_flat_qa_pairs
+
+    parser = argparse.ArgumentParser(description="Verifikasi matcher aktif terhadap implementasi referensi")
+    parser.add_argument('--queries', type=int, default=1000, help="Jumlah query corpus")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--tolerance', type=float, default=None)
+    parser.add_argument('--report', type=str, default=None, help="File laporan (default: ORACLE_REPORT_FILE)")
+    args = parser.parse_args()
+
+    pairs = get_flat_qa_pairs()
+    corpus = generate_corpus(pairs, args.queries, args.seed)
+    summary = run_corpus(HRChatbotEngine(pairs), corpus, args.report, args.tolerance)
+
+    print(f"Checked: {summary['checked']} | Diverged: {summary['diverged']} "
+          f"({summary['divergence_rate']:.2%}) | Diffs: {summary['diffs']}")
+    if summary['diverged']:
+        print(f"❌ Ada perbedaan, lihat {args.report or config.ORACLE_REPORT_FILE}")
+    else:
+        print("✅ Engine aktif identik dengan referensi")
+    raise SystemExit(1 if summary['diverged'] else 0)
@@ -0,0 +1,145 @@
+"""
+HR Chatbot Shared-Memory Matcher Index
+=======================================
+Index matcher di satu segment multiprocessing.shared_memory yang dipakai
+bersama semua proses worker di satu host.
+
+Format segment sama dengan file snapshot (matcher_snapshot.py), jadi view
+yang sama (PackedStrings, ExactIndexView, ...) dipakai di atas mapping segment:
+- Proses pertama membuat segment dan menyalin snapshot ke dalamnya
+- Proses berikutnya hanya attach (read-only view), tanpa build / preprocess /
+  salinan list sendiri, sehingga RSS private untuk data KB hampir nol
+- Nama segment mengandung content_hash knowledge base: KB berubah = segment baru
+- Proses pembuat meng-unlink segment saat exit; proses yang sudah attach
+  tetap bisa membaca (mapping tetap valid sampai proses itu selesai)
+
+Hanya proses pembuat yang memegang object SharedMemory (terdaftar di
+resource_tracker seperti biasa, di-unlink saat exit). Proses lain tidak membuat
+object SharedMemory (yang di Python < 3.13 ikut mendaftarkan segment dan
+meng-unlink-nya saat proses itu berhenti), tapi me-mmap /dev/shm/<nama>
+dengan PROT_READ, sehingga index tidak bisa ditulis dari proses mana pun
+selain pembuat. Tanpa /dev/shm (Windows, macOS) attach memakai SharedMemory
+dengan view read-only level Python (memoryview.toreadonly); di macOS butuh
+Python 3.13+ (track=False).
+"""
+
+import atexit
+import mmap
+import os
+import sys
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Sequence
+
+from config import config
+from matcher_snapshot import MAGIC, MatcherSnapshot, build_snapshot
+
+# Direktori POSIX shared memory (Linux)
+SHM_DIR = '/dev/shm'
+
+# Segment yang dipakai proses ini (referensi dijaga agar tidak di-GC / ditutup)
+_segments = []
+
+
+def segment_name(kb_hash: str) -> str:
+    """Nama segment untuk satu versi knowledge base (pendek, batas nama POSIX shm)."""
+    return f"{config.MATCHER_SHM_PREFIX}_{kb_hash[:16]}"
+
+
+def _map_readonly(name: str):
+    """
+    Attach read-only ke segment yang sudah ada.
+
+    Returns:
+        mmap PROT_READ dari /dev/shm/<name>, atau (tanpa /dev/shm) memoryview
+        read-only dari SharedMemory yang tetap dibuka sampai proses exit
+
+    Raises:
+        FileNotFoundError: Segment belum ada
+        ValueError: Segment baru dibuat dan ukurannya belum di-set
+    """
+    if os.path.isdir(SHM_DIR):
+        fd = os.open(os.path.join(SHM_DIR, name), os.O_RDONLY)
+        try:
+            return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)  # Mapping tetap valid setelah fd ditutup
+
+    if os.name == 'posix' and sys.version_info < (3, 13):
+        # SharedMemory mendaftarkan segment ke resource_tracker proses ini,
+        # yang akan meng-unlink segment milik proses lain saat exit
+        raise OSError(f"attach butuh {SHM_DIR} atau Python 3.13+")
+    kwargs = {'track': False} if sys.version_info >= (3, 13) else {}
+    shm = SharedMemory(name=name, **kwargs)
+    _segments.append(shm)
+    return shm.buf.toreadonly()
+
+
+def _unlink(shm: SharedMemory):
+    """Hapus nama segment saat proses pembuat exit (proses yang sudah attach tetap jalan)."""
+    if os.name != 'posix':
+        return  # Windows: segment hilang saat handle terakhir ditutup
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _wait_ready(name: str, timeout: float) -> MatcherSnapshot:
+    """Attach lalu tunggu sampai pembuat selesai menulis (magic ditulis paling akhir)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            buffer = _map_readonly(name)
+            return MatcherSnapshot(buffer, owner=buffer)
+        except ValueError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+
+
+def _create(name: str, data: bytes):
+    """Buat segment berisi snapshot (no-op jika proses lain membuatnya lebih dulu)."""
+    try:
+        shm = SharedMemory(name=name, create=True, size=len(data))
+    except FileExistsError:
+        return
+
+    # Isi ditulis dulu, magic terakhir: attacher tidak pernah membaca data setengah jadi
+    shm.buf[len(MAGIC):len(data)] = data[len(MAGIC):]
+    shm.buf[:len(MAGIC)] = MAGIC
+    if os.name == 'posix':
+        shm.close()  # Pembuat juga membaca lewat mapping read-only
+    else:
+        _segments.append(shm)  # Windows: segment hilang saat handle terakhir ditutup
+    atexit.register(_unlink, shm)
+
+
+def publish_or_attach(qa_pairs: Sequence, questions: Sequence, kb_hash: str,
+                      timeout: float = 5.0) -> Optional[MatcherSnapshot]:
+    """
+    Attach ke segment index untuk kb_hash, atau buat jika belum ada.
+
+    Args:
+        qa_pairs: (pertanyaan, jawaban, kategori) per baris (hanya dipakai pembuat)
+        questions: Pertanyaan yang sudah di-preprocess (hanya dipakai pembuat)
+        kb_hash: content_hash KnowledgeBase
+        timeout: Maksimal detik menunggu pembuat selesai menulis
+
+    Returns:
+        MatcherSnapshot di atas shared memory, atau None jika gagal
+    """
+    name = segment_name(kb_hash)
+    try:
+        try:
+            snapshot = _wait_ready(name, timeout)
+        except FileNotFoundError:
+            _create(name, build_snapshot(qa_pairs, questions, kb_hash))
+            snapshot = _wait_ready(name, timeout)
+        if snapshot.kb_hash != kb_hash:
+            raise ValueError(f"Segment {name} berisi knowledge base lain")
+    except (OSError, ValueError) as e:
+        print(f"❌ Error attaching shared matcher index {name}: {e}")
+        return None
+
+    return snapshot
@@ -0,0 +1,442 @@
+"""
+HR Chatbot Matcher Snapshot
+============================
+Snapshot biner state HRFuzzyMatcher yang sudah di-preprocess, dibaca lewat mmap.
+
+Tanpa snapshot, setiap proses (dan setiap engine baru) menjalankan _preprocess
+untuk semua pertanyaan lalu membangun list & exact index sendiri. Dengan snapshot:
+- Startup hanya open + mmap + baca header (tidak ada parsing / preprocess)
+- String dibaca langsung dari halaman file yang di-mmap, sehingga N proses
+  berbagi physical pages yang sama (page cache)
+- Exact index berupa hash table open addressing di dalam file, lookup tanpa
+  membangun dict
+
+Format file (native little-endian, setiap section di-align 8 byte):
+    header : magic, versi, jumlah baris/jawaban/kategori/slot, hash knowledge base,
+             lalu tabel (offset, length) untuk setiap section
+    section: questions     (blob UTF-8 pertanyaan preprocessed + offsets uint64)
+             originals     (blob UTF-8 pertanyaan asli + offsets uint64)
+             answers       (tabel jawaban unik + offsets uint64)
+             categories    (tabel kategori unik + offsets uint64)
+             answer_ids    (uint32 per baris)
+             category_ids  (uint16 per baris)
+             exact_slots   (uint32 per slot, index baris; 0xFFFFFFFF = kosong)
+
+Usage:
+    python matcher_snapshot.py            # tulis snapshot dari knowledge base aktif
+    python matcher_snapshot.py --verify   # bandingkan hasil matcher snapshot vs biasa
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import List, Optional, Tuple
+
+MAGIC = b'HRMS'
+
+# Naikkan jika format file atau normalisasi teks berubah (snapshot lama diabaikan)
+FORMAT_VERSION = 1
+
+SECTIONS = (
+    'questions_blob', 'questions_offsets',
+    'originals_blob', 'originals_offsets',
+    'answers_blob', 'answers_offsets',
+    'categories_blob', 'categories_offsets',
+    'answer_ids', 'category_ids', 'exact_slots',
+)
+
+# magic, version, rows, answers, categories, slots, kb_hash (32 byte), lalu (offset, length) per section
+_HEADER = struct.Struct('<4sIIIII32s' + 'QQ' * len(SECTIONS))
+
+EMPTY_SLOT = 0xFFFFFFFF
+
+
+def _align(size: int) -> int:
+    """Bulatkan ke kelipatan 8 byte."""
+    return (size + 7) & ~7
+
+
+def _slot_hash(data) -> int:
+    """Hash stabil antar proses (hash() Python di-random per proses)."""
+    return zlib.crc32(data)
+
+
+def pack_strings(values: Sequence, typecode: str = 'Q') -> Tuple[bytes, array]:
+    """
+    Gabungkan string menjadi satu blob UTF-8 + offsets (len(values) + 1).
+
+    Args:
+        values: String yang digabung
+        typecode: Typecode array offsets ('Q' = uint64, 'I' = uint32)
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array(typecode, [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    return b''.join(encoded), offsets
+
+
+def intern_values(values: Sequence) -> Tuple[List[str], List[int]]:
+    """Tabel nilai unik + id per baris (urutan kemunculan pertama)."""
+    table, ids, codes = [], {}, []
+    for value in values:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(table)
+            table.append(value)
+        codes.append(code)
+    return table, codes
+
+
+# ============================================================================
+# VIEW (zero-copy di atas buffer mmap / shared memory)
+# ============================================================================
+
+class PackedStrings(Sequence):
+    """List string read-only di atas blob UTF-8 + offsets (decode saat diakses)."""
+
+    __slots__ = ('_blob', '_offsets')
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        offsets = self._offsets
+        return str(self._blob[offsets[idx]:offsets[idx + 1]], 'utf-8')
+
+    def raw(self, idx: int) -> memoryview:
+        """Bytes UTF-8 baris idx (tanpa decode)."""
+        return self._blob[self._offsets[idx]:self._offsets[idx + 1]]
+
+
+class CodedStrings(Sequence):
+    """List per baris yang nilainya diambil dari tabel lewat id (jawaban/kategori)."""
+
+    __slots__ = ('_table', '_ids')
+
+    def __init__(self, table: List[str], ids: memoryview):
+        self._table = table
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._table[code] for code in self._ids[idx]]
+        return self._table[self._ids[idx]]
+
+
+class QAPairsView(Sequence):
+    """(pertanyaan asli, jawaban, kategori) per baris, format qa_pairs matcher."""
+
+    __slots__ = ('_originals', '_answers', '_categories')
+
+    def __init__(self, originals: Sequence, answers: Sequence, categories: Sequence):
+        self._originals = originals
+        self._answers = answers
+        self._categories = categories
+
+    def __len__(self) -> int:
+        return len(self._originals)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return self._originals[idx], self._answers[idx], self._categories[idx]
+
+
+class ExactIndexView(Mapping):
+    """
+    Exact index (pertanyaan preprocessed -> index baris pertama) berupa
+    hash table open addressing (linear probing) di dalam snapshot.
+    """
+
+    __slots__ = ('_questions', '_slots', '_mask', '_count')
+
+    def __init__(self, questions: PackedStrings, slots: memoryview):
+        self._questions = questions
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._count = None
+
+    def _find(self, key) -> Optional[int]:
+        if not isinstance(key, str):
+            return None
+        data = key.encode('utf-8')
+        slots, mask = self._slots, self._mask
+        pos = _slot_hash(data) & mask
+        while True:
+            row = slots[pos]
+            if row == EMPTY_SLOT:
+                return None
+            if self._questions.raw(row) == data:
+                return row
+            pos = (pos + 1) & mask
+
+    def __getitem__(self, key) -> int:
+        row = self._find(key)
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def get(self, key, default=None):
+        row = self._find(key)
+        return default if row is None else row
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self):
+        for row in self._slots:
+            if row != EMPTY_SLOT:
+                yield self._questions[row]
+
+    def __len__(self) -> int:
+        # Dihitung saat pertama dibutuhkan (tidak memperlambat open)
+        if self._count is None:
+            self._count = sum(1 for row in self._slots if row != EMPTY_SLOT)
+        return self._count
+
+
+# ============================================================================
+# WRITE / READ
+# ============================================================================
+
+def build_exact_slots(questions: Sequence) -> array:
+    """
+    Hash table exact index: slot -> index baris pertama (EMPTY_SLOT = kosong).
+    Ukuran pangkat 2, minimal 2x jumlah baris (load factor <= 0.5), linear probing.
+    """
+    encoded = [q.encode('utf-8') for q in questions]
+    slot_count = 8
+    while slot_count < 2 * len(encoded):
+        slot_count <<= 1
+    slots = array('I', [EMPTY_SLOT]) * slot_count
+    mask = slot_count - 1
+    for row, data in enumerate(encoded):
+        pos = _slot_hash(data) & mask
+        while slots[pos] != EMPTY_SLOT:
+            if encoded[slots[pos]] == data:
+                break   # Duplikat: index pertama yang dipakai
+            pos = (pos + 1) & mask
+        else:
+            slots[pos] = row
+    return slots
+
+
+def build_snapshot(qa_pairs: Sequence, questions: Sequence, kb_hash: str = None) -> bytes:
+    """
+    Serialisasi state matcher menjadi bytes snapshot.
+
+    Args:
+        qa_pairs: (pertanyaan, jawaban, kategori) per baris
+        questions: Pertanyaan yang sudah di-preprocess (urutan sama)
+        kb_hash: content_hash KnowledgeBase sumber (hex, untuk validasi)
+
+    Returns:
+        Isi file snapshot
+    """
+    rows = len(qa_pairs)
+    answers_table, answer_ids = intern_values([a for _, a, _ in qa_pairs])
+    categories_table, category_ids = intern_values([c for _, _, c in qa_pairs])
+    if len(categories_table) > 0xFFFF:
+        raise ValueError("Terlalu banyak kategori untuk category_ids uint16")
+
+    questions_blob, questions_offsets = pack_strings(questions)
+    originals_blob, originals_offsets = pack_strings([q for q, _, _ in qa_pairs])
+    answers_blob, answers_offsets = pack_strings(answers_table)
+    categories_blob, categories_offsets = pack_strings(categories_table)
+    slots = build_exact_slots(questions)
+    slot_count = len(slots)
+
+    payloads = {
+        'questions_blob': questions_blob,
+        'questions_offsets': questions_offsets.tobytes(),
+        'originals_blob': originals_blob,
+        'originals_offsets': originals_offsets.tobytes(),
+        'answers_blob': answers_blob,
+        'answers_offsets': answers_offsets.tobytes(),
+        'categories_blob': categories_blob,
+        'categories_offsets': categories_offsets.tobytes(),
+        'answer_ids': array('I', answer_ids).tobytes(),
+        'category_ids': array('H', category_ids).tobytes(),
+        'exact_slots': slots.tobytes(),
+    }
+
+    layout, parts, position = [], [], _align(_HEADER.size)
+    for name in SECTIONS:
+        data = payloads[name]
+        layout.extend((position, len(data)))
+        parts.append(data + b'\0' * (_align(len(data)) - len(data)))
+        position += _align(len(data))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, rows, len(answers_table), len(categories_table),
+                          slot_count, bytes.fromhex(kb_hash) if kb_hash else b'\0' * 32, *layout)
+    header += b'\0' * (_align(len(header)) - len(header))
+    return header + b''.join(parts)
+
+
+def write_snapshot(path: str, qa_pairs: Sequence, questions: Sequence, kb_hash: str = None) -> int:
+    """
+    Tulis snapshot secara atomic (temp file + os.replace).
+    Proses yang masih me-mmap file lama tetap membaca versi lama.
+
+    Returns:
+        Ukuran file (bytes)
+    """
+    data = build_snapshot(qa_pairs, questions, kb_hash)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return len(data)
+
+
+class MatcherSnapshot:
+    """
+    Snapshot yang sudah di-attach ke buffer (mmap file atau shared memory).
+    Atribut qa_pairs, questions, answers, categories dan exact_index bisa
+    langsung dipakai HRFuzzyMatcher.
+    """
+
+    def __init__(self, buffer, owner=None):
+        """
+        Args:
+            buffer: Object dengan buffer protocol berisi snapshot (mmap, shm.buf, bytes)
+            owner: Object yang harus tetap hidup selama snapshot dipakai (mis. mmap)
+        """
+        view = memoryview(buffer)
+        if sys.byteorder != 'little':
+            raise ValueError("Snapshot matcher hanya didukung di platform little-endian")
+        if len(view) < _HEADER.size:
+            raise ValueError("Snapshot matcher terpotong")
+
+        fields = _HEADER.unpack_from(view, 0)
+        magic, version, rows, answer_count, category_count, slot_count, kb_hash = fields[:7]
+        if magic != MAGIC:
+            raise ValueError("Bukan file snapshot matcher")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versi snapshot {version} tidak didukung (butuh {FORMAT_VERSION})")
+
+        layout = fields[7:]
+        sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = layout[2 * i], layout[2 * i + 1]
+            if offset + length > len(view):
+                raise ValueError(f"Snapshot matcher terpotong di section {name}")
+            sections[name] = view[offset:offset + length]
+
+        self._buffer = buffer
+        self._owner = owner
+        self.rows = rows
+        self.kb_hash = kb_hash.hex() if kb_hash.strip(b'\0') else None
+
+        self.questions = PackedStrings(sections['questions_blob'], sections['questions_offsets'].cast('Q'))
+        originals = PackedStrings(sections['originals_blob'], sections['originals_offsets'].cast('Q'))
+        # Tabel jawaban & kategori unik kecil: di-decode sekali
+        answers_table = list(PackedStrings(sections['answers_blob'], sections['answers_offsets'].cast('Q')))
+        categories_table = list(PackedStrings(sections['categories_blob'], sections['categories_offsets'].cast('Q')))
+        self.answers = CodedStrings(answers_table, sections['answer_ids'].cast('I'))
+        self.categories = CodedStrings(categories_table, sections['category_ids'].cast('H'))
+        self.qa_pairs = QAPairsView(originals, self.answers, self.categories)
+        self.exact_index = ExactIndexView(self.questions, sections['exact_slots'].cast('I'))
+
+        if len(self.questions) != rows or len(self.answers) != rows or len(self.categories) != rows:
+            raise ValueError("Snapshot matcher tidak konsisten")
+        if len(answers_table) != answer_count or len(categories_table) != category_count:
+            raise ValueError("Snapshot matcher tidak konsisten")
+        if len(self.exact_index._slots) != slot_count:
+            raise ValueError("Snapshot matcher tidak konsisten")
+
+
+def open_snapshot(path: str) -> MatcherSnapshot:
+    """
+    mmap file snapshot (read-only) dan attach view-nya.
+
+    Args:
+        path: Path file snapshot
+
+    Returns:
+        MatcherSnapshot
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return MatcherSnapshot(mapped, owner=mapped)
+
+
+def load_or_create_snapshot(path: str, qa_pairs: Sequence, questions: Sequence,
+                            kb_hash: str) -> Optional[MatcherSnapshot]:
+    """
+    Buka snapshot jika hash knowledge base-nya sama, selain itu tulis ulang dulu.
+
+    Returns:
+        MatcherSnapshot, atau None jika snapshot tidak bisa dibuat/dibaca
+    """
+    try:
+        snapshot = open_snapshot(path)
+        if snapshot.kb_hash == kb_hash:
+            return snapshot
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Snapshot matcher {path} tidak valid, dibuat ulang: {e}")
+
+    try:
+        write_snapshot(path, qa_pairs, questions, kb_hash)
+        return open_snapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error writing matcher snapshot {path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from config import config
+    from knowledge_base import get_knowledge_base
+
+    parser = argparse.ArgumentParser(description="Tulis / verifikasi snapshot matcher")
+    parser.add_argument('--output', type=str, default=config.MATCHER_SNAPSHOT_FILE)
+    parser.add_argument('--verify', action='store_true', help="Bandingkan matcher snapshot vs matcher biasa")
+    args = parser.parse_args()
+
+    kb = get_knowledge_base()
+    size = write_snapshot(args.output, kb.flat_pairs, kb.questions, kb.content_hash)
+    print(f"💾 Snapshot ditulis: {args.output} ({size / 1024:.1f} KB, {len(kb.flat_pairs)} baris)")
+
+    start = time.perf_counter()
+    snapshot = open_snapshot(args.output)
+    print(f"Open (mmap): {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    if args.verify:
+        from fuzzy_matcher import HRFuzzyMatcher
+        from matcher_oracle import generate_corpus
+
+        regular = HRFuzzyMatcher(list(kb.flat_pairs))
+        mapped = HRFuzzyMatcher.from_snapshot(snapshot)
+        queries = generate_corpus(list(kb.flat_pairs), 300) + list(kb.flat_pairs[i][0] for i in range(0, len(kb.flat_pairs), 7))
+        mismatches = sum(1 for q in queries if regular.find_best_match(q) != mapped.find_best_match(q))
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"{status} {len(queries)} query, {mismatches} hasil berbeda")
+        sys.exit(1 if mismatches else 0)
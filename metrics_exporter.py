@@ -0,0 +1,390 @@
+"""
+HR Chatbot Metrics Exporter
+============================
+Exporter metrics format Prometheus (text exposition) tanpa dependency tambahan.
+
+Cara kerja:
+1. Module lain mencatat metrics lewat object global di file ini
+   (contoh: RESPONSE_LATENCY.observe(...))
+2. Metrics yang berupa state (queue depth, jumlah record) dibaca saat scrape
+   lewat collector yang didaftarkan dengan register_collector()
+3. start_metrics_server() menjalankan http.server di background thread,
+   endpoint GET /metrics mengembalikan semua metrics
+
+Jalankan file ini langsung untuk self-test (start server, scrape, validasi).
+"""
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+
+# Sample dari collector: (nama_metric, type, help, labels_dict, value)
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _escape_label(value) -> str:
+    """Escape label value sesuai format exposition."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format dict label menjadi {a="x",b="y"}."""
+    if not labels:
+        return ''
+    inner = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+    return '{' + inner + '}'
+
+
+def _format_value(value: float) -> str:
+    """Format angka: integer tanpa desimal, +Inf untuk infinity."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class metric dengan label opsional."""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _labels(self, label_values: Tuple) -> Dict[str, str]:
+        """Pasangkan nilai label dengan nama label."""
+        return dict(zip(self.label_names, label_values))
+    
+    def render(self) -> List[str]:
+        """Render metric ke baris-baris format exposition."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(self._render_items(items))
+        return lines
+    
+    def _render_items(self, items) -> List[str]:
+        """Render satu baris per kombinasi label."""
+        return [
+            f"{self.name}{_format_labels(self._labels(label_values))} {_format_value(value)}"
+            for label_values, value in items
+        ]
+
+
+class Counter(_Metric):
+    """Counter yang hanya bisa naik."""
+    
+    metric_type = 'counter'
+    
+    def inc(self, amount: float = 1, labels: Tuple = ()):
+        """
+        Tambah counter.
+        
+        Args:
+            amount: Jumlah kenaikan (>= 0)
+            labels: Tuple nilai label sesuai urutan label_names
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def value(self, labels: Tuple = ()) -> float:
+        """Nilai counter saat ini."""
+        with self._lock:
+            return self._values.get(labels, 0)
+
+
+class Gauge(_Metric):
+    """Gauge yang nilainya bisa naik/turun."""
+    
+    metric_type = 'gauge'
+    
+    def set(self, value: float, labels: Tuple = ()):
+        """Set nilai gauge."""
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Histogram dengan bucket tetap (cumulative, gaya Prometheus)."""
+    
+    metric_type = 'histogram'
+    
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float],
+                 label_names: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, label_names)
+        self.buckets = sorted(buckets)
+    
+    def observe(self, value: float, labels: Tuple = ()):
+        """
+        Catat satu observasi.
+        
+        Args:
+            value: Nilai (contoh: durasi dalam detik)
+            labels: Tuple nilai label
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+    
+    def _render_items(self, items) -> List[str]:
+        """Render bucket cumulative + _sum + _count per kombinasi label."""
+        lines = []
+        for label_values, (counts, total, count) in items:
+            labels = self._labels(label_values)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + [float('inf')], counts):
+                cumulative += bucket_count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Kumpulan metrics + collector yang dirender saat scrape."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        """Daftarkan metric (nama harus unik)."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} sudah terdaftar")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        """Buat dan daftarkan Counter baru."""
+        return self._register(Counter(name, help_text, label_names))
+    
+    def gauge(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        """Buat dan daftarkan Gauge baru."""
+        return self._register(Gauge(name, help_text, label_names))
+    
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float],
+                  label_names: Tuple[str, ...] = ()) -> Histogram:
+        """Buat dan daftarkan Histogram baru."""
+        return self._register(Histogram(name, help_text, buckets, label_names))
+    
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        Daftarkan fungsi yang menghasilkan sample saat scrape.
+        
+        Args:
+            collector: Callable tanpa argumen, return iterable of
+                       (name, type, help, labels_dict, value)
+        """
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """Render semua metrics ke format text exposition."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        
+        # Sample collector dikelompokkan per nama metric
+        grouped: Dict[str, Tuple[str, str, List[Tuple[Dict[str, str], float]]]] = {}
+        for collector in collectors:
+            try:
+                for name, metric_type, help_text, labels, value in collector():
+                    grouped.setdefault(name, (metric_type, help_text, []))[2].append((labels, value))
+            except Exception as e:
+                print(f"⚠️ Error in metrics collector: {e}")
+        
+        for name, (metric_type, help_text, samples) in grouped.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        
+        return '\n'.join(lines) + '\n'
+
+
+# ============================================================================
+# METRICS GLOBAL
+# ============================================================================
+
+REGISTRY = MetricsRegistry()
+
+RESPONSE_LATENCY = REGISTRY.histogram(
+    'hr_chatbot_response_latency_seconds',
+    'Durasi HRChatbotEngine.get_response per path.',
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    label_names=('path',)
+)
+
+MATCHER_CANDIDATES_SCORED = REGISTRY.counter(
+    'hr_chatbot_matcher_candidates_scored_total',
+    'Jumlah pertanyaan knowledge base yang di-score oleh matcher.'
+)
+
+RESPONSE_CACHE_HITS = REGISTRY.counter(
+    'hr_chatbot_response_cache_hits_total',
+    'Jumlah response yang diambil dari cache engine.'
+)
+
+ANALYTICS_SAVE_DURATION = REGISTRY.histogram(
+    'hr_analytics_save_duration_seconds',
+    'Durasi HRAnalytics._save_data (serialisasi + tulis file).',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+ANALYTICS_SAVE_BYTES = REGISTRY.counter(
+    'hr_analytics_save_bytes_total',
+    'Total bytes yang ditulis HRAnalytics._save_data.'
+)
+
+KB_RELOADS = REGISTRY.counter(
+    'hr_chatbot_kb_reloads_total',
+    'Hot reload knowledge base per hasil (applied, unchanged, error).',
+    label_names=('result',)
+)
+
+KB_RELOAD_DURATION = REGISTRY.histogram(
+    'hr_chatbot_kb_reload_duration_seconds',
+    'Durasi hot reload knowledge base (load + diff + patch index matcher).',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Handler HTTP: GET /metrics -> text exposition."""
+    
+    registry = REGISTRY
+    
+    def do_GET(self):
+        """Serve /metrics, path lain 404."""
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Jangan spam log Streamlit setiap kali di-scrape."""
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host: str = None, port: int = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Start HTTP exporter di background thread (idempotent per proses).
+    Aman dipanggil di setiap rerun Streamlit.
+    
+    Args:
+        host: Host bind (None = dari config)
+        port: Port (None = dari config, 0 = port acak)
+    
+    Returns:
+        Server yang berjalan, atau None jika gagal bind
+    """
+    global _server
+    
+    with _server_lock:
+        if _server is not None:
+            return _server
+        
+        host = config.METRICS_HOST if host is None else host
+        port = config.METRICS_PORT if port is None else port
+        
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ Metrics exporter tidak bisa start di {host}:{port}: {e}")
+            return None
+        
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="hr-metrics-exporter", daemon=True)
+        thread.start()
+        _server = server
+        return server
+
+
+def stop_metrics_server():
+    """Stop HTTP exporter jika sedang berjalan."""
+    global _server
+    
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+
+
+# Self-test: start server, jalankan beberapa query, scrape, validasi output
+if __name__ == "__main__":
+    import tempfile
+    import os
+    import urllib.request
+    
+    from analytics import HRAnalytics
+    from fuzzy_matcher import HRChatbotEngine
+    from hr_knowledge_base import get_flat_qa_pairs
+    
+    # Import ulang lewat nama module agar memakai REGISTRY yang sama
+    # dengan fuzzy_matcher/analytics (bukan salinan di __main__)
+    from metrics_exporter import start_metrics_server, stop_metrics_server
+    
+    server = start_metrics_server('127.0.0.1', 0)
+    port = server.server_address[1]
+    
+    engine = HRChatbotEngine(get_flat_qa_pairs())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        analytics = HRAnalytics(os.path.join(tmp_dir, 'analytics.json'))
+        for query in config.QUICK_QUESTIONS * 2 + ["pertanyaan yang tidak ada"]:
+            analytics.log_query('metrics-selftest', query, engine.get_response(query))
+        analytics.flush()
+        
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            text = resp.read().decode('utf-8')
+        analytics.close()
+    
+    stop_metrics_server()
+    print(text)
+    
+    expected = [
+        'hr_chatbot_response_latency_seconds_count',
+        'hr_chatbot_matcher_candidates_scored_total',
+        'hr_chatbot_response_cache_hits_total',
+        'hr_analytics_queue_depth',
+        'hr_analytics_save_duration_seconds_count',
+        'hr_analytics_save_bytes_total',
+        'hr_analytics_records',
+    ]
+    missing = [name for name in expected if name not in text]
+    print("✅ Semua metrics tersedia" if not missing else f"❌ Metrics hilang: {missing}")
+    raise SystemExit(1 if missing else 0)
@@ -0,0 +1,241 @@
+"""
+HR Chatbot Sampling Profiler
+=============================
+Profiler opsional untuk hot path chat (get_response & log_query).
+
+Cara kerja:
+1. Decorator @profiled membungkus method; jika PROFILING_ENABLED aktif,
+   sebagian kecil request (PROFILING_SAMPLE_RATE) dijalankan di bawah cProfile
+2. Selama request yang di-sample berjalan, background thread mengambil
+   stack thread tersebut setiap PROFILING_STACK_INTERVAL_MS (stack sampler)
+3. Hasil diagregasi per nama hot path dan di-dump berkala ke
+   PROFILING_OUTPUT_DIR:
+   - <nama>-<waktu>.pstats     : buka dengan pstats / snakeviz
+   - <nama>-<waktu>.collapsed  : format collapsed stack untuk flamegraph.pl / speedscope
+
+Request yang tidak di-sample hanya membayar satu pengecekan config + random().
+"""
+
+import atexit
+import cProfile
+import functools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import config
+
+# Hanya satu request yang diprofile pada satu waktu per proses. Sejak Python 3.12
+# cProfile berbasis sys.monitoring (satu slot per proses): enable() kedua gagal
+# dengan "Another profiling tool is already active", dan profile yang aktif juga
+# mencatat thread lain. Request lain yang ter-sample saat slot terpakai dijalankan tanpa profile.
+_profile_slot = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Aggregator hasil profiling: pstats (cProfile) + collapsed stacks (sampler).
+    """
+    
+    def __init__(self, output_dir: str = None):
+        """
+        Args:
+            output_dir: Folder output dump (None = dari config)
+        """
+        self.output_dir = output_dir or config.PROFILING_OUTPUT_DIR
+        self._lock = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._stacks: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._sampled_calls: Dict[str, int] = defaultdict(int)
+        
+        # Thread yang sedang menjalankan request ter-sample: thread_id -> nama
+        self._active: Dict[int, str] = {}
+        self._local = threading.local()
+        
+        self._last_dump = time.time()
+        self._wakeup = threading.Event()
+        self._sampler_thread = None
+    
+    def _ensure_sampler(self):
+        """Start background thread sampler + dumper (sekali saja)."""
+        if self._sampler_thread is not None:
+            return
+        with self._lock:
+            if self._sampler_thread is None:
+                self._sampler_thread = threading.Thread(
+                    target=self._sampler_loop,
+                    name="hr-profiler-sampler",
+                    daemon=True
+                )
+                self._sampler_thread.start()
+    
+    def run(self, name: str, func, *args, **kwargs):
+        """
+        Jalankan func di bawah cProfile + stack sampler.
+        Jika request lain sedang diprofile, func dijalankan tanpa profile.
+        Error profiler tidak pernah diteruskan ke pemanggil.
+        
+        Args:
+            name: Nama hot path (contoh: 'get_response')
+            func: Callable yang diprofile
+        """
+        # Nested call (misal get_response memanggil method lain yang juga
+        # di-decorate) cukup ikut profile yang sudah aktif
+        if getattr(self._local, 'active', False):
+            return func(*args, **kwargs)
+        
+        if not _profile_slot.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            self._ensure_sampler()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except Exception as e:
+                # Profiler lain (debugger, coverage, ...) sedang aktif
+                print(f"⚠️ Error enabling profiler: {e}")
+                return func(*args, **kwargs)
+            
+            thread_id = threading.get_ident()
+            self._local.active = True
+            self._active[thread_id] = name
+            self._wakeup.set()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                try:
+                    profile.disable()
+                except Exception as e:
+                    print(f"⚠️ Error disabling profiler: {e}")
+                    profile = None
+                self._active.pop(thread_id, None)
+                self._local.active = False
+                if profile is not None:
+                    self._add_profile(name, profile)
+        finally:
+            _profile_slot.release()
+    
+    def _add_profile(self, name: str, profile: cProfile.Profile):
+        """Gabungkan hasil cProfile satu request ke agregat."""
+        try:
+            with self._lock:
+                if name in self._stats:
+                    self._stats[name].add(profile)
+                else:
+                    self._stats[name] = pstats.Stats(profile)
+                self._sampled_calls[name] += 1
+        except Exception as e:
+            print(f"⚠️ Error aggregating profile: {e}")
+    
+    @staticmethod
+    def _collapse(frame) -> str:
+        """Ubah frame stack menjadi string collapsed (root;...;leaf)."""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(parts))
+    
+    def _sampler_loop(self):
+        """Loop background: sample stack thread aktif & dump berkala."""
+        interval = config.PROFILING_STACK_INTERVAL_MS / 1000
+        
+        while True:
+            if not self._active:
+                # Tidak ada request ter-sample: tidur sampai ada atau waktunya dump
+                self._wakeup.clear()
+                remaining = config.PROFILING_DUMP_INTERVAL_SECONDS - (time.time() - self._last_dump)
+                self._wakeup.wait(timeout=max(0.0, remaining))
+            else:
+                frames = sys._current_frames()
+                with self._lock:
+                    for thread_id, name in list(self._active.items()):
+                        frame = frames.get(thread_id)
+                        if frame is not None:
+                            self._stacks[name][self._collapse(frame)] += 1
+                time.sleep(interval)
+            
+            if time.time() - self._last_dump >= config.PROFILING_DUMP_INTERVAL_SECONDS:
+                self.dump()
+    
+    def dump(self) -> Optional[str]:
+        """
+        Tulis agregat saat ini ke file lalu reset agregat.
+        
+        Returns:
+            Timestamp file yang ditulis, atau None jika tidak ada data
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            stacks, self._stacks = self._stacks, defaultdict(lambda: defaultdict(int))
+            calls, self._sampled_calls = self._sampled_calls, defaultdict(int)
+            self._last_dump = time.time()
+        
+        if not stats and not stacks:
+            return None
+        
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            
+            for name, name_stats in stats.items():
+                name_stats.dump_stats(os.path.join(self.output_dir, f"{name}-{stamp}.pstats"))
+            
+            for name, name_stacks in stacks.items():
+                path = os.path.join(self.output_dir, f"{name}-{stamp}.collapsed")
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in sorted(name_stacks.items()):
+                        f.write(f"{stack} {count}\n")
+            
+            summary = ", ".join(f"{name}={count}" for name, count in calls.items())
+            print(f"📈 Profile dumped to {self.output_dir} ({summary})")
+        except (IOError, OSError) as e:
+            print(f"❌ Error dumping profile: {e}")
+        
+        return stamp
+
+
+# Singleton instance
+_profiler_instance = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> SamplingProfiler:
+    """
+    Factory function untuk mendapatkan profiler instance (singleton).
+    
+    Returns:
+        SamplingProfiler instance
+    """
+    global _profiler_instance
+    if _profiler_instance is None:
+        with _profiler_lock:
+            if _profiler_instance is None:
+                _profiler_instance = SamplingProfiler()
+                # Dump sisa agregat saat proses berhenti
+                atexit.register(_profiler_instance.dump)
+    return _profiler_instance
+
+
+def profiled(name: str):
+    """
+    Decorator untuk hot path: profile sebagian request jika PROFILING_ENABLED aktif.
+    
+    Args:
+        name: Nama hot path untuk nama file output
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if config.PROFILING_ENABLED and random.random() < config.PROFILING_SAMPLE_RATE:
+                return get_profiler().run(name, func, *args, **kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
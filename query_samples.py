@@ -0,0 +1,35 @@
+"""
+HR Chatbot Query Samples
+=========================
+Query sintetis yang dipakai bersama benchmark (benchmarks/) dan
+matcher_oracle.py, agar keduanya menguji jenis input yang sama.
+"""
+
+import random
+
+# Pertanyaan di luar topik HR (harus berakhir di fallback)
+OFF_TOPIC_QUERIES = [
+    "resep nasi goreng enak",
+    "jadwal pertandingan bola malam ini",
+    "cara install python di laptop",
+    "rekomendasi film horor terbaru",
+    "harga tiket pesawat ke bali",
+    "cuaca besok hujan tidak",
+    "siapa presiden pertama amerika",
+    "cara merawat kucing persia",
+    "lirik lagu indonesia raya",
+    "berapa jarak bumi ke bulan",
+]
+
+
+def add_typo(text: str, rng: random.Random) -> str:
+    """Satu typo acak: tukar, hapus, atau gandakan satu karakter."""
+    if len(text) < 4:
+        return text
+    pos = rng.randrange(1, len(text) - 1)
+    op = rng.choice(('swap', 'drop', 'double'))
+    if op == 'swap':
+        return text[:pos] + text[pos + 1] + text[pos] + text[pos + 2:]
+    if op == 'drop':
+        return text[:pos] + text[pos + 1:]
+    return text[:pos] + text[pos] + text[pos:]
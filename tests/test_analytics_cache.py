@@ -0,0 +1,86 @@
+"""
+Regression test cache dashboard analytics (_ResultCache).
+
+get_summary_stats memanggil beberapa method cache lain di dalam compute().
+Versi dengan striped lock hang jika hash key nested jatuh ke stripe yang sama,
+tergantung PYTHONHASHSEED, jadi test dijalankan di beberapa hash seed.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from analytics import _ResultCache  # noqa: E402
+
+SUMMARY_SCRIPT = """
+import sys
+from analytics import HRAnalytics
+
+analytics = HRAnalytics(sys.argv[1], async_writer=False)
+for i in range(20):
+    analytics.log_query(f"s{i % 3}", f"pertanyaan {i}",
+                        {'category': 'cuti', 'confidence': 80.0, 'is_fallback': i % 4 == 0})
+analytics.log_feedback("s0", 5, None)
+stats = analytics.get_summary_stats(7)
+assert stats == analytics.get_summary_stats(7)
+print("ok")
+"""
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_summary_stats_does_not_hang(tmp_path, seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-c', SUMMARY_SCRIPT, str(tmp_path / 'analytics.json')],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
+
+
+def test_nested_compute_same_thread():
+    cache = _ResultCache()
+    outer = cache.get_or_compute(
+        ('outer',), 1, lambda: cache.get_or_compute(('inner',), 1, lambda: 1) + 1
+    )
+    assert outer == 2
+    assert cache.get_or_compute(('inner',), 1, lambda: 0) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_single_flight_and_retry_after_error():
+    cache = _ResultCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', 1, slow)))
+    first.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', 1, slow)))
+    waiter.start()
+    release.set()
+    first.join(5)
+    waiter.join(5)
+    assert results == ['value', 'value']
+    assert len(calls) == 1
+
+    def broken():
+        raise RuntimeError("gagal")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('other', 1, broken)
+    assert cache.get_or_compute('other', 1, lambda: 'ok') == 'ok'
@@ -0,0 +1,42 @@
+"""
+HR Chatbot Text Utilities
+==========================
+Normalisasi teks yang dipakai bersama oleh matcher dan analytics,
+agar "kapan libur" dan "Kapan libur?" dianggap pertanyaan yang sama.
+"""
+
+import re
+
+# Regex di-compile sekali saat import
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalisasi text: lowercase, remove punctuation, normalize whitespace.
+    
+    Args:
+        text: Text mentah
+    
+    Returns:
+        Text yang sudah dibersihkan
+    """
+    # Validasi input
+    if not text or not isinstance(text, str):
+        return ""
+    
+    try:
+        # Lowercase
+        text = text.lower()
+        
+        # Remove punctuation (keep alphanumeric dan spaces)
+        text = _PUNCTUATION_RE.sub(' ', text)
+        
+        # Normalize multiple spaces ke single space
+        text = _WHITESPACE_RE.sub(' ', text)
+        
+        return text.strip()
+    except Exception as e:
+        print(f"⚠️ Error preprocessing text: {e}")
+        return ""